@@ -1,14 +1,16 @@
-from crewai import Agent
-from agentquest.tools import DiceRollerTool, WorldStateTool
+from typing import Optional
+from crewai import Agent, LLM
+from agentquest.tools import DiceRollerTool, WorldStateTool, WorldMapTool, ToolMemo
 from agentquest.utils import get_configured_llm
+from agentquest.world_index import WorldIndex
 
-def get_dm_agent() -> Agent:
+def get_dm_agent(stream: bool = False, llm: Optional[LLM] = None, memo: Optional[ToolMemo] = None, world: Optional[WorldIndex] = None) -> Agent:
     return Agent(
         role='Dungeon Master',
-        llm=get_configured_llm(),
+        llm=llm if llm is not None else get_configured_llm(stream=stream),
         goal='Orchestrate the game round, collect player actions, resolve outcomes, and narrate the scene.',
         backstory='You are a master storyteller and fair adjudicator of rules. You keep the game challenging but fun.',
         verbose=True,
         allow_delegation=True,
-        tools=[DiceRollerTool(), WorldStateTool()]
+        tools=[DiceRollerTool(), WorldStateTool(world=world, memo=memo), WorldMapTool(world=world, memo=memo)]
     )
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Optional
+
+SEED_FLAG_PATTERN = re.compile(r'--seed\s+"([^"]+)"')
+
+
+def parse_seeds(path: Path) -> list[str]:
+    """
+    Reads world seeds from a file.
+    Markdown files in the style of examples/seeds.md contribute every `--seed "..."` they contain;
+    any other file is read as one seed per line, skipping blank lines and '#' comments.
+    """
+    text = Path(path).read_text()
+    flagged = SEED_FLAG_PATTERN.findall(text)
+    if flagged:
+        return flagged
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.strip().startswith("#")]
+
+
+def seed_dir_name(seed: str) -> str:
+    """Stable, filesystem-safe directory name for a seed: a short slug plus a content hash."""
+    slug = re.sub(r"[^a-z0-9]+", "-", seed.lower()).strip("-")[:40].strip("-")
+    digest = hashlib.sha1(seed.encode("utf-8")).hexdigest()[:8]
+    return f"{slug}-{digest}" if slug else digest
+
+
+def generate_one(seed: str, output_dir: str, llm_check: bool = True) -> dict:
+    """Generates a single world in the current process. Runs inside batch worker processes."""
+    from agentquest.crew.generation_crew import GenerationCrew
+
+    start = time.perf_counter()
+    entry = {"seed": seed, "output_dir": output_dir, "status": "succeeded", "iterations": 0, "error": None}
+    crew = None
+    try:
+        crew = GenerationCrew(world_seed=seed, output_dir=Path(output_dir), llm_check=llm_check)
+        crew.run()
+    except Exception as e:
+        entry["status"] = "failed"
+        entry["error"] = str(e)
+    entry["iterations"] = crew.iterations if crew is not None else 0
+    entry["seconds"] = round(time.perf_counter() - start, 3)
+    return entry
+
+
+def run_batch(
+    seeds: list[str],
+    output_root: Path,
+    workers: int = 4,
+    resume: bool = True,
+    generate_fn: Callable[[str, str], dict] = generate_one,
+    on_result: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Generates one world per seed on a pool of `workers` processes, each into output_root/<seed_dir_name>.
+    With `resume`, seeds whose world_state.json already exists are skipped; the manifest keeps what the run
+    that generated them recorded, marked as skipped.
+    Writes output_root/manifest.json after every finished seed, so an interrupted batch still leaves a manifest.
+    """
+    output_root = Path(output_root)
+    output_root.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_root / "manifest.json"
+    started = time.time()
+    results: dict[str, dict] = {}
+    previous: dict[str, dict] = {}
+    if resume and manifest_path.exists():
+        try:
+            previous = {entry["seed"]: entry for entry in json.loads(manifest_path.read_text()).get("seeds", [])}
+        except (ValueError, KeyError, TypeError, AttributeError):
+            pass  # an unreadable manifest only costs the previous timings
+
+    def write_manifest():
+        manifest = {
+            "started_at": started,
+            "workers": workers,
+            "seeds": [results[s] for s in dict.fromkeys(seeds) if s in results],
+        }
+        tmp_path = manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        tmp_path.replace(manifest_path)
+
+    def record(entry: dict):
+        results[entry["seed"]] = entry
+        write_manifest()
+        if on_result:
+            on_result(entry)
+
+    pending = []
+    for seed in dict.fromkeys(seeds):
+        seed_dir = output_root / seed_dir_name(seed)
+        if resume and (seed_dir / "world_state.json").exists():
+            entry = {"seed": seed, "output_dir": str(seed_dir), "iterations": 0, "error": None, "seconds": 0.0}
+            record({**entry, **previous.get(seed, {}), "status": "skipped"})
+        else:
+            pending.append((seed, seed_dir))
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=max(1, min(workers, len(pending)))) as pool:
+            futures = {pool.submit(generate_fn, seed, str(seed_dir)): (seed, seed_dir) for seed, seed_dir in pending}
+            for future in as_completed(futures):
+                seed, seed_dir = futures[future]
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    # The worker process itself died; record it and keep going
+                    entry = {"seed": seed, "output_dir": str(seed_dir), "status": "failed", "iterations": 0, "error": str(e), "seconds": None}
+                record(entry)
+
+    write_manifest()
+    return json.loads(manifest_path.read_text())
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    from crewai import Task
+    from crewai.tasks.task_output import TaskOutput
+
+
+class ResponseCache:
+    """
+    Interface for LLM response caches. The base class caches nothing.
+    Subclass it to plug in another backend and install it with `agentquest.utils.set_response_cache`.
+    """
+    def get(self, key: str) -> Optional[str]:
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        pass
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    Local SQLite-backed response cache, safe to share between threads and processes.
+    Once the stored responses exceed `max_bytes`, the least recently used ones are evicted.
+    """
+    def __init__(self, path: Union[str, Path], max_bytes: int = 256 * 1024 * 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        size = len(value.encode("utf-8"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time())
+            )
+            self._evict()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+
+def make_cache_key(model: str, agent_role: str, description: str, context: str = "", agent_profile: Sequence[str] = (), expected_output: str = "", tools: Sequence[str] = ()) -> str:
+    """
+    Content address of one LLM task: identical inputs always map to the same key.
+    `agent_profile` holds the agent's goal and backstory, which shape its answers as much as its role does.
+    """
+    payload = json.dumps([model, agent_role, description, context, list(agent_profile), expected_output, list(tools)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def task_cache_key(agent, task: "Task") -> str:
+    """Cache key for running `task` with `agent`, including the outputs of its context tasks and the tools on offer."""
+    from crewai.utilities.formatter import aggregate_raw_outputs_from_tasks
+    model = getattr(agent.llm, "model", agent.llm)
+    context = aggregate_raw_outputs_from_tasks(task.context) if isinstance(task.context, list) else ""
+    tools = [tool.name for tool in (task.tools or agent.tools or [])]
+    return make_cache_key(
+        str(model), agent.role, task.description, context,
+        agent_profile=(agent.goal, agent.backstory), expected_output=task.expected_output, tools=tools,
+    )
+
+
+def replay_cached_output(task: "Task", raw: str, agent_role: Optional[str] = None) -> "TaskOutput":
+    """
+    Completes `task` with a cached response without calling the LLM.
+    Sets `task.output` (so downstream context works) and fires the task callback (so streaming works).
+    """
+    from crewai.tasks.task_output import TaskOutput
+    output = TaskOutput(
+        description=task.description,
+        expected_output=task.expected_output,
+        raw=raw,
+        agent=agent_role or (task.agent.role if task.agent else ""),
+    )
+    task.output = output
+    if task.callback:
+        task.callback(output)
+    return output
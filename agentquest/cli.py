@@ -1,29 +1,55 @@
 import typer
 from rich.console import Console
 from pathlib import Path
-from agentquest.crew.generation_crew import GenerationCrew
+from typing import Optional
+
+# crewai and the crews are imported inside the commands, so `--help` and argument errors return immediately
 
 app = typer.Typer(help="AgentQuest - Autonomous multi-agent RPG orchestration")
 console = Console()
 
 @app.command()
 def generate(
-    seed: str = typer.Option(..., "--seed", "-s", help="The world seed text prompt"),
-    output: str = typer.Option("output", "--output", "-o", help="Directory to save the generated world state"),
+    seed: str = typer.Option(None, "--seed", "-s", help="The world seed text prompt"),
+    output: str = typer.Option("output", "--output", "-o", help="Directory to save the generated world state (batch mode: one subdirectory per seed)"),
+    seeds_file: str = typer.Option(None, "--seeds-file", "-f", help="Batch mode: generate one world per seed listed in this file"),
+    workers: int = typer.Option(4, "--workers", "-w", help="Batch mode: number of worlds generated concurrently"),
+    resume: bool = typer.Option(True, "--resume/--no-resume", help="Batch mode: skip seeds whose world already exists"),
+    llm_check: bool = typer.Option(True, "--llm-check/--no-llm-check", help="Review worlds that pass the rule-based validation with the LLM consistency checker, or approve them as generated"),
 ):
-    """Generate a new game world from a seed prompt."""
+    """Generate a new game world from a seed prompt, or a batch of worlds from a seeds file."""
+    if seeds_file:
+        generate_batch(Path(seeds_file), Path(output), workers, resume, llm_check)
+        return
+    if not seed:
+        console.print("[bold red]Provide either --seed or --seeds-file.[/bold red]")
+        raise typer.Exit(code=1)
+    
     console.print(f"[bold green]Generating world with seed:[/bold green] {seed}")
-    crew = GenerationCrew(world_seed=seed, output_dir=Path(output))
+    from agentquest.crew.generation_crew import GenerationCrew
+    crew = GenerationCrew(world_seed=seed, output_dir=Path(output), llm_check=llm_check)
     try:
-        world_state = crew.run()
+        crew.run()
         console.print(f"[bold green]World state successfully saved to {Path(output) / 'world_state.json'}![/bold green]")
     except Exception as e:
         console.print(f"[bold red]Failed to generate world:[/bold red] {e}")
 
-import json
-import yaml
-from agentquest.crew.gameplay_crew import GameplayCrew
-from agentquest.models import WorldState, PlayerConfig
+def generate_batch(seeds_file: Path, output: Path, workers: int, resume: bool, llm_check: bool = True):
+    from functools import partial
+    from agentquest.batch import generate_one, parse_seeds, run_batch
+    
+    seeds = parse_seeds(seeds_file)
+    console.print(f"[bold green]Generating {len(seeds)} worlds with {workers} workers into {output}[/bold green]")
+    
+    def on_result(entry: dict):
+        if entry["status"] == "failed":
+            console.print(f"[bold red]Failed[/bold red] ({entry['seconds']}s): {entry['seed'][:60]} - {entry['error']}")
+        else:
+            console.print(f"[bold green]{entry['status'].capitalize()}[/bold green] ({entry['seconds']}s, {entry['iterations']} iterations): {entry['seed'][:60]}")
+    
+    manifest = run_batch(seeds, output, workers=workers, resume=resume, generate_fn=partial(generate_one, llm_check=llm_check), on_result=on_result)
+    failed = sum(1 for e in manifest["seeds"] if e["status"] == "failed")
+    console.print(f"[bold]Batch complete: {len(manifest['seeds']) - failed} ok, {failed} failed. Manifest: {output / 'manifest.json'}[/bold]")
 
 @app.command()
 def play(
@@ -32,8 +58,18 @@ def play(
     output: str = typer.Option("output/session", "--output", "-o", help="Directory to save session artifacts (game_state, transcript)"),
     rounds: int = typer.Option(3, "--rounds", "-r", help="Number of rounds to play"),
     resume: bool = typer.Option(True, "--resume/--new-game", help="Resume from existing game state if present"),
+    parallel: int = typer.Option(4, "--parallel", help="Maximum number of player agents acting concurrently each round"),
+    context: str = typer.Option("slim", "--context", help="Prompt context per agent: 'slim' (state facts and relevant history) or 'full' (whole recent history)"),
+    replay: Optional[str] = typer.Option(None, "--replay", help="Re-run a recorded session from its llm_trace.jsonl (or session directory) into --output, without model calls"),
+    until_round: Optional[int] = typer.Option(None, "--until-round", help="With --replay, replay up to this round and play later rounds with the live model"),
 ):
     """Play a game session using an existing world and player config."""
+    import json
+    import yaml
+    from agentquest.crew.gameplay_crew import GameplayCrew
+    from agentquest.models import WorldState, PlayerConfig
+    from agentquest.trace import TraceReplayer
+    
     console.print("[bold blue]Starting game session...[/bold blue]")
     console.print(f"Loading world from {world}")
     console.print(f"Loading players from {players}")
@@ -47,12 +83,24 @@ def play(
             players_data = yaml.safe_load(f)
             player_configs = [PlayerConfig(**p) for p in players_data.get('players', [])]
             
-        crew = GameplayCrew(world_state=world_state, players=player_configs, output_dir=Path(output), resume=resume)
+        replayer = None
+        if replay:
+            replayer = TraceReplayer(replay, until_round=until_round)
+            # A replay re-runs the session from its first round
+            resume = False
+            console.print(f"Replaying {replayer.path} up to round {replayer.until_round}")
+            
+        crew = GameplayCrew(world_state=world_state, players=player_configs, output_dir=Path(output), resume=resume, max_parallel_players=parallel, context_mode=context, replay=replayer)
         
         for i in range(rounds):
             if not crew.run_round():
                 console.print(f"[bold yellow]Game Over after round {i+1}![/bold yellow]")
                 break
+        
+        # Let a pending history summary land in game_state.json before exiting
+        crew.close()
+        if replayer is not None and replayer.divergences:
+            console.print(f"[bold yellow]{replayer.divergences} replayed prompt(s) differ from the recording.[/bold yellow]")
                 
         console.print(f"[bold green]Session complete! Transcript saved to {Path(output) / 'transcript.md'}[/bold green]")
         
@@ -0,0 +1,121 @@
+import re
+from typing import Optional
+
+from agentquest.models import GameState, WorldState, CharacterState
+from agentquest.utils import estimate_tokens
+from agentquest.world_index import WorldIndex
+
+CONTEXT_MODES = ("slim", "full")
+
+BEGINNING = "[The adventure is just beginning!]"
+
+
+def recent_history(entries: list[str], budget: int) -> list[str]:
+    """The newest entries that fit in `budget` tokens, oldest first (always at least the newest one)."""
+    recent: list[str] = []
+    for entry in reversed(entries):
+        cost = estimate_tokens(entry)
+        if recent and cost > budget:
+            break
+        recent.insert(0, entry)
+        budget -= cost
+    return recent
+
+
+def mentions(text: str, name: str) -> bool:
+    return re.search(rf"\b{re.escape(name)}\b", text, re.IGNORECASE) is not None
+
+
+class ContextBuilder:
+    """
+    Builds the game context placed in each agent's prompt.
+
+    'full' gives every agent the same rolling summary plus the newest history within `history_token_budget`.
+    'slim' leads with the current state facts (location, party HP and inventory, NPC attitudes, quests), so agents
+    need neither the raw history nor a tool call to know where things stand. The DM gets the summary and the newest
+    history within the budget; each player gets only their own sheet, the party's condition, the summary and the
+    newest rounds that mention them, within `player_history_budget`. A round then costs one DM-sized context plus
+    small, bounded player contexts, instead of the full history once per agent.
+    """
+    def __init__(self, world_state: WorldState, mode: str = "slim", history_token_budget: int = 2000, player_history_budget: Optional[int] = None):
+        if mode not in CONTEXT_MODES:
+            raise ValueError(f"Unknown context mode '{mode}'. Use one of: {', '.join(CONTEXT_MODES)}.")
+        self.world = WorldIndex(world_state)
+        self.mode = mode
+        self.history_token_budget = history_token_budget
+        self.player_history_budget = player_history_budget if player_history_budget is not None else history_token_budget // 4
+
+    def for_dm(self, game_state: GameState) -> str:
+        if self.mode == "full":
+            return self._history(game_state.history_summary, game_state.session_history, self.history_token_budget)
+        return self._state_facts(game_state) + self._history(
+            game_state.history_summary, game_state.session_history, self.history_token_budget
+        )
+
+    def for_player(self, game_state: GameState, name: str) -> str:
+        if self.mode == "full":
+            return self.for_dm(game_state)
+        # The newest round is always relevant; older ones only if they involve this player
+        history = game_state.session_history
+        relevant = [e for e in history[:-1] if mentions(e, name)] + history[-1:]
+        return self._state_facts(game_state, player=name) + self._history(
+            game_state.history_summary, relevant, self.player_history_budget
+        )
+
+    def _history(self, summary: str, entries: list[str], budget: int) -> str:
+        parts = []
+        if summary:
+            parts.append(f"Summary of earlier events:\n{summary}")
+        parts.extend(recent_history(entries, budget - estimate_tokens(summary)))
+        history_context = "\n\n".join(parts) if parts else BEGINNING
+        return f"\n\nHere is what has happened so far:\n{history_context}\n"
+
+    def _state_facts(self, game_state: GameState, player: Optional[str] = None) -> str:
+        lines = [f"\n\nCurrent state (round {game_state.round_number}):"]
+
+        location = self.world.location(game_state.current_location)
+        where = f"- Location: {game_state.current_location}"
+        if location is not None:
+            extras = []
+            if location.connected_to:
+                extras.append(f"exits: {', '.join(location.connected_to)}")
+            if location.npcs_present:
+                extras.append(f"present: {', '.join(location.npcs_present)}")
+            if extras:
+                where += f" ({'; '.join(extras)})"
+        lines.append(where)
+
+        own = game_state.get_character(player) if player else None
+        if own is not None:
+            lines.append(f"- You ({own.name}): {self._sheet(own)}")
+        others = [c for c in game_state.characters if c is not own]
+        if others:
+            # Players only need the party's condition; the DM adjudicates with full sheets
+            describe = self._condition if player else self._sheet
+            label = "Rest of the party" if own is not None else "Party"
+            lines.append(f"- {label}: " + "; ".join(f"{c.name}: {describe(c)}" for c in others))
+
+        attitudes = game_state.npc_attitudes
+        if player and location is not None:
+            present = {n.strip().lower() for n in location.npcs_present}
+            attitudes = {n: a for n, a in attitudes.items() if n.strip().lower() in present}
+        if attitudes:
+            lines.append("- NPC attitudes: " + ", ".join(f"{n}: {a}" for n, a in attitudes.items()))
+
+        if game_state.quest_progress:
+            lines.append("- Quests: " + ", ".join(
+                f"{title}: {'completed' if done else 'in progress'}" for title, done in game_state.quest_progress.items()
+            ))
+        return "\n".join(lines)
+
+    @staticmethod
+    def _condition(char: CharacterState) -> str:
+        condition = f"HP {char.hp}/{char.max_hp}"
+        if char.status_effects:
+            condition += f", {', '.join(char.status_effects)}"
+        return condition
+
+    @classmethod
+    def _sheet(cls, char: CharacterState) -> str:
+        inventory = ", ".join(char.inventory) if char.inventory else "nothing"
+        return f"{cls._condition(char)}, carrying {inventory}"
@@ -1,4 +1,18 @@
-from .generation_crew import GenerationCrew
-from .gameplay_crew import GameplayCrew
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .generation_crew import GenerationCrew
+    from .gameplay_crew import GameplayCrew
 
 __all__ = ["GenerationCrew", "GameplayCrew"]
+
+
+def __getattr__(name: str):
+    # The crews pull in all of crewai, so they are imported on first use rather than with the package
+    if name == "GenerationCrew":
+        from .generation_crew import GenerationCrew
+        return GenerationCrew
+    if name == "GameplayCrew":
+        from .gameplay_crew import GameplayCrew
+        return GameplayCrew
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,54 +1,152 @@
-import asyncio
-from typing import Optional
+import contextvars
+import hashlib
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, Optional
 from pathlib import Path
 from crewai import Crew, Task, Process
 from crewai.tasks.task_output import TaskOutput
 from agentquest.agents import get_dm_agent, get_player_agent
-from agentquest.models import WorldState, PlayerConfig, GameState, CharacterState
+from agentquest.models import WorldState, PlayerConfig, GameState, CharacterState, RoundResult, StateChanges
+from agentquest.persistence import GameStateStore
+from agentquest.cache import ResponseCache, task_cache_key, replay_cached_output
+from agentquest.telemetry import Telemetry, agent_token_usage
+from agentquest.streaming import StreamChannel, stream_tokens
+from agentquest.context import ContextBuilder
+from agentquest.tools import DiceRollerTool, ToolMemo
+from agentquest.transcript import TranscriptStore
+from agentquest.trace import LLMTrace, TraceReplayer, TRACE_FILENAME, request_fingerprint
+from agentquest.utils import estimate_tokens, get_response_cache, get_llm_pool
+
+LEGACY_SUMMARY_PREFIX = "Summary of early events:\n"
+
+# Round phases whose LLM tokens are streamed live; summaries and prefetches are not part of the round's stream
+STREAMED_PHASES = ("describe", "act", "resolve")
+
+DESCRIBE_EXPECTED_OUTPUT = "A vivid description of the environment and any immediate events or characters present."
+
+RESOLVE_EXPECTED_OUTPUT = (
+    "A structured narrative resolution. 1) Start with '### Dice Rolls' and list any tool rolls explicitly with their results (if none, stay brief). "
+    "2) Provide the '### Narrative Resolution' of the players' actions. "
+    "3) End your output with the round's state changes as a JSON code block, listing only what changed:\n"
+    "```json\n"
+    '{"characters": [{"name": "<character>", "hp_change": -3, "items_gained": [], "items_lost": [], "status_added": [], "status_removed": []}], '
+    '"location": null, "npc_attitudes": {"<npc>": "<attitude>"}, "quest_progress": {"<quest title>": true}, '
+    '"game_over": false, "game_over_reason": null}\n'
+    "```\n"
+    "Use a null location unless the party moved to another known location. Set game_over to true only if the game has ended."
+)
+
+
+def prompt_fingerprint(description: str) -> str:
+    return hashlib.sha1(description.encode("utf-8")).hexdigest()
+
+
+class PrefetchedScene:
+    """A next-round scene description generated speculatively, valid only for the inputs it was built from."""
+    def __init__(self, description: str, store_signature: tuple):
+        self.fingerprint = prompt_fingerprint(description)
+        self.store_signature = store_signature
+        self.future: Future = Future()
+
 
 class GameplayCrew:
     """
     Looping crew that runs the live game session.
     DM agent orchestrates each round; Player agents respond independently.
-    Maintains and persists game_state.json across rounds.
+    Player actions are collected in parallel, at most `max_parallel_players` at a time.
+    Session history is kept within `history_token_budget` by folding the oldest rounds
+    into a rolling summary, in the background between rounds by default.
+    Prompts carry a per-agent context built by ContextBuilder: 'slim' (state facts plus the history relevant
+    to each agent) by default, or 'full' (the same summary and recent history for every agent).
+    With `prefetch_scene`, the next round's scene description is generated in the background as soon as
+    a round is persisted, and used only if the prompt inputs and the persisted state are still unchanged.
+    With a `stream_channel`, each task output and tool use is sent to it as it completes; with `stream_llm_tokens`
+    as well, the agents' LLM tokens are streamed as they arrive, tagged with agent and phase.
+    Task responses are served from the LLM response cache when one is configured.
+    Every task prompt and the response used are recorded in output_dir/llm_trace.jsonl, and the DM's dice are
+    seeded per round from the session `seed`. With `replay`, recorded responses are served instead of calling
+    a model, up to the replayer's last round; summaries then run inline, after the rounds the recording summarized
+    after, and scenes are not prefetched, as a replay must follow the recorded order of work.
+    Kickoffs, LLM calls and tool uses are timed into output_dir/logs/telemetry.jsonl, aggregated per round.
+    Agents and their one-agent crews are built once per session; each kickoff only swaps in its task. LLM clients
+    are leased from the shared pool and returned by close().
+    Maintains and persists game_state.json (plus an append-only journal of per-round deltas) across rounds.
     """
-    def __init__(self, world_state: WorldState, players: list[PlayerConfig], output_dir: Path, resume: bool = True, stream_queue: Optional[asyncio.Queue] = None):
+    def __init__(self, world_state: WorldState, players: list[PlayerConfig], output_dir: Path, resume: bool = True, stream_channel: Optional[StreamChannel] = None, max_parallel_players: int = 4, history_token_budget: int = 2000, background_summarization: bool = True, cache: Optional[ResponseCache] = None, telemetry: Optional[Telemetry] = None, prefetch_scene: bool = False, stream_llm_tokens: bool = False, context_mode: str = "slim", seed: Optional[int] = None, replay: Optional[TraceReplayer] = None):
         self.world_state = world_state
+        self.cache = cache if cache is not None else get_response_cache()
         self.players_config = players
+        self.max_parallel_players = max(1, max_parallel_players)
+        self.history_token_budget = history_token_budget
+        self.context_builder = ContextBuilder(world_state, mode=context_mode, history_token_budget=history_token_budget)
+        self.replay = replay
+        self.background_summarization = background_summarization and replay is None
+        self.prefetch_scene = prefetch_scene and replay is None
+        # Guards session_history and saves, which the background summarizer also touches
+        self._state_lock = threading.RLock()
+        self._background_thread: Optional[threading.Thread] = None
+        self._summarizer_agent = None
+        self._prefetch_agent = None
+        self._prefetched: Optional[PrefetchedScene] = None
+        self._round_in_progress = False
+        self._leased_llms: list = []
+        self._crews: dict[tuple[int, bool], tuple[Crew, threading.Lock]] = {}
+        self._crews_lock = threading.Lock()
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.game_state_path = self.output_dir / "game_state.json"
-        self.transcript_path = self.output_dir / "transcript.md"
-        self.stream_queue = stream_queue
+        self.telemetry = telemetry if telemetry is not None else Telemetry(self.output_dir / "logs" / "telemetry.jsonl")
+        self.store = GameStateStore(self.output_dir)
+        self.game_state_path = self.store.snapshot_path
+        self.transcript = TranscriptStore(self.output_dir)
+        self.transcript_path = self.transcript.markdown_path
+        self.stream_channel = stream_channel
+        self.stream_llm_tokens = stream_llm_tokens
         
         # Step callback for streaming tool usage
         def step_callback(agent_output):
-            if self.stream_queue:
-                # agent_output can be AgentAction (tool use) or AgentFinish
-                if hasattr(agent_output, 'tool') and agent_output.tool:
-                    tool_msg = f"\n*[System]* **{agent_output.agent}** is using tool `{agent_output.tool}`: {agent_output.tool_input}\n"
-                    # Using a non-blocking put since this is called synchronously by CrewAI
-                    try:
-                        self.stream_queue.put_nowait(tool_msg)
-                    except asyncio.QueueFull:
-                        pass
-        
-        self.dm_agent = get_dm_agent()
+            # agent_output can be AgentAction (tool use) or AgentFinish
+            if hasattr(agent_output, 'tool') and agent_output.tool:
+                self._stream(f"\n*[System]* **{agent_output.agent}** is using tool `{agent_output.tool}`: {agent_output.tool_input}\n")
+        
+        # Repeated world and character sheet queries are answered from here until the state changes
+        self.tool_memo = ToolMemo()
+        self.dm_agent = get_dm_agent(stream=stream_llm_tokens, llm=self._lease_llm(stream_llm_tokens), memo=self.tool_memo, world=self.context_builder.world)
         self.dm_agent.step_callback = step_callback
+        self._dice = next((t for t in self.dm_agent.tools if isinstance(t, DiceRollerTool)), None)
         
-        self.player_agents = [get_player_agent(p) for p in self.players_config]
+        # Character sheets read the live in-memory state rather than the file on disk
+        self.player_agents = [
+            get_player_agent(p, game_state_getter=lambda: self.game_state, stream=stream_llm_tokens, llm=self._lease_llm(stream_llm_tokens), memo=self.tool_memo)
+            for p in self.players_config
+        ]
         for pa in self.player_agents:
             pa.step_callback = step_callback
         
-        if resume and self.game_state_path.exists():
+        resumed = resume and self.store.exists()
+        if resumed:
             print(f"Loading existing game state from {self.game_state_path}")
-            import json
-            with open(self.game_state_path, "r") as f:
-                data = json.load(f)
-                self.game_state = GameState(**data)
+            self.game_state = self.store.load()
+            self._migrate_legacy_summary()
         else:
             self.game_state = self._init_game_state()
             self._save_game_state()
+            # A new game starts a new transcript rather than continuing the previous game's
+            self.transcript.clear()
+        
+        self.trace = LLMTrace(self.output_dir / TRACE_FILENAME)
+        if replay is not None and replay.path.resolve() == self.trace.path.resolve():
+            raise ValueError("A session cannot replay its own trace; replay it into another output directory.")
+        recorded_seed = self.trace.seed() if resumed else None
+        if recorded_seed is not None:
+            self.seed = recorded_seed
+        else:
+            # A replay rolls the recorded session's dice, so rounds played live afterwards match it too
+            replay_seed = replay.seed if replay is not None else None
+            self.seed = next(s for s in (replay_seed, seed, random.randrange(2 ** 32)) if s is not None)
+            self.trace.start(self.seed)
         
     def _init_game_state(self) -> GameState:
         characters = [
@@ -73,85 +171,297 @@ class GameplayCrew:
             session_history=[]
         )
         
+    def _lease_llm(self, stream: bool = False):
+        llm = get_llm_pool().acquire(stream=stream)
+        if llm is not None:
+            self._leased_llms.append(llm)
+        return llm
+
+    def close(self):
+        """Ends the session: waits for background work, then returns the agents' LLM clients to the shared pool."""
+        self.wait_for_background_tasks()
+        pool = get_llm_pool()
+        while self._leased_llms:
+            pool.release(self._leased_llms.pop())
+        with self._crews_lock:
+            self._crews.clear()
+        self.transcript.close()
+
+    def _stream(self, message: str):
+        """Sends a message to the stream, waiting while the client catches up."""
+        if self.stream_channel is not None:
+            self.stream_channel.send(message)
+
     def _save_game_state(self):
-        with open(self.game_state_path, "w") as f:
-            f.write(self.game_state.model_dump_json(indent=2))
+        # Only the delta since the last save is written; the store compacts into a snapshot periodically
+        with self._state_lock:
+            self.store.save(self.game_state)
+            self.tool_memo.invalidate()
             
-    def _append_transcript(self, text: str):
-        with open(self.transcript_path, "a") as f:
-            f.write(text + "\\n\\n")
+    def _append_transcript(self, round_number: int, text: str):
+        self.transcript.append(round_number, text)
+
+    def _migrate_legacy_summary(self):
+        # Older sessions stored the summary as the first history entry
+        history = self.game_state.session_history
+        if not self.game_state.history_summary and history and history[0].startswith(LEGACY_SUMMARY_PREFIX):
+            self.game_state.history_summary = history.pop(0)[len(LEGACY_SUMMARY_PREFIX):]
+
+    def _build_context(self, player: Optional[str] = None) -> str:
+        """The game context for the DM's prompts, or for one player's. Bounded by the token budget."""
+        with self._state_lock:
+            if player is None:
+                return self.context_builder.for_dm(self.game_state)
+            return self.context_builder.for_player(self.game_state, player)
+
+    def _history_overflow(self) -> int:
+        """
+        Number of oldest history entries to fold into the summary.
+        Nothing is folded until the history exceeds the budget; then entries are folded
+        until what remains fits in half of it, so summarization runs once every few rounds.
+        The newest entry is never folded.
+        """
+        with self._state_lock:
+            costs = [estimate_tokens(e) for e in self.game_state.session_history]
+            total = estimate_tokens(self.game_state.history_summary) + sum(costs)
+        if total <= self.history_token_budget:
+            return 0
+        
+        target = self.history_token_budget // 2
+        count = 0
+        while count < len(costs) - 1 and total > target:
+            total -= costs[count]
+            count += 1
+        return count
 
     def _summarize_history_if_needed(self):
-        # Keep the last 3 rounds fully detailed, summarize everything before that if history > 10
-        if len(self.game_state.session_history) > 10:
-            print("\\n[System] Session history is getting long. Summarizing older events to preserve context window...")
-            recent_count = 3
-            to_summarize = self.game_state.session_history[:-recent_count]
-            recent_history = self.game_state.session_history[-recent_count:]
-            
-            history_text = "\\n\\n".join(to_summarize)
-            
-            summary_task = Task(
-                description=f"Read the following history of game rounds and write a concise, 1-2 paragraph summary of the essential events, major decisions, character statuses, and plot progression.\\n\\nHistory to summarize:\\n{history_text}",
-                expected_output="A concise summary of past events.",
-                agent=self.dm_agent
-            )
-            
-            crew = Crew(
-                agents=[self.dm_agent],
-                tasks=[summary_task],
-                process=Process.sequential,
-                verbose=False
-            )
-            
-            summary_result = str(crew.kickoff())
-            
-            # Replace the old history with the summary
-            self.game_state.session_history = [f"Summary of early events:\\n{summary_result}"] + recent_history
+        """Folds the overflowing oldest entries into the rolling summary with one DM call."""
+        with self._state_lock:
+            count = self._history_overflow()
+            if count == 0:
+                return
+            previous_summary = self.game_state.history_summary
+            to_summarize = self.game_state.session_history[:count]
+        
+        print(f"\n[System] Folding {count} older round(s) into the session summary...")
+        # A dedicated agent, so a background summary never shares state with a running round
+        if self._summarizer_agent is None:
+            self._summarizer_agent = get_dm_agent(llm=self._lease_llm(), world=self.context_builder.world)
+        
+        history_text = "\n\n".join(to_summarize)
+        max_words = max(50, self.history_token_budget // 4)
+        summary_task = Task(
+            description=f"Update the running summary of a game session with newly finished rounds. Keep the essential events, major decisions, character statuses, and plot progression, and drop minor detail. Keep it under {max_words} words.\n\nCurrent summary:\n{previous_summary or '[No summary yet]'}\n\nNew rounds to fold in:\n{history_text}",
+            expected_output="The updated, concise summary of past events.",
+            agent=self._summarizer_agent
+        )
+        summary_result = str(self._kickoff_task(self._summarizer_agent, summary_task, verbose=False, phase="summary"))
+        
+        with self._state_lock:
+            # Only appends happen while we summarize, so the folded entries are still at the front
+            self.game_state.history_summary = summary_result
+            del self.game_state.session_history[:count]
             self._save_game_state()
-            print("[System] Summarization complete.")
+        print("[System] Summarization complete.")
+
+    def _schedule_background_work(self):
+        """
+        Starts the work between rounds: summarization (off the critical path unless background mode is disabled),
+        then the next scene prefetch, in that order, since a new summary changes the next scene's prompt.
+        """
+        if not self.background_summarization and self._summary_due():
+            self._summarize_history_if_needed()
+        summarize = self.background_summarization and self._history_overflow() > 0
+        if not (summarize or self.prefetch_scene):
+            return
+        if self._background_thread is not None and self._background_thread.is_alive():
+            # Still busy with earlier rounds; the next round will check again
+            return
+        self._background_thread = threading.Thread(target=self._run_background_work, args=(summarize,), name="between-rounds", daemon=True)
+        self._background_thread.start()
+
+    def _summary_due(self) -> bool:
+        """
+        Whether an inline summary may run now. While replaying, only where the recorded session summarized:
+        it summarized in the background, which skips rounds while still busy with earlier ones.
+        """
+        if self.replay is None:
+            return True
+        with self._state_lock:
+            round_number = self.game_state.round_number
+        # A summary is recorded under the round that follows the one it comes after
+        if not self.replay.replays(round_number - 1):
+            return True
+        return self.replay.recorded(round_number, "summary")
+
+    def _run_background_work(self, summarize: bool):
+        if summarize:
+            try:
+                self._summarize_history_if_needed()
+            except Exception as e:
+                # The history stays intact, so the next round simply retries
+                print(f"[System] Background summarization failed: {e}")
+        if self.prefetch_scene:
+            try:
+                self._prefetch_next_scene()
+            except Exception as e:
+                # The next round describes the scene itself
+                print(f"[System] Scene prefetch failed: {e}")
+
+    def wait_for_background_tasks(self, timeout: Optional[float] = None):
+        """Blocks until background summarization and scene prefetch have finished, e.g. before the process exits."""
+        if self._background_thread is not None:
+            self._background_thread.join(timeout)
+
+    def _describe_description(self, context: str) -> str:
+        return f"{context}\nDescribe the current situation at {self.game_state.current_location}. Round: {self.game_state.round_number}. Provide clear hooks for the players based on recent events."
+
+    def _prefetch_next_scene(self):
+        """Generates the next round's scene description ahead of time, with its own DM agent."""
+        with self._state_lock:
+            if self._round_in_progress:
+                # Too late: the round has already described its scene
+                return
+            description = self._describe_description(self._build_context())
+            prefetched = PrefetchedScene(description, self.store.signature())
+            self._prefetched = prefetched
+        
+        # A dedicated agent, so a prefetch never shares state with a running round
+        if self._prefetch_agent is None:
+            self._prefetch_agent = get_dm_agent(llm=self._lease_llm(), memo=self.tool_memo, world=self.context_builder.world)
+        task = Task(description=description, expected_output=DESCRIBE_EXPECTED_OUTPUT, agent=self._prefetch_agent)
+        try:
+            result = self._kickoff_task(self._prefetch_agent, task, verbose=False, phase="prefetch")
+        except BaseException as e:
+            prefetched.future.set_exception(e)
+            raise
+        prefetched.future.set_result(getattr(result, 'raw', None) or str(result))
+
+    def _take_prefetched_scene(self, description: str) -> Optional[str]:
+        """
+        Returns the prefetched scene if it was built from exactly this prompt and the persisted state has not been
+        modified since (e.g. edited by hand). Waits for a prefetch still in flight: it is the call the round needs anyway.
+        """
+        with self._state_lock:
+            prefetched, self._prefetched = self._prefetched, None
+        if prefetched is None:
+            return None
+        if prefetched.fingerprint != prompt_fingerprint(description):
+            self.telemetry.record("prefetch", "describe", None, used=False, reason="prompt changed")
+            return None
+        if prefetched.store_signature != self.store.signature():
+            self.telemetry.record("prefetch", "describe", None, used=False, reason="state modified")
+            return None
+        try:
+            scene = prefetched.future.result()
+        except Exception:
+            return None
+        self.telemetry.record("prefetch", "describe", None, used=True)
+        return scene
+
+    def _kickoff_task(self, agent, task: Task, verbose: bool = True, phase: str = ""):
+        """Runs a single task in its own one-agent crew and returns the crew output (or the cached output)."""
+        channel = self.stream_channel if self.stream_llm_tokens and phase in STREAMED_PHASES else None
+        with self.telemetry.span("kickoff", task.name or phase or "task", phase=phase, agent=agent.role) as span, \
+                stream_tokens(channel, agent=agent.role, phase=phase):
+            with self._state_lock:
+                round_number = self.game_state.round_number
+            fingerprint = request_fingerprint(task)
+
+            def record(response: str, source: str):
+                self.trace.record(round_number, phase, agent.role, task.description, fingerprint, response, source)
+
+            if self.replay is not None:
+                replayed = self.replay.take(round_number, phase, agent.role, fingerprint)
+                if replayed is not None:
+                    span["replayed"] = True
+                    record(replayed, "replay")
+                    return replay_cached_output(task, replayed, agent.role)
+
+            cache_key = None
+            if self.cache is not None:
+                cache_key = task_cache_key(agent, task)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    span["cache_hit"] = True
+                    record(cached, "cache")
+                    return replay_cached_output(task, cached, agent.role)
+            
+            with self._crew_for(agent, task, verbose) as crew:
+                tokens_before = agent_token_usage(agent)
+                result = crew.kickoff()
+                tokens_after = agent_token_usage(agent)
+            span["cache_hit"] = False
+            span["prompt_tokens"] = tokens_after[0] - tokens_before[0]
+            span["completion_tokens"] = tokens_after[1] - tokens_before[1]
+            raw = getattr(result, 'raw', None) or str(result)
+            record(raw, "llm")
+            if cache_key is not None:
+                self.cache.set(cache_key, raw)
+            return result
+
+    @contextmanager
+    def _crew_for(self, agent, task: Task, verbose: bool) -> Iterator[Crew]:
+        """
+        The session's one-agent crew for `agent`, set up to run `task` and held by the caller until it is done.
+        Crews are reused per agent rather than built per task, and a crew's lock keeps two threads from
+        swapping its task at once.
+        """
+        key = (id(agent), verbose)
+        with self._crews_lock:
+            entry = self._crews.get(key)
+            if entry is None:
+                crew = Crew(agents=[agent], tasks=[task], process=Process.sequential, verbose=verbose)
+                entry = self._crews[key] = (crew, threading.Lock())
+        crew, lock = entry
+        with lock:
+            # Assigning skips the validators Crew.__init__ ran on the first task. What they check holds for every
+            # task this session builds: one task with its crew's agent, no async execution and no output files
+            crew.tasks = [task]
+            yield crew
 
     def run_round(self) -> bool:
         """Run a single round. Returns True if game continues, False if game over."""
-        self._summarize_history_if_needed()
+        current_round = self.game_state.round_number
+        with self._state_lock:
+            self._round_in_progress = True
+        try:
+            with self.telemetry.span("round", f"Round {current_round}", group="round", round=current_round) as fields:
+                memo_before = self.tool_memo.stats()
+                try:
+                    return self._run_round()
+                finally:
+                    memo_after = self.tool_memo.stats()
+                    fields["tool_memo_hits"] = memo_after["hits"] - memo_before["hits"]
+                    fields["tool_memo_misses"] = memo_after["misses"] - memo_before["misses"]
+        finally:
+            # Also when the round failed before persisting
+            with self._state_lock:
+                self._round_in_progress = False
+
+    def _run_round(self) -> bool:
         print(f"\\n=== Round {self.game_state.round_number} ===")
+        if self._dice is not None:
+            # Rolls depend only on the session and the round, whether earlier rounds were replayed or live
+            self._dice.reseed(f"{self.seed}:{self.game_state.round_number}")
         
-        history_context = "\\n\\n".join(self.game_state.session_history)
-        if history_context:
-            history_prompt = f"\\n\\nHere is what has happened so far:\\n{history_context}\\n"
-        else:
-            history_prompt = "\\n\\nHere is what has happened so far:\\n[The adventure is just beginning!]\\n"
+        # Bounded by the token budget even while older rounds are still being summarized
+        dm_context = self._build_context()
         
         # Task callbacks for streaming final outputs
         def dm_desc_callback(output: TaskOutput):
-            if self.stream_queue:
-                msg = getattr(output, 'raw', str(output))
-                try:
-                    self.stream_queue.put_nowait(f"### **DM** (Scene Description)\n{msg}\n\n### Player Actions\n")
-                except asyncio.QueueFull:
-                    pass
-
-        def player_action_callback(output: TaskOutput):
-            if self.stream_queue:
-                msg = getattr(output, 'raw', str(output))
-                agent_name = output.agent if hasattr(output, 'agent') else "Player"
-                try:
-                    self.stream_queue.put_nowait(f"**{agent_name}**:\n{msg}\n\n")
-                except asyncio.QueueFull:
-                    pass
+            msg = getattr(output, 'raw', str(output))
+            self._stream(f"### **DM** (Scene Description)\n{msg}\n\n### Player Actions\n")
 
         def dm_res_callback(output: TaskOutput):
-            if self.stream_queue:
-                msg = getattr(output, 'raw', str(output))
-                try:
-                    self.stream_queue.put_nowait(f"### **DM** (Resolution)\n{msg}\n\n")
-                except asyncio.QueueFull:
-                    pass
+            # The state block is applied, not shown; its effects are streamed once applied
+            msg = RoundResult.parse(getattr(output, 'raw', str(output))).narration
+            self._stream(f"### **DM** (Resolution)\n{msg}\n\n")
 
         # Task 1: DM describes the scene
         describe_task = Task(
-            description=f"{history_prompt}\nDescribe the current situation at {self.game_state.current_location}. Round: {self.game_state.round_number}. Provide clear hooks for the players based on recent events.",
-            expected_output="A vivid description of the environment and any immediate events or characters present.",
+            description=self._describe_description(dm_context),
+            expected_output=DESCRIBE_EXPECTED_OUTPUT,
             agent=self.dm_agent,
             callback=dm_desc_callback
         )
@@ -162,18 +472,14 @@ class GameplayCrew:
         # Factory to capture the player name in the callback closure
         def make_player_callback(p_name: str):
             def callback(output: TaskOutput):
-                if self.stream_queue:
-                    msg = getattr(output, 'raw', str(output))
-                    try:
-                        self.stream_queue.put_nowait(f"**{p_name}**:\n{msg}\n\n")
-                    except asyncio.QueueFull:
-                        pass
+                msg = getattr(output, 'raw', str(output))
+                self._stream(f"**{p_name}**:\n{msg}\n\n")
             return callback
             
         for i, pa in enumerate(self.player_agents):
             p_name = self.players_config[i].name
             pt = Task(
-                description=f"{history_prompt}\nListen to the DM's scene description and the current situation. Decide your next action. Character: {p_name}.",
+                description=f"{self._build_context(p_name)}\nListen to the DM's scene description and the current situation. Decide your next action. Character: {p_name}.",
                 expected_output=f"A short description of {p_name}'s action and any dialogue.",
                 agent=pa,
                 context=[describe_task],
@@ -183,27 +489,37 @@ class GameplayCrew:
             
         # Task 3: DM resolves the round
         resolve_task = Task(
-            description="Review all player actions. Use your dice roller to determine outcomes if they attempt something difficult. Formulate a final narrative summary of the round and specify any state changes (HP, inventory, location). You MUST explicitly list out any dice rolls you made (e.g. 'Garrick rolls Athletics: 1d20+2 = 15').",
-            expected_output="A structured narrative resolution. 1) Start with '### Dice Rolls' and list any tool rolls explicitly with their results (if none, stay brief). 2) Provide the '### Narrative Resolution' of the players' actions. 3) Provide a summary of state changes. At the very end of your output, you MUST include the exact phrase 'STATUS: GAME_OVER' if the game has ended, or 'STATUS: CONTINUE' if the game should proceed.",
+            description="Review all player actions. Use your dice roller to determine outcomes if they attempt something difficult; roll for several characters in one call (e.g. 'Alice: 1d20+2; Bob: 1d20 adv'). Formulate a final narrative summary of the round and specify any state changes (HP, inventory, location); for travel, ask the world map for the route (e.g. 'route:Stormkeep -> Shadow Woods') instead of reading every location. You MUST explicitly list out any dice rolls you made (e.g. 'Garrick rolls Athletics: 1d20+2 = 15').",
+            expected_output=RESOLVE_EXPECTED_OUTPUT,
             agent=self.dm_agent,
             context=player_tasks,
             callback=dm_res_callback
         )
         
-        crew = Crew(
-            agents=[self.dm_agent] + self.player_agents,
-            tasks=[describe_task] + player_tasks + [resolve_task],
-            process=Process.sequential, # In a future version we could run players in parallel, but sequential ensures the DM sees all
-            verbose=True
-        )
-        
-        if self.stream_queue:
-            try:
-                self.stream_queue.put_nowait(f"## Round {self.game_state.round_number}\n\n")
-            except asyncio.QueueFull:
-                pass
+        self._stream(f"## Round {self.game_state.round_number}\n\n")
 
-        result = crew.kickoff()
+        # Phase 1: the DM sets the scene, unless it was already prefetched for exactly this state
+        prefetched_scene = self._take_prefetched_scene(describe_task.description)
+        if prefetched_scene is not None:
+            replay_cached_output(describe_task, prefetched_scene, self.dm_agent.role)
+        else:
+            self._kickoff_task(self.dm_agent, describe_task, phase="describe")
+        
+        # Phase 2: players only depend on the scene, so they act concurrently (sealed bids).
+        # Each task callback streams its output as soon as that player finishes.
+        workers = min(self.max_parallel_players, len(player_tasks)) or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="player") as pool:
+            # Each worker runs in a copy of this context, so its telemetry is attributed to this round
+            futures = [
+                pool.submit(contextvars.copy_context().run, self._kickoff_task, pa, pt, phase="act")
+                for pa, pt in zip(self.player_agents, player_tasks)
+            ]
+            # Wait in player order so failures surface deterministically
+            for future in futures:
+                future.result()
+        
+        # Phase 3: the DM resolves; its context lists the player tasks in config order
+        result = self._kickoff_task(self.dm_agent, resolve_task, phase="resolve")
         
         # Build structured transcript for this round
         current_round = self.game_state.round_number
@@ -220,18 +536,53 @@ class GameplayCrew:
             action = getattr(pt.output, 'raw', str(pt.output))
             round_transcript += f"**{player_name}**:\n{action}\n\n"
             
-        # 3. DM Resolution
-        resolution_text = str(result)
+        # 3. DM Resolution, with its state changes applied as typed diffs
+        round_result = RoundResult.parse(str(result))
+        resolution_text = round_result.narration
+        notes = []
+        if round_result.structured:
+            with self._state_lock:
+                notes = self.game_state.apply_changes(self._known_changes(round_result.state_changes))
+                self.tool_memo.invalidate()
+        else:
+            print(f"[System] Round {current_round} resolution had no valid state block; the game state is unchanged.")
+        if notes:
+            changes_line = f"*State changes: {'; '.join(notes)}.*"
+            resolution_text += f"\n\n{changes_line}"
+            self._stream(f"{changes_line}\n\n")
         round_transcript += f"### **DM** (Resolution)\n{resolution_text}\n\n"
         
         # Update our simple state representation
-        self.game_state.session_history.append(resolution_text)
-        self.game_state.round_number += 1
-        self._save_game_state()
-        self._append_transcript(round_transcript)
-        
-        # Check for the explicit game over marker
-        if "STATUS: GAME_OVER" in resolution_text.upper():
-            return False
-            
-        return True
+        with self._state_lock:
+            self.game_state.session_history.append(resolution_text)
+            self.game_state.round_number += 1
+            self._save_game_state()
+            # From here on the next round's scene may be prefetched
+            self._round_in_progress = False
+        self._append_transcript(current_round, round_transcript)
+        self._schedule_background_work()
+        
+        return not round_result.game_over
+
+    def _known_changes(self, changes: StateChanges) -> StateChanges:
+        """
+        Maps the DM's location, NPC and quest names onto the world's, so state keys stay canonical.
+        Moves to unknown locations and progress on unknown quests are dropped; attitudes of NPCs
+        the DM improvised are kept as written.
+        """
+        world = self.context_builder.world
+        location = world.location(changes.location) if changes.location else None
+        npc_attitudes = {}
+        for name, attitude in changes.npc_attitudes.items():
+            npc = world.npc(name)
+            npc_attitudes[npc.name if npc is not None else name] = attitude
+        quest_progress = {}
+        for title, completed in changes.quest_progress.items():
+            quest = world.quest(title)
+            if quest is not None:
+                quest_progress[quest.title] = completed
+        return changes.model_copy(update={
+            "location": location.name if location is not None else None,
+            "npc_attitudes": npc_attitudes,
+            "quest_progress": quest_progress,
+        })
@@ -1,74 +1,334 @@
 import json
+import re
 from pathlib import Path
+from typing import Callable, Optional
 from crewai import Crew, Task, Process
 from agentquest.agents import get_world_builder, get_character_creator, get_quest_designer, get_consistency_checker
+from agentquest.cache import ResponseCache, task_cache_key, replay_cached_output
 from agentquest.models import WorldState
+from agentquest.telemetry import Telemetry, agent_token_usage
+from agentquest.utils import get_response_cache
+from agentquest.world_validation import WorldIssue, fix_instructions, repair_world, validate_world
 from pydantic import ValidationError
 
+# Generation stages in execution order. Each stage is one task run by one agent.
+STAGES = ["world", "npcs", "quests", "check"]
+
+# WorldState fields produced by each content stage, used to map schema errors back to a stage
+STAGE_FIELDS = {
+    "world": {"setting", "lore", "factions", "locations"},
+    "npcs": {"npcs"},
+    "quests": {"main_quest", "side_quests"},
+}
+
+# The stages each content stage's task takes as context; a stage that reruns makes these dependents rerun too
+STAGE_DEPENDENCIES = {
+    "world": set(),
+    "npcs": {"world"},
+    "quests": {"world", "npcs"},
+}
+
+# Words in consistency checker feedback that implicate a content stage
+STAGE_KEYWORDS = {
+    "world": ("location", "geograph", "connect", "lore", "faction", "setting", "map"),
+    "npcs": ("npc", "character", "personalit", "attitude"),
+    "quests": ("quest", "objective", "twist"),
+}
+
 class GenerationCrew:
     """
     One-shot crew that generates the full game world from a seed prompt.
     Runs agents sequentially: WorldBuilder -> CharacterCreator -> QuestDesigner -> ConsistencyChecker (loops until approved).
-    Outputs world_state.json.
+    Each stage's output is checkpointed under output_dir/checkpoints, so a failed iteration only reruns the stages
+    implicated by the checker or the schema error, and an interrupted run resumes where it stopped.
+    Before the consistency checker runs, the stage outputs are assembled and validated by rules (see
+    `agentquest.world_validation`): mechanical errors send targeted fixes straight back to their stages
+    without spending a checker call, and a world that passes gets a checker narrowed to what rules cannot
+    judge. With `llm_check=False` such a world is approved without the checker.
+    Outputs world_state.json. Stage responses are served from the LLM response cache when one is configured.
+    Stage kickoffs, LLM calls and tool uses are timed into output_dir/logs/telemetry.jsonl, aggregated per run.
     """
-    def __init__(self, world_seed: str, output_dir: Path):
+    def __init__(self, world_seed: str, output_dir: Path, cache: Optional[ResponseCache] = None, progress_callback: Optional[Callable[[str], None]] = None, telemetry: Optional[Telemetry] = None, llm_check: bool = True):
         self.world_seed = world_seed
+        self.llm_check = llm_check
+        self.progress_callback = progress_callback
+        self.cache = cache if cache is not None else get_response_cache()
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.world_state_path = self.output_dir / "world_state.json"
+        self.checkpoint_dir = self.output_dir / "checkpoints"
+        self.iterations = 0
+        self.telemetry = telemetry if telemetry is not None else Telemetry(self.output_dir / "logs" / "telemetry.jsonl")
+        self._runs = 0
         
         self.world_builder = get_world_builder()
         self.character_creator = get_character_creator()
         self.quest_designer = get_quest_designer()
         self.consistency_checker = get_consistency_checker()
         
-    def _create_tasks(self, seed: str) -> list[Task]:
+    def _create_tasks(self, seed: str, feedback: str = "", stage_fixes: Optional[dict[str, str]] = None) -> list[Task]:
+        """
+        Builds one task per content stage. `feedback` from a failed iteration is passed to every stage that reruns,
+        `stage_fixes` only to the stage it is keyed by.
+        """
+        stage_fixes = stage_fixes or {}
+        def fix_note(stage: str) -> str:
+            fixes = "\n".join(filter(None, [feedback, stage_fixes.get(stage, "")]))
+            return f"\n\nFix these issues from the previous attempt:\n{fixes}" if fixes else ""
+        
         build_world_task = Task(
-            description=f"Create a setting, lore, factions, and locations for the following seed: '{seed}'. Make locations interconnected.",
+            description=f"Create a setting, lore, factions, and locations for the following seed: '{seed}'. Make locations interconnected.{fix_note('world')}",
             expected_output="JSON containing 'setting', 'lore', 'factions', and 'locations'.",
             agent=self.world_builder
         )
         
         create_npcs_task = Task(
-            description="Generate interesting NPCs (merchants, guards, villains, allies) that fit the setting and locations created by the World Builder. Give them distinct personalities and attitudes.",
+            description=f"Generate interesting NPCs (merchants, guards, villains, allies) that fit the setting and locations created by the World Builder. Give them distinct personalities and attitudes.{fix_note('npcs')}",
             expected_output="JSON array of NPCs matching the required schema.",
             agent=self.character_creator,
             context=[build_world_task]
         )
         
         design_quests_task = Task(
-            description="Design one main quest arc involving major factions and locations, and several side quests. Include narrative twists.",
+            description=f"Design one main quest arc involving major factions and locations, and several side quests. Include narrative twists.{fix_note('quests')}",
             expected_output="JSON containing 'main_quest' and 'side_quests'.",
             agent=self.quest_designer,
             context=[build_world_task, create_npcs_task]
         )
         
-        check_consistency_task = Task(
-            description="Review the generated world (setting, locations, NPCs, quests). Ensure no geographic impossibilities, lore contradictions, or missing references. Output JSON with 'consistency_approved' as true, or detail what needs fixing.",
-            expected_output="JSON with a single boolean 'consistency_approved' and possibly explanations if false.",
+        return [build_world_task, create_npcs_task, design_quests_task]
+
+    def _create_check_task(self, content_tasks: list[Task], feedback: str = "", verified: Optional[list[WorldIssue]] = None) -> Task:
+        """
+        The consistency checker's task. `verified` holds the warnings of a rule-based validation the world
+        passed, in which case the checker skips the references rules already checked.
+        """
+        fix_note = f"\n\nFix these issues from the previous attempt:\n{feedback}" if feedback else ""
+        scope = "Ensure no geographic impossibilities, lore contradictions, or missing references."
+        if verified is not None:
+            scope = (
+                "Location connections, the NPCs present at each location and the uniqueness of names have already been "
+                "checked and are consistent; do not re-check them. Ensure no geographic impossibilities or lore contradictions, "
+                "and that the quests fit the world."
+            )
+            if verified:
+                scope += " Also consider: " + " ".join(issue.message for issue in verified)
+        return Task(
+            description=f"Review the generated world (setting, locations, NPCs, quests). {scope} Output JSON with 'consistency_approved' as true, or set it to false and detail what needs fixing in 'consistency_feedback'.{fix_note}",
+            expected_output="JSON with a single boolean 'consistency_approved' and, if false, explanations in 'consistency_feedback'.",
             agent=self.consistency_checker,
-            context=[build_world_task, create_npcs_task, design_quests_task],
+            context=content_tasks,
             output_json=WorldState # Enforce output mapping directly to our Pydantic schema
         )
-        
-        return [build_world_task, create_npcs_task, design_quests_task, check_consistency_task]
 
-    def run(self, max_iterations: int = 3) -> WorldState:
-        iteration = 0
-        current_seed = self.world_seed
-        
-        while iteration < max_iterations:
-            iteration += 1
-            print(f"\\n--- Running Generation Crew (Iteration {iteration}/{max_iterations}) ---")
+    def _report(self, message: str):
+        """Prints a progress message and forwards it to the progress callback, if any."""
+        print(message)
+        if self.progress_callback:
+            self.progress_callback(message.strip())
+
+    def _checkpoint_path(self, stage: str) -> Path:
+        return self.checkpoint_dir / f"{stage}.json"
+
+    def _load_checkpoints(self) -> dict[str, str]:
+        """Returns the raw outputs of content stages checkpointed by an earlier run of the same seed."""
+        outputs = {}
+        for stage in STAGE_FIELDS:
+            path = self._checkpoint_path(stage)
+            if not path.exists():
+                continue
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if data.get("seed") == self.world_seed:
+                outputs[stage] = data["raw"]
+        return outputs
+
+    def _save_checkpoint(self, stage: str, raw: str):
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        path = self._checkpoint_path(stage)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"seed": self.world_seed, "raw": raw}, f)
+        tmp_path.replace(path)
+
+    def _clear_checkpoints(self):
+        for stage in STAGE_FIELDS:
+            self._checkpoint_path(stage).unlink(missing_ok=True)
+
+    @staticmethod
+    def _raw_output(result) -> str:
+        raw = getattr(result, 'raw', None)
+        return raw if isinstance(raw, str) else str(result)
+
+    def _kickoff_stage(self, stage: str, task: Task):
+        """Runs one stage's task in its own crew, or replays the cached response for identical inputs."""
+        agent = task.agent
+        with self.telemetry.span("kickoff", stage, stage=stage, iteration=self.iterations, agent=agent.role) as span:
+            cache_key = None
+            if self.cache is not None:
+                cache_key = task_cache_key(agent, task)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    self._report(f"Using cached output for stage '{stage}'.")
+                    span["cache_hit"] = True
+                    return replay_cached_output(task, cached, agent.role)
             
             crew = Crew(
-                agents=[self.world_builder, self.character_creator, self.quest_designer, self.consistency_checker],
-                tasks=self._create_tasks(current_seed),
+                agents=[agent],
+                tasks=[task],
                 process=Process.sequential,
                 verbose=True
             )
-            
+            tokens_before = agent_token_usage(agent)
             result_output = crew.kickoff()
+            tokens_after = agent_token_usage(agent)
+            span["cache_hit"] = False
+            span["prompt_tokens"] = tokens_after[0] - tokens_before[0]
+            span["completion_tokens"] = tokens_after[1] - tokens_before[1]
+            
+            if cache_key is not None:
+                json_dict = getattr(result_output, 'json_dict', None)
+                self.cache.set(cache_key, json.dumps(json_dict) if isinstance(json_dict, dict) else self._raw_output(result_output))
+            return result_output
+
+    @staticmethod
+    def _stages_for_validation_error(error: ValidationError) -> set[str]:
+        stages = set()
+        for err in error.errors():
+            field = err["loc"][0] if err["loc"] else None
+            matched = [stage for stage, fields in STAGE_FIELDS.items() if field in fields]
+            # Errors outside the content fields (e.g. a missing flag) only need the checker to rerun
+            stages.update(matched)
+        return stages
+
+    @staticmethod
+    def _stages_for_feedback(feedback: str) -> set[str]:
+        text = feedback.lower()
+        stages = {stage for stage, words in STAGE_KEYWORDS.items() if any(w in text for w in words)}
+        # Vague feedback gives us nothing to narrow on
+        return stages or set(STAGE_FIELDS)
+
+    @staticmethod
+    def _with_dependents(stages: set[str]) -> set[str]:
+        # NPCs are built on the world's locations and quests on both, so a rerun cascades: world -> npcs -> quests
+        stale = set(stages)
+        for stage in STAGE_FIELDS:
+            if STAGE_DEPENDENCIES[stage] & stale:
+                stale.add(stage)
+        return stale
+
+    def run(self, max_iterations: int = 3) -> WorldState:
+        self._runs += 1
+        with self.telemetry.span("generation", self.world_seed, group="generation", generation=self._runs) as span:
+            try:
+                return self._run(max_iterations)
+            finally:
+                span["iterations"] = self.iterations
+                span["retries"] = max(0, self.iterations - 1)
+
+    @staticmethod
+    def _parse_json(raw: str):
+        """The JSON value in a stage's raw output, which may be fenced or surrounded by prose; None if there is none."""
+        text = raw.strip()
+        fenced = re.search(r"```(?:json)?\s*(.*?)\s*```", text, re.DOTALL)
+        if fenced:
+            text = fenced.group(1)
+        candidates = [text] + [m.group(0) for m in (re.search(pattern, text, re.DOTALL) for pattern in (r"\{.*\}", r"\[.*\]")) if m]
+        for candidate in candidates:
+            try:
+                return json.loads(candidate)
+            except ValueError:
+                continue
+        return None
+
+    def _assemble_world(self, stage_outputs: dict[str, str]) -> Optional[WorldState]:
+        """Puts the content stages' outputs together into a WorldState, or None if they do not fit the schema."""
+        world = self._parse_json(stage_outputs.get("world", ""))
+        npcs = self._parse_json(stage_outputs.get("npcs", ""))
+        quests = self._parse_json(stage_outputs.get("quests", ""))
+        if isinstance(npcs, dict):
+            npcs = npcs.get("npcs")
+        if not isinstance(world, dict) or not isinstance(npcs, list) or not isinstance(quests, dict):
+            return None
+        try:
+            return WorldState(
+                **{k: world.get(k) for k in STAGE_FIELDS["world"]},
+                npcs=npcs,
+                main_quest=quests.get("main_quest"),
+                side_quests=quests.get("side_quests", []),
+                seed=self.world_seed,
+                consistency_approved=False,
+            )
+        except (ValidationError, TypeError):
+            return None
+
+    def _check_rules(self, world_state: WorldState) -> list[WorldIssue]:
+        """Repairs what needs no judgement, reports it, and returns the remaining issues."""
+        for note in repair_world(world_state):
+            self._report(f"Repaired: {note}.")
+        issues = validate_world(world_state)
+        errors = [i for i in issues if i.severity == "error"]
+        if errors:
+            self._report(f"Rule-based validation found {len(errors)} error(s): " + " ".join(i.message for i in errors))
+        return issues
+
+    def _save_world(self, world_state: WorldState) -> WorldState:
+        with open(self.world_state_path, "w") as f:
+            f.write(world_state.model_dump_json(indent=2))
+        self._clear_checkpoints()
+        return world_state
+
+    def _run(self, max_iterations: int) -> WorldState:
+        self.iterations = 0
+        feedback = ""
+        stage_fixes: dict[str, str] = {}
+        
+        stage_outputs = self._load_checkpoints()
+        if stage_outputs:
+            self._report(f"Resuming from checkpointed stages: {', '.join(stage_outputs)}")
+        # Content stages that must (re)run in the next iteration; the checker runs unless the rules already failed
+        stale = set(STAGE_FIELDS) - set(stage_outputs)
+        
+        while self.iterations < max_iterations:
+            self.iterations += 1
+            iteration = self.iterations
+            self._report(f"\n--- Running Generation Crew (Iteration {iteration}/{max_iterations}) ---")
+            stale = self._with_dependents(stale)
+            if iteration > 1:
+                self._report(f"Rerunning stages: {', '.join(s for s in STAGES if s in stale or s == 'check')}")
+            
+            content_tasks = self._create_tasks(self.world_seed, feedback, stage_fixes)
+            for stage, task in zip(STAGES, content_tasks):
+                if stage not in stale:
+                    replay_cached_output(task, stage_outputs[stage], task.agent.role)
+                    continue
+                result_output = self._kickoff_stage(stage, task)
+                stage_outputs[stage] = self._raw_output(result_output)
+                self._save_checkpoint(stage, stage_outputs[stage])
+            stale = set()
+            stage_fixes = {}
+            
+            # Mechanical problems are caught by rules first, without a checker call.
+            # Stage outputs that cannot be assembled here are left to the checker, which assembles the final JSON.
+            verified = None
+            assembled = self._assemble_world(stage_outputs)
+            if assembled is not None:
+                issues = self._check_rules(assembled)
+                stage_fixes = fix_instructions(issues)
+                if stage_fixes:
+                    feedback = ""
+                    stale = set(stage_fixes)
+                    continue
+                verified = [i for i in issues if i.severity == "warning"]
+                if not self.llm_check:
+                    self._report("World passed rule-based validation; skipping the LLM consistency check.")
+                    assembled.consistency_approved = True
+                    return self._save_world(assembled)
+            
+            result_output = self._kickoff_stage("check", self._create_check_task(content_tasks, feedback, verified))
             
             # The result_output should ideally map to our Pydantic model now since we set output_json on the last task.
             try:
@@ -77,19 +337,18 @@ class GenerationCrew:
                      result_dict = result_output.json_dict
                 else:
                     # Fallback to string parsing just in case
-                    import re
-                    json_match = re.search(r'\\{.*\\}', str(result_output), re.DOTALL)
+                    json_match = re.search(r'\{.*\}', str(result_output), re.DOTALL)
                     if json_match:
                         result_dict = json.loads(json_match.group(0))
                     else:
                         result_dict = json.loads(str(result_output))
             except Exception as e:
-                print(f"Failed to parse crew output as JSON: {e}")
-                # If we fail to parse, feed that back as a seed to fix it
-                current_seed = f"Fix formatting errors. The output MUST be valid JSON matching the WorldState schema. Previous seed was: {self.world_seed}"
+                self._report(f"Failed to parse crew output as JSON: {e}")
+                # Only the checker assembles the final JSON, so only it reruns
+                feedback = "Fix formatting errors. The output MUST be valid JSON matching the WorldState schema."
                 continue
                 
-            print("Consistency check completed.")
+            self._report("Consistency check completed.")
             
             # Use Pydantic to validate
             try:
@@ -100,19 +359,21 @@ class GenerationCrew:
                 world_state = WorldState(**result_dict)
                 
                 if world_state.consistency_approved:
-                    print("World generation successful and approved!")
-                    
-                    # Persist to disk
-                    with open(self.world_state_path, "w") as f:
-                        f.write(world_state.model_dump_json(indent=2))
-                        
-                    return world_state
+                    # The checker rewrites the world, so its version is held to the same rules
+                    stage_fixes = fix_instructions(self._check_rules(world_state))
+                    if stage_fixes:
+                        feedback = ""
+                        stale = set(stage_fixes)
+                        continue
+                    self._report("World generation successful and approved!")
+                    return self._save_world(world_state)
                 else:
-                    print("Consistency checker failed approval. Retrying...")
-                    # Feed the feedback back in as part of the seed
-                    current_seed = f"Original seed: {self.world_seed}\\n\\nFeedback from Consistency Checker to fix: The generated world was inconsistent. Please ensure you fix the following issues in this iteration."
+                    self._report("Consistency checker failed approval. Retrying...")
+                    feedback = world_state.consistency_feedback or "The generated world was inconsistent."
+                    stale = self._stages_for_feedback(feedback)
             except ValidationError as e:
-                print(f"Schema validation error: {e}")
-                current_seed = f"Original seed: {self.world_seed}\\n\\nSchema error: Please ensure output matches the required JSON structure exactly."
+                self._report(f"Schema validation error: {e}")
+                feedback = f"Schema error: Please ensure output matches the required JSON structure exactly.\n{e}"
+                stale = self._stages_for_validation_error(e)
                 
         raise RuntimeError("Failed to generate a consistent and valid world state within max iterations.")
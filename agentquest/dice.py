@@ -0,0 +1,222 @@
+import math
+import random
+import re
+from itertools import combinations_with_replacement
+from typing import Optional, Union
+
+MAX_DICE = 100
+MAX_SIDES = 1000
+# Keep-highest/lowest distributions are exact, by enumerating multisets of faces; beyond this many, they are refused
+MAX_KEEP_OUTCOMES = 200_000
+# Plain sums are exact by convolution, up to this many dice times sides
+MAX_SUM_RANGE = 20_000
+
+TERM_PATTERN = re.compile(r"\s*([+-])\s*(?:(\d*)d(\d+|%)(?:(kh|kl)(\d+))?|(\d+))", re.IGNORECASE)
+MODE_PATTERN = re.compile(r"\s*(adv|advantage|dis|disadvantage)\s*$", re.IGNORECASE)
+LABEL_PATTERN = re.compile(r"^\s*([^:=]+?)\s*[:=]\s*(.+)$")
+
+
+class DiceError(ValueError):
+    """An invalid or unsupported dice expression."""
+
+
+class DiceTerm:
+    """One signed term of an expression: `NdM`, optionally keeping the K highest (`khK`) or lowest (`klK`), or a constant."""
+    def __init__(self, sign: int, count: int = 0, sides: int = 0, keep: Optional[str] = None, keep_count: int = 0, constant: int = 0):
+        self.sign = sign
+        self.count = count
+        self.sides = sides
+        self.keep = keep
+        self.keep_count = keep_count
+        self.constant = constant
+
+    @property
+    def is_dice(self) -> bool:
+        return self.count > 0
+
+    def notation(self) -> str:
+        if not self.is_dice:
+            return str(self.constant)
+        keep = f"{self.keep}{self.keep_count}" if self.keep else ""
+        return f"{self.count}d{self.sides}{keep}"
+
+    def roll(self, rng) -> tuple[int, str]:
+        """The signed value and a readable account of the roll."""
+        if not self.is_dice:
+            return self.sign * self.constant, str(self.constant)
+        rolls = rng.choices(range(1, self.sides + 1), k=self.count)
+        kept = self._kept(rolls)
+        detail = f"{self.notation()} {rolls}"
+        if self.keep:
+            detail += f" keeps {kept}"
+        return self.sign * sum(kept), detail
+
+    def _kept(self, rolls: list[int]) -> list[int]:
+        if self.keep == "kh":
+            return sorted(rolls, reverse=True)[:self.keep_count]
+        if self.keep == "kl":
+            return sorted(rolls)[:self.keep_count]
+        return rolls
+
+    def distribution(self) -> dict[int, float]:
+        """Exact probability of each signed value of this term."""
+        if not self.is_dice:
+            return {self.sign * self.constant: 1.0}
+        counts = self._keep_counts() if self.keep else self._sum_counts()
+        total = sum(counts.values())
+        return {self.sign * value: n / total for value, n in counts.items()}
+
+    def expected_value(self) -> float:
+        if not self.is_dice:
+            return float(self.sign * self.constant)
+        if not self.keep:
+            return self.sign * self.count * (self.sides + 1) / 2
+        return sum(value * p for value, p in self.distribution().items())
+
+    def _sum_counts(self) -> dict[int, int]:
+        if self.count * self.sides > MAX_SUM_RANGE:
+            raise DiceError(f"'{self.notation()}' has too many outcomes for an exact distribution.")
+        # ways[v] = number of ordered rolls summing to v; each added die is a sliding-window sum over the previous counts
+        ways = [1]
+        for _ in range(self.count):
+            prefix = [0]
+            for n in ways:
+                prefix.append(prefix[-1] + n)
+            size = len(ways) + self.sides
+            ways = [prefix[min(v, len(ways))] - prefix[max(0, v - self.sides)] for v in range(size)]
+        return {v: n for v, n in enumerate(ways) if n}
+
+    def _keep_counts(self) -> dict[int, int]:
+        if math.comb(self.count + self.sides - 1, self.count) > MAX_KEEP_OUTCOMES:
+            raise DiceError(f"'{self.notation()}' has too many outcomes for an exact distribution.")
+        counts: dict[int, int] = {}
+        for faces in combinations_with_replacement(range(1, self.sides + 1), self.count):
+            # Number of ordered rolls producing this multiset of faces
+            ways = math.factorial(self.count)
+            for face in set(faces):
+                ways //= math.factorial(faces.count(face))
+            value = sum(self._kept(list(faces)))
+            counts[value] = counts.get(value, 0) + ways
+        return counts
+
+
+def _convolve(a: dict[int, Union[int, float]], b: dict[int, Union[int, float]]) -> dict:
+    result: dict = {}
+    for x, px in a.items():
+        for y, py in b.items():
+            result[x + y] = result.get(x + y, 0) + px * py
+    return result
+
+
+class DiceExpression:
+    """
+    A parsed dice expression: signed terms such as `2d6+1d4+3`, `4d6kh3` or `d%`, optionally followed by
+    `adv` or `dis`, which rolls each single d20 (or, without one, the first single die) twice and keeps the higher
+    or lower. Rolls draw from the given random generator, so a seeded one reproduces them exactly.
+    """
+    def __init__(self, text: str, terms: list[DiceTerm]):
+        self.text = text
+        self.terms = terms
+
+    @classmethod
+    def parse(cls, text: str) -> "DiceExpression":
+        source = text.strip()
+        mode = None
+        match = MODE_PATTERN.search(source)
+        if match:
+            mode = "kh" if match.group(1).lower().startswith("adv") else "kl"
+            source = source[:match.start()]
+
+        body = source.replace(" ", "")
+        if not body:
+            raise DiceError("Empty dice expression.")
+        if body[0] not in "+-":
+            body = "+" + body
+        terms, pos = [], 0
+        while pos < len(body):
+            term = TERM_PATTERN.match(body, pos)
+            if term is None:
+                raise DiceError(f"Invalid dice expression '{text}'. Use notation like '1d20+2', '2d6+1d4+3', '4d6kh3' or '1d20+5 adv'.")
+            terms.append(cls._term(term))
+            pos = term.end()
+
+        if mode is not None:
+            single = [t for t in terms if t.is_dice and t.count == 1 and not t.keep]
+            target = next((t for t in single if t.sides == 20), single[0] if single else None)
+            if target is None:
+                raise DiceError(f"'{text}' has no single die to roll with {'advantage' if mode == 'kh' else 'disadvantage'}.")
+            for t in (t for t in single if t.sides == target.sides):
+                t.count, t.keep, t.keep_count = 2, mode, 1
+        return cls(text.strip(), terms)
+
+    @staticmethod
+    def _term(match: re.Match) -> DiceTerm:
+        sign = -1 if match.group(1) == "-" else 1
+        if match.group(6) is not None:
+            return DiceTerm(sign, constant=int(match.group(6)))
+        count = int(match.group(2)) if match.group(2) else 1
+        sides = 100 if match.group(3) == "%" else int(match.group(3))
+        keep = match.group(4).lower() if match.group(4) else None
+        keep_count = int(match.group(5)) if match.group(5) else 0
+        if count <= 0 or sides <= 0:
+            raise DiceError("Number of dice and sides must be positive integers.")
+        if count > MAX_DICE or sides > MAX_SIDES:
+            raise DiceError(f"At most {MAX_DICE} dice of up to {MAX_SIDES} sides per term.")
+        if keep and not 0 < keep_count <= count:
+            raise DiceError(f"Cannot keep {keep_count} of {count} dice.")
+        return DiceTerm(sign, count, sides, keep, keep_count)
+
+    def notation(self) -> str:
+        text = "".join(f"{'-' if t.sign < 0 else '+'}{t.notation()}" for t in self.terms)
+        return text[1:] if text.startswith("+") else text
+
+    def roll(self, rng=random) -> tuple[int, str]:
+        """The total and a readable account, e.g. `2d6 [4, 2] + 1d4 [3] + 3 = 12`."""
+        total, parts = 0, []
+        for i, term in enumerate(self.terms):
+            value, detail = term.roll(rng)
+            total += value
+            parts.append(detail if i == 0 and term.sign > 0 else f"{'-' if term.sign < 0 else '+'} {detail}")
+        return total, f"{' '.join(parts)} = {total}"
+
+    def distribution(self) -> dict[int, float]:
+        """Exact probability of every total, in ascending order of total."""
+        result: dict = {0: 1.0}
+        for term in self.terms:
+            result = _convolve(result, term.distribution())
+        return dict(sorted(result.items()))
+
+    def expected_value(self) -> float:
+        return sum(term.expected_value() for term in self.terms)
+
+    def bounds(self) -> tuple[int, int]:
+        """Lowest and highest possible totals."""
+        low = high = 0
+        for term in self.terms:
+            if not term.is_dice:
+                low += term.sign * term.constant
+                high += term.sign * term.constant
+                continue
+            dice = term.keep_count if term.keep else term.count
+            smallest, largest = dice, dice * term.sides
+            low += smallest if term.sign > 0 else -largest
+            high += largest if term.sign > 0 else -smallest
+        return low, high
+
+def parse_batch(text: str) -> list[tuple[Optional[str], DiceExpression]]:
+    """
+    Splits `;`-separated rolls, each optionally labelled (`Alice: 1d20+2; Bob: 1d20+1`).
+    `Alice, Bob: 1d20+2` rolls the same expression once per label.
+    """
+    rolls = []
+    for part in filter(None, (p.strip() for p in text.split(";"))):
+        match = LABEL_PATTERN.match(part)
+        if match is None:
+            rolls.append((None, DiceExpression.parse(part)))
+            continue
+        expression = DiceExpression.parse(match.group(2))
+        for label in filter(None, (l.strip() for l in match.group(1).split(","))):
+            rolls.append((label, expression))
+    if not rolls:
+        raise DiceError("Empty dice expression.")
+    return rolls
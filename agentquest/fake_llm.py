@@ -0,0 +1,101 @@
+import json
+import re
+import time
+from typing import Any
+
+from crewai.events.types.llm_events import LLMCallType
+from crewai.llms.base_llm import BaseLLM, llm_call_context
+
+from agentquest.utils import estimate_tokens
+
+# A small but complete world, returned by the generation agents
+FAKE_WORLD = {
+    "seed": "A quiet valley haunted by an old curse.",
+    "setting": "A fog-bound valley of farms and ruined watchtowers.",
+    "lore": "A bound spirit sleeps beneath the old keep; the seals are weakening.",
+    "factions": ["The Wardens", "The Hollow Choir"],
+    "locations": [
+        {"name": "Millbrook", "description": "A farming village.", "connected_to": ["Old Keep", "Fenwood"], "npcs_present": ["Elder Rowan"]},
+        {"name": "Old Keep", "description": "A ruined watchtower.", "connected_to": ["Millbrook"], "npcs_present": ["Sister Vale"]},
+        {"name": "Fenwood", "description": "A drowned forest.", "connected_to": ["Millbrook"], "npcs_present": []},
+    ],
+    "npcs": [
+        {"name": "Elder Rowan", "role": "Village elder", "personality": "Cautious", "attitude_toward_party": "friendly", "backstory": "Guards the village records."},
+        {"name": "Sister Vale", "role": "Cult leader", "personality": "Serene", "attitude_toward_party": "hostile", "backstory": "Seeks to wake the spirit."},
+    ],
+    "main_quest": {"title": "The Weakening Seals", "description": "Restore the seals beneath the Old Keep.", "objectives": ["Find the seal stones", "Stop the Hollow Choir"], "twists": ["The elder broke the first seal"], "is_main_quest": True},
+    "side_quests": [
+        {"title": "Lost in Fenwood", "description": "Find the missing shepherd.", "objectives": ["Search Fenwood"], "twists": [], "is_main_quest": False},
+    ],
+    "consistency_approved": True,
+}
+
+
+class FakeLLM(BaseLLM):
+    """
+    Deterministic, offline stand-in for a real model, selected with MODEL=fake/<name>.
+    Answers with scripted text chosen by agent role and task, after sleeping `latency` seconds
+    to mimic a provider round-trip. `responses` overrides the script per agent role.
+    With `stream`, the answer is also emitted word by word as crewai stream chunk events.
+    Token usage is estimated from the prompt and response, so crew usage metrics stay meaningful.
+    """
+    latency: float = 0.0
+    responses: dict[str, str] = {}
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def call(
+        self,
+        messages: Any,
+        tools: Any = None,
+        callbacks: Any = None,
+        available_functions: Any = None,
+        from_task: Any = None,
+        from_agent: Any = None,
+        response_model: Any = None,
+    ) -> str:
+        with llm_call_context():
+            self._emit_call_started_event(messages=messages, from_task=from_task, from_agent=from_agent)
+            prompt = messages if isinstance(messages, str) else "\n".join(str(m.get("content", "")) for m in messages)
+            if self.latency > 0:
+                time.sleep(self.latency)
+
+            role = getattr(from_agent, "role", "")
+            answer = self.responses.get(role) or self.scripted_response(role, prompt)
+            response = f"Thought: I now know the final answer\nFinal Answer: {answer}"
+            if self.stream:
+                for chunk in re.findall(r"\S+\s*", response):
+                    self._emit_stream_chunk_event(chunk, from_task=from_task, from_agent=from_agent, call_type=LLMCallType.LLM_CALL)
+
+            usage = {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": estimate_tokens(response)}
+            self._track_token_usage_internal(usage)
+            self._emit_call_completed_event(
+                response=response, call_type=LLMCallType.LLM_CALL,
+                from_task=from_task, from_agent=from_agent, messages=messages, usage=usage,
+            )
+            return response
+
+    @staticmethod
+    def scripted_response(role: str, prompt: str) -> str:
+        if role == "World Builder":
+            return json.dumps({k: FAKE_WORLD[k] for k in ("setting", "lore", "factions", "locations")})
+        if role == "Character Creator":
+            return json.dumps(FAKE_WORLD["npcs"])
+        if role == "Quest Designer":
+            return json.dumps({k: FAKE_WORLD[k] for k in ("main_quest", "side_quests")})
+        if role == "Consistency Checker":
+            return json.dumps(FAKE_WORLD)
+        if role == "Dungeon Master":
+            if "running summary" in prompt:
+                return "The party arrived in the valley and began investigating the curse."
+            if "Review all player actions" in prompt:
+                return (
+                    "### Dice Rolls\nNone.\n\n"
+                    "### Narrative Resolution\nThe party presses on through the fog.\n\n"
+                    "```json\n"
+                    + json.dumps({"characters": [], "location": None, "npc_attitudes": {"Elder Rowan": "hopeful"}, "quest_progress": {}, "game_over": False})
+                    + "\n```"
+                )
+            return "Fog rolls over the fields. A bell tolls from the Old Keep, and Elder Rowan waves you over."
+        return f"{role or 'The player'} readies their weapon and moves toward the sound of the bell."
@@ -0,0 +1,127 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from agentquest.models import WorldState
+from agentquest.persistence import atomic_write
+from agentquest.telemetry import Telemetry
+
+
+class JobQueueFull(Exception):
+    """Raised when a generation job is submitted while the queue is at capacity."""
+
+
+class GenerationJob:
+    """
+    One world generation request and its progress.
+    `events` is an append-only list of progress messages, so readers can follow it by offset.
+    """
+    def __init__(self, seed: str, output_dir: Optional[Path] = None, publish_to: Optional[Path] = None):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.seed = seed
+        self.output_dir = output_dir
+        self.publish_to = publish_to
+        self.status = "queued"  # queued / running / succeeded / failed
+        self.events: list[str] = []
+        self.error: Optional[str] = None
+        self.world_state: Optional[WorldState] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.future: Optional[Future[WorldState]] = None  # set by GenerationJobManager.submit
+        self.telemetry: Optional[Telemetry] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def add_event(self, message: str):
+        self.events.append(message)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "seed": self.seed,
+            "status": self.status,
+            "error": self.error,
+            "events": len(self.events),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class GenerationJobManager:
+    """
+    Runs GenerationCrews on a bounded worker pool. Each job writes to `jobs_dir/<job_id>` unless told otherwise;
+    with `publish_to`, the finished world is also written to that directory's world_state.json in one rename.
+    At most `max_workers` worlds generate at once and at most `max_queued` more wait their turn;
+    beyond that `submit` raises JobQueueFull. The newest `max_jobs_kept` finished jobs stay queryable.
+    """
+    def __init__(self, jobs_dir: Path, max_workers: int = 2, max_queued: int = 16, max_jobs_kept: int = 100):
+        self.jobs_dir = jobs_dir
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.max_jobs_kept = max_jobs_kept
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="generation")
+        self._jobs: OrderedDict[str, GenerationJob] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, seed: str, output_dir: Optional[Path] = None, publish_to: Optional[Path] = None) -> GenerationJob:
+        job = GenerationJob(seed, output_dir, publish_to)
+        if job.output_dir is None:
+            job.output_dir = self.jobs_dir / job.job_id
+        with self._lock:
+            pending = sum(1 for j in self._jobs.values() if not j.done)
+            if pending >= self.max_workers + self.max_queued:
+                raise JobQueueFull(f"Too many generation jobs in progress ({pending}). Try again later.")
+            self._jobs[job.job_id] = job
+            self._prune()
+            job.future = self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> list[GenerationJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: GenerationJob) -> WorldState:
+        # Imported here so the manager itself stays cheap to construct
+        from agentquest.crew.generation_crew import GenerationCrew
+
+        job.status = "running"
+        job.started_at = time.time()
+        job.add_event("Generation started.")
+        try:
+            crew = GenerationCrew(world_seed=job.seed, output_dir=job.output_dir, progress_callback=job.add_event)
+            job.telemetry = crew.telemetry
+            job.world_state = crew.run()
+            if job.publish_to is not None:
+                # Jobs never share a working directory; only the finished world replaces the published one
+                job.publish_to.mkdir(parents=True, exist_ok=True)
+                atomic_write(job.publish_to / "world_state.json", job.world_state.model_dump_json(indent=2))
+            job.status = "succeeded"
+            job.add_event("Generation finished.")
+            return job.world_state
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+            job.add_event(f"Generation failed: {e}")
+            raise
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_jobs_kept)]:
+            del self._jobs[job_id]
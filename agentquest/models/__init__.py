@@ -1,11 +1,11 @@
 from .world_state import WorldState, Location, NPC, Quest
 from .player_config import PlayerConfig
 from .game_state import GameState, CharacterState
-from .gameplay import PlayerAction, RoundResult
+from .gameplay import PlayerAction, RoundResult, StateChanges, CharacterChange
 
 __all__ = [
     "WorldState", "Location", "NPC", "Quest",
     "PlayerConfig",
     "GameState", "CharacterState",
-    "PlayerAction", "RoundResult",
+    "PlayerAction", "RoundResult", "StateChanges", "CharacterChange",
 ]
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Optional
+from pydantic import BaseModel, PrivateAttr
+from .gameplay import StateChanges
 
 class CharacterState(BaseModel):
     name: str
@@ -14,3 +16,70 @@ class GameState(BaseModel):
     npc_attitudes: dict[str, str]
     quest_progress: dict[str, bool]
     session_history: list[str]  # last N round summaries for context
+    history_summary: str = ""  # rolling summary of rounds folded out of session_history
+
+    # Lowercased character name -> position in `characters`
+    _character_index: dict[str, int] = PrivateAttr(default_factory=dict)
+
+    def get_character(self, name: str) -> Optional[CharacterState]:
+        """
+        Case-insensitive character lookup by name.
+        The index stores positions and is verified on every hit, so it stays correct
+        when characters are added, replaced or renamed in place.
+        """
+        key = name.strip().lower()
+        pos = self._character_index.get(key)
+        if pos is None or pos >= len(self.characters) or self.characters[pos].name.strip().lower() != key:
+            self._character_index = {c.name.strip().lower(): i for i, c in enumerate(self.characters)}
+            pos = self._character_index.get(key)
+            if pos is None:
+                return None
+        return self.characters[pos]
+
+    def apply_changes(self, changes: StateChanges) -> list[str]:
+        """
+        Applies a round's typed state diffs and returns a readable note per applied change.
+        HP is clamped to 0..max_hp; unknown characters and items a character does not carry are ignored.
+        """
+        notes = []
+        for change in changes.characters:
+            char = self.get_character(change.name)
+            if char is None:
+                continue
+            parts = []
+            if change.hp_change:
+                hp = max(0, min(char.max_hp, char.hp + change.hp_change))
+                if hp != char.hp:
+                    parts.append(f"HP {hp - char.hp:+d} ({hp}/{char.max_hp})")
+                    char.hp = hp
+            for item in change.items_gained:
+                char.inventory.append(item)
+                parts.append(f"gains {item}")
+            for item in change.items_lost:
+                carried = next((i for i in char.inventory if i.lower() == item.lower()), None)
+                if carried is not None:
+                    char.inventory.remove(carried)
+                    parts.append(f"loses {carried}")
+            for effect in change.status_added:
+                if effect not in char.status_effects:
+                    char.status_effects.append(effect)
+                    parts.append(f"is {effect}")
+            for effect in change.status_removed:
+                if effect in char.status_effects:
+                    char.status_effects.remove(effect)
+                    parts.append(f"is no longer {effect}")
+            if parts:
+                notes.append(f"{char.name} {', '.join(parts)}")
+
+        if changes.location and changes.location != self.current_location:
+            self.current_location = changes.location
+            notes.append(f"The party moves to {changes.location}")
+        for npc, attitude in changes.npc_attitudes.items():
+            if self.npc_attitudes.get(npc) != attitude:
+                self.npc_attitudes[npc] = attitude
+                notes.append(f"{npc} is now {attitude}")
+        for quest, completed in changes.quest_progress.items():
+            if self.quest_progress.get(quest) != completed:
+                self.quest_progress[quest] = completed
+                notes.append(f"Quest '{quest}' {'completed' if completed else 'in progress'}")
+        return notes
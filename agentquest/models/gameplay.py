@@ -1,13 +1,63 @@
-from pydantic import BaseModel
+import json
+import re
+from pydantic import BaseModel, Field
 from typing import Optional
 
+# The resolution's state changes: the last fenced JSON block, or a bare JSON object closing the text
+STATE_BLOCK_PATTERN = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```|(?:^|\n)(\{.*\})\s*$", re.DOTALL)
+STATUS_GAME_OVER = "STATUS: GAME_OVER"
+STATUS_MARKER_PATTERN = re.compile(r"\n*\**STATUS: (?:GAME_OVER|CONTINUE)\**\s*$", re.IGNORECASE)
+
 class PlayerAction(BaseModel):
     player_name: str
     action: str
     target: Optional[str] = None
 
+class CharacterChange(BaseModel):
+    name: str
+    hp_change: int = 0
+    items_gained: list[str] = []
+    items_lost: list[str] = []
+    status_added: list[str] = []
+    status_removed: list[str] = []
+
+class StateChanges(BaseModel):
+    characters: list[CharacterChange] = []
+    location: Optional[str] = None  # where the party ends the round, if it moved
+    npc_attitudes: dict[str, str] = {}
+    quest_progress: dict[str, bool] = {}
+
 class RoundResult(BaseModel):
     narration: str
-    state_changes: dict  # diffs applied to GameState
+    state_changes: StateChanges = Field(default_factory=StateChanges)  # diffs applied to GameState
     game_over: bool
     game_over_reason: Optional[str] = None
+    structured: bool = True  # False if the resolution had no valid state block and only its STATUS marker was read
+
+    @classmethod
+    def parse(cls, text: str) -> "RoundResult":
+        """
+        Splits a DM resolution into its narration and its JSON state block
+        ({"characters": [...], "location": ..., "npc_attitudes": {...}, "quest_progress": {...}, "game_over": ..., "game_over_reason": ...}).
+        Without a valid block, nothing changes and game over falls back to the STATUS marker.
+        """
+        matches = list(STATE_BLOCK_PATTERN.finditer(text))
+        if matches:
+            match = matches[-1]
+            try:
+                data = json.loads(match.group(1) or match.group(2))
+                narration = (text[:match.start()] + text[match.end():]).strip()
+                return cls(
+                    narration=STATUS_MARKER_PATTERN.sub("", narration).strip(),
+                    state_changes=StateChanges(**{k: v for k, v in data.items() if k in StateChanges.model_fields}),
+                    game_over=bool(data.get("game_over", False)),
+                    game_over_reason=data.get("game_over_reason"),
+                )
+            except (ValueError, TypeError, AttributeError):
+                # ValidationError is a ValueError; a malformed block is treated as missing
+                pass
+        return cls(
+            narration=text.strip(),
+            game_over=STATUS_GAME_OVER in text.upper(),
+            structured=False,
+        )
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseModel
 
 class Location(BaseModel):
@@ -30,3 +31,4 @@ class WorldState(BaseModel):
     main_quest: Quest
     side_quests: list[Quest]
     consistency_approved: bool
+    consistency_feedback: Optional[str] = None  # checker's explanation when not approved
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Union
+
+from agentquest.models import GameState
+
+
+def atomic_write(path: Union[str, Path], text: str):
+    """
+    Writes `text` to `path` via a temporary file in the same directory and a rename,
+    so readers and crashes only ever see the old or the new content, never a partial file.
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _history_delta(old: list, new: list) -> Optional[dict]:
+    """
+    Describes `new` as `old` minus its first `drop` entries plus `append`.
+    Covers both a finished round (append) and summarization (drop from the front).
+    """
+    for drop in range(len(old) + 1):
+        kept = len(old) - drop
+        if new[:kept] == old[drop:]:
+            return {"drop": drop, "append": new[kept:]}
+    return None
+
+
+class GameStateStore:
+    """
+    Persists a GameState as a snapshot (game_state.json) plus an append-only journal of
+    per-save deltas (game_state.journal.jsonl), so a save costs only what changed.
+    Every `compact_every` journal entries the state is compacted into a fresh snapshot.
+    Snapshots are replaced atomically, and a torn last journal line is ignored on load.
+    The journal starts with the digest of the snapshot it extends, so a journal left over
+    from before a compaction is never replayed onto the newer snapshot.
+    """
+    def __init__(self, directory: Path, compact_every: int = 20):
+        self.directory = Path(directory)
+        self.snapshot_path = self.directory / "game_state.json"
+        self.journal_path = self.directory / "game_state.journal.jsonl"
+        self.compact_every = compact_every
+        self._persisted: Optional[dict] = None
+        self._snapshot_digest: Optional[str] = None
+        self._journal_entries = 0
+
+    def exists(self) -> bool:
+        return self.snapshot_path.exists()
+
+    def signature(self) -> tuple:
+        """Modification time and size of the snapshot and journal; changes whenever anyone writes them."""
+        def stat(path: Path):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                return None
+            return st.st_mtime_ns, st.st_size
+        return stat(self.snapshot_path), stat(self.journal_path)
+
+    def _read(self) -> tuple[dict, str, list[dict], bool]:
+        """The snapshot, its digest, the journal deltas extending it, and whether the journal was read cleanly."""
+        with open(self.snapshot_path, "r") as f:
+            text = f.read()
+        data = json.loads(text)
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+        deltas = []
+        clean = True
+        if self.journal_path.exists():
+            with open(self.journal_path, "r") as f:
+                header = f.readline()
+                try:
+                    clean = json.loads(header).get("snapshot") == digest
+                except ValueError:
+                    clean = False
+                for line in f if clean else []:
+                    try:
+                        deltas.append(json.loads(line))
+                    except ValueError:
+                        # A crash mid-append leaves at most one partial line at the end
+                        clean = False
+                        break
+        return data, digest, deltas, clean
+
+    def load(self) -> GameState:
+        data, digest, deltas, clean = self._read()
+        for delta in deltas:
+            self._apply_delta(data, delta)
+
+        game_state = GameState(**data)
+        self._snapshot_digest = digest
+        self._journal_entries = len(deltas)
+        # A stale or torn journal must not be appended to; the next save writes a fresh snapshot instead.
+        # Loading itself never writes, so readers can load while a session is being played.
+        self._persisted = game_state.model_dump(mode="json") if clean else None
+        return game_state
+
+    def changes_since(self, version: Optional[str] = None) -> dict:
+        """
+        The persisted state under a version token, `<snapshot digest>.<journal entries>`.
+        Given the version a reader already holds, returns only the journal deltas written since;
+        apply them in order, each setting the top-level fields in `set` and dropping `history.drop`
+        entries from the front of the session history before appending `history.append`.
+        After a compaction, or for an unknown version, returns the whole state instead.
+        """
+        data, digest, deltas, _ = self._read()
+        current = f"{digest[:16]}.{len(deltas)}"
+        if version == current:
+            return {"version": current, "changed": False}
+        base, _, held = (version or "").partition(".")
+        if base == digest[:16] and held.isdigit() and int(held) <= len(deltas):
+            return {"version": current, "changed": True, "deltas": deltas[int(held):]}
+        for delta in deltas:
+            self._apply_delta(data, delta)
+        return {"version": current, "changed": True, "game_state": GameState(**data).model_dump()}
+
+    def save(self, game_state: GameState):
+        current = game_state.model_dump(mode="json")
+        if self._persisted is None or self._journal_entries >= self.compact_every:
+            self._write_snapshot(current)
+            return
+
+        delta = self._diff(self._persisted, current)
+        if delta is None:
+            self._write_snapshot(current)
+            return
+        if not delta:
+            return
+
+        with open(self.journal_path, "a") as f:
+            if self._journal_entries == 0:
+                f.write(json.dumps({"snapshot": self._snapshot_digest}) + "\n")
+            f.write(json.dumps(delta) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._persisted = current
+        self._journal_entries += 1
+
+    def compact(self, game_state: GameState):
+        """Folds the journal into a fresh snapshot."""
+        self._write_snapshot(game_state.model_dump(mode="json"))
+
+    def _write_snapshot(self, data: dict):
+        text = json.dumps(data, indent=2)
+        atomic_write(self.snapshot_path, text)
+        # The snapshot now covers everything the journal recorded
+        self.journal_path.unlink(missing_ok=True)
+        self._persisted = data
+        self._snapshot_digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        self._journal_entries = 0
+
+    @staticmethod
+    def _diff(old: dict, new: dict) -> Optional[dict]:
+        """Returns the delta from `old` to `new`, {} if unchanged, or None if only a snapshot can express it."""
+        delta: dict = {}
+        changed = {k: v for k, v in new.items() if k != "session_history" and old.get(k) != v}
+        if changed:
+            delta["set"] = changed
+        if old.get("session_history") != new["session_history"]:
+            history = _history_delta(old.get("session_history", []), new["session_history"])
+            if history is None:
+                return None
+            delta["history"] = history
+        return delta
+
+    @staticmethod
+    def _apply_delta(data: dict, delta: dict):
+        data.update(delta.get("set", {}))
+        history = delta.get("history")
+        if history:
+            data["session_history"] = data["session_history"][history["drop"]:] + history["append"]
+
+
+def load_game_state(directory: Path) -> Optional[GameState]:
+    """Loads the persisted GameState of a session directory (snapshot plus journal), or None if there is none."""
+    store = GameStateStore(directory)
+    if not store.exists():
+        return None
+    return store.load()
@@ -1,16 +1,35 @@
+import asyncio
 import json
+import os
+import threading
 import yaml
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
 
 from agentquest.models import WorldState, PlayerConfig
-from agentquest.crew.generation_crew import GenerationCrew
-from agentquest.crew.gameplay_crew import GameplayCrew
+from agentquest.sessions import SessionRegistry, session_output_dir
+from agentquest.jobs import GenerationJobManager, JobQueueFull
+from agentquest.persistence import GameStateStore, load_game_state
+from agentquest.streaming import StreamChannel
+from agentquest.transcript import TranscriptStore, read_transcript
+
+def preload_crews():
+    # Importing the crews pulls in all of crewai (seconds); done off the startup path so the server is ready at once
+    import agentquest.crew.gameplay_crew  # noqa: F401
+    import agentquest.crew.generation_crew  # noqa: F401
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The first game or generation finds the crews already imported, or waits only for the rest of the import
+    threading.Thread(target=preload_crews, name="preload-crews", daemon=True).start()
+    yield
 
-app = FastAPI(title="AgentQuest API")
+app = FastAPI(title="AgentQuest API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -20,15 +39,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Hardcoded paths for the single-tenant local server
+# The world is shared; every game session gets its own directory under OUTPUT_DIR
 OUTPUT_DIR = Path("output")
-SESSION_DIR = OUTPUT_DIR / "session"
 WORLD_STATE_PATH = OUTPUT_DIR / "world_state.json"
-GAME_STATE_PATH = SESSION_DIR / "game_state.json"
-TRANSCRIPT_PATH = SESSION_DIR / "transcript.md"
+DEFAULT_SESSION_ID = "default"
 
-# In-memory holder for the active GameplayCrew
-active_gameplay_crew: Optional[GameplayCrew] = None
+# In-memory registry of active GameplayCrews, keyed by session ID
+sessions = SessionRegistry(
+    max_sessions=int(os.environ.get("AGENTQUEST_MAX_SESSIONS", "32")),
+    ttl_seconds=float(os.environ.get("AGENTQUEST_SESSION_TTL", "3600")),
+)
+
+# Bounded pool for world generation; excess requests queue up to a limit, then get a 429
+generation_jobs = GenerationJobManager(
+    OUTPUT_DIR / "worlds",
+    max_workers=int(os.environ.get("AGENTQUEST_GENERATION_WORKERS", "2")),
+    max_queued=int(os.environ.get("AGENTQUEST_GENERATION_QUEUE", "16")),
+)
+
+# Messages buffered per streaming response; beyond this the round waits for the client
+STREAM_QUEUE_SIZE = int(os.environ.get("AGENTQUEST_STREAM_QUEUE", "256"))
+
+# Most transcript bytes returned per /api/state/transcript call; clients page on with `next_offset`
+TRANSCRIPT_PAGE_BYTES = int(os.environ.get("AGENTQUEST_TRANSCRIPT_PAGE", str(256 * 1024)))
+
+def validate_id(value: str) -> str:
+    try:
+        return SessionRegistry.validate_id(value)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def get_session_dir(session_id: str) -> Path:
+    validate_id(session_id)
+    return session_output_dir(OUTPUT_DIR, session_id, DEFAULT_SESSION_ID)
 
 class GenerateRequest(BaseModel):
     seed: str
@@ -36,38 +79,140 @@ class GenerateRequest(BaseModel):
 class PlayRequest(BaseModel):
     players_yaml: Optional[str] = None
     resume: bool = True
+    session_id: str = DEFAULT_SESSION_ID
+    world_id: Optional[str] = None  # play a world produced by a generation job instead of the default one
+    prefetch_scene: bool = False  # describe the next scene in the background while the UI shows this round
+    stream_tokens: bool = True  # stream LLM tokens as [TOKEN] events, not just finished task outputs
+    context_mode: Literal["slim", "full"] = "slim"  # per-agent state facts and relevant history, or the whole recent history
+    max_parallel_players: int = Field(default=4, ge=1, le=16)  # player agents acting concurrently each round
+
+def get_world_path(world_id: Optional[str] = None) -> Path:
+    if world_id:
+        return generation_jobs.jobs_dir / validate_id(world_id) / "world_state.json"
+    return WORLD_STATE_PATH
+
+def get_job_or_404(job_id: str):
+    job = generation_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Generation job '{job_id}' not found.")
+    return job
 
 @app.get("/api/status")
-def get_status():
+def get_status(session_id: str = DEFAULT_SESSION_ID):
     """Returns the current status of the server."""
+    session_dir = get_session_dir(session_id)
     world_exists = WORLD_STATE_PATH.exists()
-    game_exists = GAME_STATE_PATH.exists()
+    game_exists = (session_dir / "game_state.json").exists()
     return {
         "world_generated": world_exists,
         "game_in_progress": game_exists,
-        "crew_active": active_gameplay_crew is not None
+        "crew_active": sessions.get(session_id) is not None,
+        "active_sessions": len(sessions)
+    }
+
+@app.get("/api/sessions")
+def list_sessions():
+    """Lists the game sessions currently held in memory."""
+    return {
+        "sessions": [
+            {
+                "session_id": s.session_id,
+                "round_number": s.crew.game_state.round_number,
+                "busy": s.busy
+            } for s in sessions.list()
+        ]
     }
 
 @app.post("/api/generate")
-def generate_world(req: GenerateRequest):
-    """Generates a new world based on the seed. This is a blocking call and may take a few minutes."""
+async def generate_world(req: GenerateRequest):
+    """
+    Generates a new world based on the seed and makes it the default world. This may take a few minutes.
+    Runs as a generation job, so waiting does not hold a server thread; prefer /api/generate/jobs for polling.
+    """
     try:
-        crew = GenerationCrew(world_seed=req.seed, output_dir=OUTPUT_DIR)
-        world_state = crew.run()
+        job = generation_jobs.submit(req.seed, publish_to=OUTPUT_DIR)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    if job.future is None:
+        raise HTTPException(status_code=500, detail=f"Generation job '{job.job_id}' was not started.")
+    try:
+        world_state = await asyncio.wrap_future(job.future)
         return {"message": "World generated successfully", "world_state": world_state.model_dump()}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/generate/jobs", status_code=202)
+def submit_generation_job(req: GenerateRequest):
+    """Queues a world generation job and returns its ID immediately. The world is saved under output/worlds/<job_id>."""
+    try:
+        job = generation_jobs.submit(req.seed)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return job.to_dict()
+
+@app.get("/api/generate/jobs")
+def list_generation_jobs():
+    """Lists queued, running and recently finished generation jobs."""
+    return {"jobs": [job.to_dict() for job in generation_jobs.list()]}
+
+@app.get("/api/generate/jobs/{job_id}")
+def get_generation_job(job_id: str):
+    """Returns the status of a generation job and its progress messages."""
+    job = get_job_or_404(job_id)
+    return dict(job.to_dict(), events=list(job.events))
+
+@app.get("/api/generate/jobs/{job_id}/events")
+async def stream_generation_job(job_id: str, offset: int = 0):
+    """Streams a generation job's progress messages as Server-Sent Events until it finishes."""
+    job = get_job_or_404(job_id)
+    
+    async def event_generator():
+        sent = max(0, offset)
+        while True:
+            done = job.done
+            while sent < len(job.events):
+                content = job.events[sent].replace("\n", "\\n")
+                yield f"data: {content}\n\n"
+                sent += 1
+            if done:
+                yield f"data: [STATUS] {json.dumps(job.to_dict())}\n\n"
+                yield "data: [DONE]\n\n"
+                break
+            await asyncio.sleep(0.5)
+    
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+@app.get("/api/generate/jobs/{job_id}/result")
+def get_generation_result(job_id: str):
+    """Returns the WorldState produced by a finished generation job."""
+    job = get_job_or_404(job_id)
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.world_state is None:
+        raise HTTPException(status_code=409, detail=f"Generation job '{job_id}' is still {job.status}.")
+    return {"job_id": job.job_id, "world_state": job.world_state.model_dump()}
+
 @app.post("/api/play/start")
 def start_play(req: PlayRequest):
-    """Initializes the gameplay crew with a world and player configs."""
-    global active_gameplay_crew
+    """Initializes the gameplay crew for a session with a world and player configs."""
+    session_dir = get_session_dir(req.session_id)
+    world_state_path = get_world_path(req.world_id)
     
-    if not WORLD_STATE_PATH.exists():
+    if not world_state_path.exists():
         raise HTTPException(status_code=400, detail="World state not found. Generate a world first.")
+    
+    # The new crew takes over the session's files, so the old one must not be playing, now or while it starts
+    existing = sessions.get(req.session_id)
+    if existing is not None:
+        try:
+            acquired = existing.acquire(blocking=False)
+        except RuntimeError:
+            acquired, existing = True, None  # already replaced; nothing of it is left running
+        if not acquired:
+            raise HTTPException(status_code=409, detail=f"Session '{req.session_id}' is in the middle of a round. Start it again once the round is over.")
         
     try:
-        with open(WORLD_STATE_PATH, 'r') as f:
+        with open(world_state_path, 'r') as f:
             world_data = json.load(f)
             world_state = WorldState(**world_data)
             
@@ -82,80 +227,102 @@ def start_play(req: PlayRequest):
             
         player_configs = [PlayerConfig(**p) for p in players_data.get('players', [])]
         
-        active_gameplay_crew = GameplayCrew(
+        from agentquest.crew.gameplay_crew import GameplayCrew
+        if existing is not None:
+            # A pending history summary or scene prefetch would still write to the session's files
+            existing.crew.wait_for_background_tasks()
+        crew = GameplayCrew(
             world_state=world_state, 
             players=player_configs, 
-            output_dir=SESSION_DIR, 
-            resume=req.resume
+            output_dir=session_dir, 
+            resume=req.resume,
+            prefetch_scene=req.prefetch_scene,
+            stream_llm_tokens=req.stream_tokens,
+            context_mode=req.context_mode,
+            max_parallel_players=req.max_parallel_players
         )
+        sessions.put(req.session_id, crew)
         
-        return {"message": "Game session started", "game_state": active_gameplay_crew.game_state.model_dump()}
+        return {"message": "Game session started", "session_id": req.session_id, "game_state": crew.game_state.model_dump()}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-
-import asyncio
-import threading
-from fastapi.responses import StreamingResponse
+    finally:
+        if existing is not None:
+            # The replaced session is closed here, once released
+            existing.release()
 
 @app.post("/api/play/step")
-async def play_step():
-    """Runs a single round of the game, streaming the actions as Server-Sent Events."""
-    global active_gameplay_crew
+async def play_step(session_id: str = DEFAULT_SESSION_ID):
+    """Runs a single round of the session's game, streaming the actions as Server-Sent Events."""
+    get_session_dir(session_id)
+    session = sessions.get(session_id)
     
-    if not active_gameplay_crew:
+    if not session:
         raise HTTPException(status_code=400, detail="Gameplay crew not initialized. Call /api/play/start first.")
         
-    # Create the async queue for streaming
-    stream_queue = asyncio.Queue()
-    active_gameplay_crew.stream_queue = stream_queue
-    
-    # Run the crew in a background thread so it doesn't block the async generator
-    # We must pass the current event loop so the synchronous callbacks can put into the queue
-    loop = asyncio.get_running_loop()
+    # Bounded, so a slow client holds the round back instead of messages being dropped.
+    # The crew runs in a background thread and hands messages over to this event loop.
+    stream_channel = StreamChannel(asyncio.get_running_loop(), maxsize=STREAM_QUEUE_SIZE)
     
     def run_crew():
         try:
-            continues = active_gameplay_crew.run_round()
+            # Rounds within a session are serialized; a concurrent step waits for the current one
+            with session.playing():
+                session.crew.stream_channel = stream_channel
+                try:
+                    continues = session.crew.run_round()
+                finally:
+                    session.crew.stream_channel = None
+                session.touch()
             # Signal completion
-            asyncio.run_coroutine_threadsafe(
-                stream_queue.put({"type": "done", "continues": continues}), 
-                loop
-            )
+            stream_channel.send({"type": "done", "continues": continues})
         except Exception as e:
-            asyncio.run_coroutine_threadsafe(
-                stream_queue.put({"type": "error", "detail": str(e)}), 
-                loop
-            )
+            stream_channel.send({"type": "error", "detail": str(e)})
             
     threading.Thread(target=run_crew, daemon=True).start()
     
     async def event_generator():
-        while True:
-            item = await stream_queue.get()
-            
-            if isinstance(item, dict):
-                if item["type"] == "done":
-                    # Send final game state update
-                    state_json = json.dumps({
-                        "game_continues": item["continues"],
-                        "game_state": active_gameplay_crew.game_state.model_dump()
-                    })
-                    yield f"data: [STATE] {state_json}\n\n"
-                    yield "data: [DONE]\n\n"
-                    break
-                elif item["type"] == "error":
-                    yield f"data: [ERROR] {item['detail']}\n\n"
-                    break
-            else:
-                # Replace newlines so JS EventSource parses single data block correctly
-                content = item.replace("\n", "\\n")
-                yield f"data: {content}\n\n"
+        try:
+            while True:
+                item = await stream_channel.receive()
+                
+                if isinstance(item, dict):
+                    if item["type"] == "token":
+                        # A live preview of the task in progress; its full output follows as a plain message
+                        token_json = json.dumps({k: item[k] for k in ("agent", "phase", "text", "done")})
+                        yield f"data: [TOKEN] {token_json}\n\n"
+                    elif item["type"] == "done":
+                        # Send final game state update
+                        state_json = json.dumps({
+                            "game_continues": item["continues"],
+                            "game_state": session.crew.game_state.model_dump()
+                        })
+                        yield f"data: [STATE] {state_json}\n\n"
+                        yield "data: [DONE]\n\n"
+                        break
+                    elif item["type"] == "error":
+                        yield f"data: [ERROR] {item['detail']}\n\n"
+                        break
+                else:
+                    # Replace newlines so JS EventSource parses single data block correctly
+                    content = item.replace("\n", "\\n")
+                    yield f"data: {content}\n\n"
+        finally:
+            # The client may have gone away; never leave the round blocked on a full queue
+            stream_channel.close()
                 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
 @app.get("/api/state")
-def get_state():
-    """Returns the current world state and game state if they exist."""
+def get_state(session_id: str = DEFAULT_SESSION_ID):
+    """
+    Returns the current world state and the session's game state if they exist, and the whole transcript.
+    Kept for older clients; /api/state/world, /api/state/game and /api/state/transcript return the same pieces incrementally.
+    """
+    session_dir = get_session_dir(session_id)
+    transcript_path = session_dir / "transcript.md"
     world_state = None
     game_state = None
     transcript = None
@@ -164,16 +331,18 @@ def get_state():
         with open(WORLD_STATE_PATH, 'r') as f:
             world_state = json.load(f)
             
-    if GAME_STATE_PATH.exists():
-        with open(GAME_STATE_PATH, 'r') as f:
-            game_state = json.load(f)
+    # The snapshot alone can lag behind; load_game_state replays the journal on top of it
+    persisted = load_game_state(session_dir)
+    if persisted is not None:
+        game_state = persisted.model_dump()
             
-    if TRANSCRIPT_PATH.exists():
-        with open(TRANSCRIPT_PATH, 'r') as f:
+    if transcript_path.exists():
+        with open(transcript_path, 'r') as f:
             transcript = f.read()
             
-    if active_gameplay_crew is not None and not game_state:
-        game_state = active_gameplay_crew.game_state.model_dump()
+    session = sessions.get(session_id)
+    if session is not None and not game_state:
+        game_state = session.crew.game_state.model_dump()
         
     return {
         "world_state": world_state,
@@ -181,6 +350,107 @@ def get_state():
         "transcript": transcript
     }
 
+@app.get("/api/state/world")
+def get_world_state(request: Request, world_id: Optional[str] = None):
+    """
+    Returns the world state with an ETag. A request whose If-None-Match holds the current
+    ETag gets an empty 304, so clients revalidating a world that has not changed download nothing.
+    """
+    path = get_world_path(world_id)
+    try:
+        stat = path.stat()
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        if etag in (tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")):
+            return Response(status_code=304, headers={"ETag": etag})
+        content = path.read_bytes()
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="World state not found. Generate a world first.")
+    # no-cache: browsers keep the world but revalidate it on every use
+    return Response(content=content, media_type="application/json", headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+@app.get("/api/state/game")
+def get_game_state(session_id: str = DEFAULT_SESSION_ID, since_version: Optional[str] = None):
+    """
+    Returns the session's game state under a version token. Pass the version you hold as `since_version`
+    to get `changed: false` if nothing was saved since, or just the `deltas` written since then.
+    """
+    session_dir = get_session_dir(session_id)
+    store = GameStateStore(session_dir)
+    if store.exists():
+        try:
+            return store.changes_since(since_version)
+        except FileNotFoundError:
+            pass  # the session directory was cleared while reading
+    session = sessions.get(session_id)
+    game_state = session.crew.game_state.model_dump() if session is not None else None
+    # Not saved yet, so there is no version to hold on to
+    return {"version": None, "changed": True, "game_state": game_state}
+
+@app.get("/api/state/transcript")
+def get_transcript(session_id: str = DEFAULT_SESSION_ID, offset: int = 0, from_round: Optional[int] = None, limit: int = TRANSCRIPT_PAGE_BYTES):
+    """
+    Returns the session's transcript from byte `offset`, or from the start of round `from_round`, onward,
+    at most `limit` bytes per call. Continue from `next_offset` until it reaches `size`; `reset` means
+    the transcript was started over and the text begins at its start.
+    """
+    session_dir = get_session_dir(session_id)
+    limit = max(1, min(limit, TRANSCRIPT_PAGE_BYTES))
+    transcript = TranscriptStore.open_existing(session_dir)
+    if transcript is None:
+        if from_round is not None:
+            raise HTTPException(status_code=404, detail=f"Session '{session_id}' has no transcript index yet.")
+        return read_transcript(session_dir / "transcript.md", offset, limit)
+    with transcript:
+        if from_round is not None:
+            found = transcript.offset_of(from_round)
+            offset = found if found is not None else transcript.markdown_path.stat().st_size
+        return read_transcript(transcript.markdown_path, offset, limit)
+
+@app.get("/api/state/transcript/rounds")
+def get_transcript_rounds(session_id: str = DEFAULT_SESSION_ID, start: int = 1, end: Optional[int] = None, limit: int = 50):
+    """Returns the markdown of the session's rounds from `start` to `end`, at most `limit` (up to 50) rounds."""
+    transcript = TranscriptStore.open_existing(get_session_dir(session_id))
+    if transcript is None:
+        return {"rounds": [], "last_round": None}
+    with transcript:
+        rounds = transcript.rounds(start, end, max(1, min(limit, 50)))
+        return {
+            "rounds": [{"round": number, "markdown": markdown} for number, markdown in rounds],
+            "last_round": transcript.last_round(),
+        }
+
+@app.get("/api/state/transcript/search")
+def search_transcript(q: str, session_id: str = DEFAULT_SESSION_ID, limit: int = 20):
+    """Searches the DM's narration across the session's rounds; returns the matching rounds with snippets."""
+    transcript = TranscriptStore.open_existing(get_session_dir(session_id))
+    if transcript is None:
+        return {"results": []}
+    with transcript:
+        return {"results": transcript.search(q, max(1, min(limit, 100)))}
+
+@app.get("/api/metrics")
+def get_metrics(session_id: Optional[str] = None, job_id: Optional[str] = None):
+    """
+    Returns per-round timing, token and cache aggregates of active sessions and per-run
+    aggregates of generation jobs. Narrow it down with `session_id` or `job_id`.
+    """
+    if session_id is not None:
+        validate_id(session_id)
+        session = sessions.get(session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail=f"No active session '{session_id}'.")
+        return {"session_id": session_id, "rounds": session.crew.telemetry.summary()["rounds"]}
+    if job_id is not None:
+        job = get_job_or_404(job_id)
+        generations = job.telemetry.summary()["generations"] if job.telemetry is not None else []
+        return {"job_id": job_id, "generations": generations}
+    return {
+        "sessions": {s.session_id: s.crew.telemetry.summary()["rounds"] for s in sessions.list()},
+        "generation_jobs": {
+            job.job_id: job.telemetry.summary()["generations"] for job in generation_jobs.list() if job.telemetry is not None
+        },
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
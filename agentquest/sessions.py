@@ -0,0 +1,179 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from agentquest.crew.gameplay_crew import GameplayCrew
+
+SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class GameSession:
+    """
+    A single game table hosted by the server.
+    The lock serializes rounds within the session; different sessions step in parallel.
+    A session retired from the registry in the middle of a round is closed when that round releases it.
+    """
+    def __init__(self, session_id: str, crew: "GameplayCrew"):
+        self.session_id = session_id
+        self.crew = crew
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self.retired = False
+        self.closed = False
+        # Guards `retired` against a concurrent release, so a retirement is never missed
+        self._retire_lock = threading.Lock()
+
+    def touch(self):
+        self.last_used = time.monotonic()
+
+    @property
+    def busy(self) -> bool:
+        return self.lock.locked()
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Takes the session's lock; fails once the session has been retired, since its crew is (about to be) closed."""
+        if not self.lock.acquire(blocking):
+            return False
+        if self.retired:
+            self.release()
+            raise RuntimeError(f"Session '{self.session_id}' was replaced or removed.")
+        return True
+
+    def release(self):
+        with self._retire_lock:
+            self.lock.release()
+            close = self.retired
+        if close:
+            self.close()
+
+    @contextmanager
+    def playing(self):
+        """Holds the session for a round."""
+        self.acquire()
+        try:
+            yield self
+        finally:
+            self.release()
+
+    def retire(self):
+        """Closes the session now if it is idle, or when the round holding it releases it."""
+        with self._retire_lock:
+            self.retired = True
+            if self.lock.locked():
+                return
+        self.close()
+
+    def close(self):
+        with self._retire_lock:
+            if self.closed:
+                return
+            self.closed = True
+        # Waits for the crew's background work, then returns its LLM clients to the shared pool
+        self.crew.close()
+
+
+class SessionRegistry:
+    """
+    Thread-safe registry of active GameSessions keyed by session ID.
+    Evicts the least recently used sessions beyond `max_sessions`, and any session idle for longer than `ttl_seconds`.
+    Evicted sessions keep their files on disk and can be resumed by starting them again.
+    Sessions that leave the registry (evicted, removed or replaced) are retired: closed at once if idle,
+    otherwise as soon as their round finishes, which returns their LLM clients to the shared pool.
+    """
+    def __init__(self, max_sessions: int = 32, ttl_seconds: float = 3600.0):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: OrderedDict[str, GameSession] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def validate_id(session_id: str) -> str:
+        if not SESSION_ID_PATTERN.match(session_id):
+            raise ValueError(f"Invalid session id '{session_id}'. Use 1-64 letters, digits, '-' or '_'.")
+        return session_id
+
+    def get(self, session_id: str) -> Optional[GameSession]:
+        with self._lock:
+            evicted = self._evict_expired()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.touch()
+                self._sessions.move_to_end(session_id)
+        self._close(evicted)
+        return session
+
+    def put(self, session_id: str, crew: "GameplayCrew") -> GameSession:
+        """Registers (or replaces) the crew for a session and returns the new GameSession."""
+        self.validate_id(session_id)
+        session = GameSession(session_id, crew)
+        with self._lock:
+            replaced = self._sessions.get(session_id)
+            self._sessions[session_id] = session
+            self._sessions.move_to_end(session_id)
+            evicted = self._evict_expired() + self._evict_overflow()
+        # A replaced session still playing a round finishes it with its own clients and is closed afterwards
+        if replaced is not None and replaced.crew is not crew:
+            evicted.append(replaced)
+        self._close(evicted)
+        return session
+
+    def remove(self, session_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self._close([session])
+        return session is not None
+
+    def list(self) -> list[GameSession]:
+        with self._lock:
+            evicted = self._evict_expired()
+            sessions = list(self._sessions.values())
+        self._close(evicted)
+        return sessions
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def _evict_expired(self) -> "list[GameSession]":
+        evicted = []
+        if self.ttl_seconds <= 0:
+            return evicted
+        now = time.monotonic()
+        for session_id, session in list(self._sessions.items()):
+            # Never evict a session that is in the middle of a round
+            if not session.busy and now - session.last_used > self.ttl_seconds:
+                print(f"[System] Evicting idle session '{session_id}'")
+                evicted.append(self._sessions.pop(session_id))
+        return evicted
+
+    def _evict_overflow(self) -> "list[GameSession]":
+        evicted = []
+        for session_id, session in list(self._sessions.items()):
+            if len(self._sessions) <= self.max_sessions:
+                break
+            if not session.busy:
+                print(f"[System] Evicting least recently used session '{session_id}'")
+                evicted.append(self._sessions.pop(session_id))
+        return evicted
+
+    @staticmethod
+    def _close(sessions: "list[GameSession]"):
+        # Outside the registry lock: closing waits for the session's background work
+        for session in sessions:
+            session.retire()
+
+
+def session_output_dir(output_dir: Path, session_id: str, default_session_id: str = "default") -> Path:
+    """
+    Returns the directory holding a session's game_state.json and transcript.md.
+    The default session keeps the single-table layout used by the CLI (`output/session`).
+    """
+    if session_id == default_session_id:
+        return output_dir / "session"
+    return output_dir / "sessions" / session_id
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Optional
+
+# Where LLM tokens of the kickoff in progress go, tagged with its agent and phase. Set per kickoff,
+# so player kickoffs on worker threads and background work (which streams nothing) stay apart.
+_token_sink: ContextVar[Optional[tuple["StreamChannel", dict]]] = ContextVar("agentquest_token_sink", default=None)
+
+_handler_lock = threading.Lock()
+_handler_installed = False
+
+
+class StreamChannel:
+    """
+    Bounded queue from a crew thread to the async SSE response of one /api/play/step.
+    `send` blocks the producing thread while the queue is full, so a slow client slows the round
+    down instead of losing messages. Once the client is gone, `close` drops everything still
+    queued and later sends return immediately, so the round finishes (and persists) regardless.
+    Must be created on, and received from, the event loop; `send` is for other threads only.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int = 256):
+        self.loop = loop
+        self.closed = False
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def send(self, item: Any):
+        if self.closed:
+            return
+        try:
+            future = asyncio.run_coroutine_threadsafe(self._queue.put(item), self.loop)
+        except RuntimeError:
+            # The event loop has shut down
+            self.closed = True
+            return
+        future.result()
+
+    async def receive(self) -> Any:
+        return await self._queue.get()
+
+    def close(self):
+        """Called on the event loop when the consumer stops; unblocks any waiting sender."""
+        self.closed = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+
+def _install_token_handler():
+    """Subscribes once, process-wide, to crewai's LLM stream chunks."""
+    global _handler_installed
+    with _handler_lock:
+        if _handler_installed:
+            return
+        _handler_installed = True
+
+    from crewai.events import crewai_event_bus
+    from crewai.events.types.llm_events import LLMStreamChunkEvent
+
+    # crewai calls stream chunk handlers synchronously in the LLM's thread, so the sink is the caller's
+    @crewai_event_bus.on(LLMStreamChunkEvent)
+    def on_stream_chunk(source, event):
+        sink = _token_sink.get()
+        if sink is None or not event.chunk or event.tool_call is not None:
+            return
+        channel, tags = sink
+        channel.send({"type": "token", **tags, "text": event.chunk, "done": False})
+
+
+@contextmanager
+def stream_tokens(channel: Optional[StreamChannel], **tags):
+    """
+    Forwards the tokens of LLM calls made inside the block to `channel`, tagged with `tags` (agent, phase),
+    and ends them with a `done` token, so consumers can retire their live preview of the block.
+    """
+    if channel is None:
+        yield
+        return
+    _install_token_handler()
+    token = _token_sink.set((channel, tags))
+    try:
+        yield
+    finally:
+        _token_sink.reset(token)
+        channel.send({"type": "token", **tags, "text": "", "done": True})
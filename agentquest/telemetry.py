@@ -0,0 +1,207 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Optional
+
+# The active Telemetry and the attributes (round, phase, agent, ...) of the work in progress.
+# crewai copies the emitting thread's context into its event handlers, so LLM and tool events
+# are attributed to the session and agent that caused them, even with concurrent sessions.
+_active: ContextVar[Optional[tuple["Telemetry", dict]]] = ContextVar("agentquest_telemetry", default=None)
+
+_handlers_lock = threading.Lock()
+_handlers_installed = False
+_pending_llm_calls: dict[str, Any] = {}
+
+
+def _usage_count(usage: Any, key: str) -> int:
+    value = usage.get(key) if isinstance(usage, dict) else getattr(usage, key, 0)
+    return value if isinstance(value, int) else 0
+
+
+def agent_token_usage(agent: Any) -> tuple[int, int]:
+    """Lifetime (prompt, completion) token counters of an agent's LLM; diff two readings for one kickoff."""
+    llm = getattr(agent, "llm", None)
+    if not hasattr(llm, "get_token_usage_summary"):
+        return 0, 0
+    usage = llm.get_token_usage_summary()
+    return _usage_count(usage, "prompt_tokens"), _usage_count(usage, "completion_tokens")
+
+
+def _install_event_handlers():
+    """Subscribes once, process-wide, to crewai's LLM and tool events."""
+    global _handlers_installed
+    with _handlers_lock:
+        if _handlers_installed:
+            return
+        _handlers_installed = True
+
+    from crewai.events import crewai_event_bus
+    from crewai.events.types.llm_events import LLMCallStartedEvent, LLMCallCompletedEvent, LLMCallFailedEvent
+    from crewai.events.types.tool_usage_events import ToolUsageFinishedEvent, ToolUsageErrorEvent
+
+    def pair_llm_event(call_id: str, side: str, item: tuple):
+        # Handlers may run out of order on crewai's handler pool; whichever side arrives second records the call
+        with _handlers_lock:
+            other = _pending_llm_calls.pop(call_id, None)
+            if other is None:
+                _pending_llm_calls[call_id] = (side, item)
+                return
+        started, (ended, fields) = (item[0], other[1]) if side == "started" else (other[1][0], item)
+        current = _active.get()
+        if current is not None:
+            seconds = abs((ended.timestamp - started.timestamp).total_seconds())
+            current[0].record("llm_call", ended.model or "llm", seconds, **fields)
+
+    def llm_call_ended(event, **fields):
+        pair_llm_event(event.call_id, "ended", (event, fields))
+
+    @crewai_event_bus.on(LLMCallStartedEvent)
+    def on_llm_started(source, event):
+        pair_llm_event(event.call_id, "started", (event,))
+
+    @crewai_event_bus.on(LLMCallCompletedEvent)
+    def on_llm_completed(source, event):
+        llm_call_ended(
+            event,
+            prompt_tokens=_usage_count(event.usage, "prompt_tokens"),
+            completion_tokens=_usage_count(event.usage, "completion_tokens"),
+        )
+
+    @crewai_event_bus.on(LLMCallFailedEvent)
+    def on_llm_failed(source, event):
+        llm_call_ended(event, status="error", error=event.error)
+
+    @crewai_event_bus.on(ToolUsageFinishedEvent)
+    def on_tool_finished(source, event):
+        current = _active.get()
+        if current is not None:
+            current[0].record(
+                "tool", event.tool_name, (event.finished_at - event.started_at).total_seconds(),
+                cache_hit=event.from_cache, retries=max(0, event.run_attempts - 1),
+            )
+
+    @crewai_event_bus.on(ToolUsageErrorEvent)
+    def on_tool_error(source, event):
+        current = _active.get()
+        if current is not None:
+            current[0].record("tool", event.tool_name, None, status="error", error=str(event.error))
+
+
+def _new_aggregate(group: str, key: Any) -> dict:
+    return {
+        group: key, "seconds": None, "kickoffs": 0, "cache_hits": 0, "retries": 0,
+        "llm_calls": 0, "llm_seconds": 0.0, "prompt_tokens": 0, "completion_tokens": 0,
+        "tool_calls": 0, "tool_seconds": 0.0, "tool_memo_hits": 0, "tool_memo_misses": 0, "errors": 0, "agents": {},
+    }
+
+
+class Telemetry:
+    """
+    Structured timing and token instrumentation, written as JSON lines to `log_path`.
+
+    Every record carries the attributes of the enclosing `scope()` (round, phase, agent, stage, ...).
+    Records with a `group` attribute ("round" or "generation") also feed per-group aggregates,
+    served by summary(): wall time, kickoffs, cache hits, retries, LLM calls and tokens, tool time
+    and per-agent time, which shows whether a round was spent in the DM, a slow player or tool I/O.
+    """
+    GROUPS = ("round", "generation")
+
+    def __init__(self, log_path: Optional[Path] = None):
+        self.log_path = Path(log_path) if log_path else None
+        self._lock = threading.Lock()
+        self._aggregates: dict[str, dict[Any, dict]] = {g: {} for g in self.GROUPS}
+        _install_event_handlers()
+
+    @contextmanager
+    def scope(self, **attrs):
+        """Attributes every record made inside the block, including crewai LLM and tool events."""
+        current = _active.get()
+        inherited = current[1] if current is not None and current[0] is self else {}
+        token = _active.set((self, {**inherited, **attrs}))
+        try:
+            yield
+        finally:
+            _active.reset(token)
+
+    @contextmanager
+    def span(self, kind: str, name: str, **attrs):
+        """
+        Times the block and records it as one `kind` event. Yields a dict the block can fill with
+        extra fields (tokens, cache_hit, ...). Spans are also scopes for everything recorded inside.
+        """
+        fields: dict = {}
+        status, error = "ok", None
+        start = time.perf_counter()
+        with self.scope(**attrs):
+            try:
+                yield fields
+            except BaseException as e:
+                status, error = "error", str(e)
+                raise
+            finally:
+                self.record(kind, name, time.perf_counter() - start, status=status, error=error, **fields)
+
+    def record(self, kind: str, name: str, seconds: Optional[float], **fields):
+        current = _active.get()
+        attrs = current[1] if current is not None and current[0] is self else {}
+        entry = {"ts": time.time(), "kind": kind, "name": name, **attrs, "seconds": seconds, **fields}
+        if entry.get("error") is None:
+            entry.pop("error", None)
+        entry.setdefault("status", "ok")
+
+        with self._lock:
+            self._aggregate(entry)
+            if self.log_path is not None:
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.log_path, "a") as f:
+                    f.write(json.dumps(entry, default=str) + "\n")
+
+    def _aggregate(self, entry: dict):
+        group = entry.get("group")
+        if group not in self._aggregates:
+            return
+        key = entry.get(group)
+        agg = self._aggregates[group].setdefault(key, _new_aggregate(group, key))
+        kind = entry["kind"]
+        seconds = entry.get("seconds") or 0.0
+        if entry.get("status") == "error":
+            agg["errors"] += 1
+        agg["retries"] += entry.get("retries", 0)
+
+        if kind == group:
+            agg["seconds"] = entry.get("seconds")
+            agg["tool_memo_hits"] += entry.get("tool_memo_hits", 0)
+            agg["tool_memo_misses"] += entry.get("tool_memo_misses", 0)
+        elif kind == "kickoff":
+            agg["kickoffs"] += 1
+            agg["cache_hits"] += bool(entry.get("cache_hit"))
+            # Kickoff token counts come from the agent's LLM counters; not every provider reports per-call usage
+            agg["prompt_tokens"] += entry.get("prompt_tokens", 0)
+            agg["completion_tokens"] += entry.get("completion_tokens", 0)
+            agent = agg["agents"].setdefault(entry.get("agent") or entry["name"], {"seconds": 0.0, "kickoffs": 0})
+            agent["seconds"] += seconds
+            agent["kickoffs"] += 1
+        elif kind == "llm_call":
+            agg["llm_calls"] += 1
+            agg["llm_seconds"] += seconds
+        elif kind == "tool":
+            agg["tool_calls"] += 1
+            agg["tool_seconds"] += seconds
+            agg["cache_hits"] += bool(entry.get("cache_hit"))
+
+    def summary(self) -> dict:
+        """Per-round and per-generation aggregates, oldest first."""
+        with self._lock:
+            return {
+                f"{group}s": json.loads(json.dumps(list(aggs.values()), default=str))
+                for group, aggs in self._aggregates.items()
+            }
+
+    @staticmethod
+    def flush(timeout: float = 5.0):
+        """Waits for crewai's asynchronous event handlers, so LLM and tool records are complete."""
+        from crewai.events import crewai_event_bus
+        crewai_event_bus.flush(timeout=timeout)
@@ -1,5 +1,7 @@
 from .dice_roller import DiceRollerTool
+from .memo import ToolMemo
 from .world_state_tool import WorldStateTool
+from .world_map_tool import WorldMapTool
 from .character_sheet_tool import CharacterSheetTool
 
-__all__ = ["DiceRollerTool", "WorldStateTool", "CharacterSheetTool"]
+__all__ = ["DiceRollerTool", "WorldStateTool", "WorldMapTool", "CharacterSheetTool", "ToolMemo"]
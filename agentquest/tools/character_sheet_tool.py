@@ -1,21 +1,38 @@
+from pathlib import Path
+from typing import Callable, Optional
 from crewai.tools import BaseTool
-import json
+from agentquest.models import GameState
+from agentquest.persistence import GameStateStore
+from agentquest.tools.memo import ToolMemo
 
 class CharacterSheetTool(BaseTool):
     name: str = "character_sheet"
     description: str = "Query your own character's stats and inventory from the game state."
-    game_state_path: str = "output/game_state.json"
+    # Bound by GameplayCrew to its live, in-memory GameState. The file is only read when unbound.
+    game_state_getter: Optional[Callable[[], GameState]] = None
+    game_state_path: str = "output/session/game_state.json"
+    # Shared with the session's other tools and invalidated by GameplayCrew whenever the game state changes.
+    # Only used together with game_state_getter; the file may change under an unbound tool at any time.
+    memo: Optional[ToolMemo] = None
+
+    def _load_game_state(self) -> GameState:
+        if self.game_state_getter is not None:
+            return self.game_state_getter()
+        # The snapshot plus its journal of later rounds
+        return GameStateStore(Path(self.game_state_path).parent).load()
 
     def _run(self, character_name: str) -> str:
+        if self.memo is None or self.game_state_getter is None:
+            return self._sheet(character_name)
+        return self.memo.lookup(self.name, character_name.strip().lower(), lambda: self._sheet(character_name))
+
+    def _sheet(self, character_name: str) -> str:
         try:
-            with open(self.game_state_path, 'r') as f:
-                state_data = json.load(f)
-        except Exception as e:
+            game_state = self._load_game_state()
+        except (OSError, ValueError) as e:
             return f"Error reading game state from {self.game_state_path}: {e}"
 
-        characters = state_data.get("characters", [])
-        for char in characters:
-            if char.get("name", "").lower() == character_name.strip().lower():
-                return json.dumps(char, indent=2)
-                
-        return f"Error: Character '{character_name}' not found in game state."
+        char = game_state.get_character(character_name)
+        if char is None:
+            return f"Error: Character '{character_name}' not found in game state."
+        return char.model_dump_json()
@@ -1,33 +1,76 @@
 import random
 import re
+from typing import Optional
+from pydantic import PrivateAttr
 from crewai.tools import BaseTool
+from agentquest.dice import DiceExpression, DiceError, parse_batch
+
+TARGET_PATTERN = re.compile(r"\s+(?:vs|dc|>=)\s*(-?\d+)\s*$", re.IGNORECASE)
+# Longer distributions are summarized by expected value and range only
+MAX_LISTED_OUTCOMES = 40
 
 class DiceRollerTool(BaseTool):
     name: str = "roll_dice"
-    description: str = "Roll dice in standard notation (e.g., '1d20', '2d6', '1d20+2'). Useful for determining outcomes of actions."
+    description: str = (
+        "Roll dice. Supports compound expressions ('1d20+2', '2d6+1d4+3'), keep highest/lowest ('4d6kh3', '2d20kl1') "
+        "and advantage/disadvantage ('1d20+5 adv', '1d20 dis'). Roll for several characters in one call by separating "
+        "labelled rolls with ';' (e.g. 'Alice: 1d20+2; Bob: 1d20+1', or 'Alice, Bob, Cara: 1d20' for initiative). "
+        "Prefix with 'stats' to get the expected value and distribution without rolling, optionally with the chance "
+        "of meeting a target ('stats 1d20+5 vs 15')."
+    )
+    seed: Optional[str] = None  # None rolls from the shared, unseeded generator
+
+    _rng: random.Random = PrivateAttr(default=None)
+
+    def model_post_init(self, __context):
+        super().model_post_init(__context)
+        self.reseed(self.seed)
+
+    def reseed(self, seed: Optional[str]):
+        """Restarts the roll sequence, so the same seed always yields the same rolls."""
+        self.seed = seed
+        self._rng = random.Random(seed) if seed is not None else random
 
     def _run(self, dice_notation: str) -> str:
-        # Match something like "1d20" or "2d6+3" or "1d8-1"
-        match = re.match(r"^(\d+)d(\d+)(?:([+-])(\d+))?$", dice_notation.strip().lower())
-        if not match:
-            return f"Error: Invalid dice notation '{dice_notation}'. Use standard notation like '1d20' or '2d6+3'."
-        
-        num_dice = int(match.group(1))
-        sides = int(match.group(2))
-        
-        if num_dice <= 0 or sides <= 0:
-            return "Error: Number of dice and sides must be positive integers."
-            
-        modifier_sign = match.group(3)
-        modifier_val = int(match.group(4)) if match.group(4) else 0
-        
-        rolls = [random.randint(1, sides) for _ in range(num_dice)]
-        total = sum(rolls)
-        
-        if modifier_sign == '+':
-            total += modifier_val
-        elif modifier_sign == '-':
-            total -= modifier_val
-            
-        modifier_str = f" {modifier_sign} {modifier_val}" if modifier_sign else ""
-        return f"Rolled {dice_notation}: {rolls}{modifier_str} = {total}"
+        notation = dice_notation.strip()
+        try:
+            if notation.lower().startswith("stats "):
+                return self._stats(notation[len("stats "):])
+            lines = []
+            for label, expression in parse_batch(notation):
+                _, detail = expression.roll(self._rng)
+                subject = f" for {label}" if label else ""
+                lines.append(f"Rolled {expression.notation()}{subject}: {detail}{_expected(expression)}")
+            return "\n".join(lines)
+        except DiceError as e:
+            return f"Error: {e}"
+
+    @staticmethod
+    def _stats(notation: str) -> str:
+        """Expected value, range and exact distribution, plus the chance of meeting a target (`... vs 15`)."""
+        target = None
+        match = TARGET_PATTERN.search(notation)
+        if match:
+            target = int(match.group(1))
+            notation = notation[:match.start()]
+        expression = DiceExpression.parse(notation)
+        low, high = expression.bounds()
+        try:
+            distribution = expression.distribution()
+        except DiceError:
+            return f"{expression.notation()}: range {low} to {high} (too many outcomes for exact statistics)"
+        expected = sum(value * p for value, p in distribution.items())
+        lines = [f"{expression.notation()}: expected {expected:.2f}, range {low} to {high}"]
+        if target is not None:
+            chance = sum(p for value, p in distribution.items() if value >= target)
+            lines.append(f"Chance of {target} or more: {chance:.1%}")
+        if len(distribution) <= MAX_LISTED_OUTCOMES:
+            lines.append(", ".join(f"{value}: {p:.1%}" for value, p in distribution.items()))
+        return "\n".join(lines)
+
+
+def _expected(expression: DiceExpression) -> str:
+    try:
+        return f" (expected {expression.expected_value():g})"
+    except DiceError:
+        return ""
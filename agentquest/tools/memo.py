@@ -0,0 +1,46 @@
+import threading
+from typing import Callable, Hashable
+
+
+class ToolMemo:
+    """
+    Memo of pure tool calls shared by a session's agents, so a query one agent already made this round
+    is answered without reading and serializing the state again.
+    Entries are keyed on the tool name and its normalized arguments, plus any stamp the tool passes
+    (such as the world file's mtime and size). The owner calls `invalidate()` whenever the state the
+    tools read changes, which drops every entry.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, str] = {}
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __deepcopy__(self, memo: dict) -> "ToolMemo":
+        # Shared by design: copies of an agent's tools must keep using the session's memo
+        return self
+
+    def lookup(self, tool: str, args: Hashable, compute: Callable[[], str]) -> str:
+        key = (tool, args)
+        with self._lock:
+            version = self.version
+            if key in self._entries:
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        result = compute()
+        with self._lock:
+            # A result computed while the state changed may already be stale
+            if self.version == version:
+                self._entries[key] = result
+        return result
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self.version += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "version": self.version}
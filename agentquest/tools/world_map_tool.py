@@ -0,0 +1,84 @@
+from crewai.tools import BaseTool
+from pydantic import ValidationError
+import os
+from typing import Optional
+from agentquest.tools.memo import ToolMemo
+from agentquest.world_index import WorldGraph, WorldIndex, load_world_index
+
+MAX_HOPS = 5
+
+class WorldMapTool(BaseTool):
+    name: str = "world_map"
+    description: str = (
+        "Answer travel questions from the map of connected locations, without reading every location. "
+        "Use 'route:<from> -> <to>' for the shortest route between two locations, "
+        "'near:<location>' for the locations one move away, or 'near:<location>:<moves>' for those up to "
+        f"{MAX_HOPS} moves away."
+    )
+    world_state_path: str = "output/world_state.json"
+    # The session's world; when set, world_state_path is not read
+    world: Optional[WorldIndex] = None
+    # Shared with the session's other tools; answers repeated queries until the world file changes
+    memo: Optional[ToolMemo] = None
+
+    def _run(self, query: str) -> str:
+        if self.memo is None:
+            return self._query(query)
+        normalized = (" ".join(query.lower().split()),)
+        if self.world is not None:
+            return self.memo.lookup(self.name, normalized, lambda: self._query(query))
+        try:
+            stat = os.stat(self.world_state_path)
+        except OSError:
+            return self._query(query)
+        args = (self.world_state_path, stat.st_mtime_ns, stat.st_size) + normalized
+        return self.memo.lookup(self.name, args, lambda: self._query(query))
+
+    def _query(self, query: str) -> str:
+        try:
+            graph = (self.world if self.world is not None else load_world_index(self.world_state_path)).graph
+        except (OSError, ValidationError) as e:
+            return f"Error reading world state from {self.world_state_path}: {e}"
+
+        kind, _, rest = query.strip().partition(":")
+        kind = kind.strip().lower()
+        if kind == "route":
+            start, arrow, goal = rest.partition("->")
+            if not arrow:
+                return "Error: use 'route:<from> -> <to>'."
+            return self._route(graph, start.strip(), goal.strip())
+        if kind == "near":
+            name, _, hops = rest.rpartition(":")
+            if not name or not hops.strip().isdigit():
+                name, hops = rest, "1"
+            return self._near(graph, name.strip(), min(max(1, int(hops)), MAX_HOPS))
+        return "Error: unknown query. Use 'route:<from> -> <to>' or 'near:<location>[:<moves>]'."
+
+    @staticmethod
+    def _unknown(graph: WorldGraph, *names: str) -> Optional[str]:
+        missing = [name for name in names if graph.location_id(name) is None]
+        if not missing:
+            return None
+        return f"Error: unknown location(s) {missing}. Known locations: {graph.names}"
+
+    def _route(self, graph: WorldGraph, start: str, goal: str) -> str:
+        error = self._unknown(graph, start, goal)
+        if error:
+            return error
+        path = graph.route(start, goal)
+        if path is None:
+            return f"There is no route from {start} to {goal}: they are not connected."
+        if len(path) == 1:
+            return f"The party is already at {path[0]}."
+        return f"{' -> '.join(path)} ({len(path) - 1} moves)"
+
+    def _near(self, graph: WorldGraph, name: str, hops: int) -> str:
+        error = self._unknown(graph, name)
+        if error:
+            return error
+        reachable = graph.within(name, hops)
+        location = graph.names[graph.location_id(name)]
+        if not reachable:
+            return f"No locations are connected to {location}."
+        listed = ", ".join(f"{other} ({moves})" for other, moves in reachable.items())
+        return f"Within {hops} move(s) of {location}: {listed}"
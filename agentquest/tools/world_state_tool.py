@@ -1,23 +1,75 @@
 from crewai.tools import BaseTool
+from pydantic import ValidationError
 import json
+import os
+from typing import Optional
+from agentquest.tools.memo import ToolMemo
+from agentquest.world_index import WorldIndex, load_world_index
+
+# Sections that support point queries like 'npcs:<name>', mapped to the WorldIndex name index
+POINT_QUERY_SECTIONS = {
+    "locations": "locations",
+    "npcs": "npcs",
+    "quests": "quests",
+    "side_quests": "quests",
+}
 
 class WorldStateTool(BaseTool):
     name: str = "query_world_state"
-    description: str = "Query sections of the world state. Useful for getting information about locations, NPCs, quests, or lore. Valid sections are: 'lore', 'factions', 'locations', 'npcs', 'main_quest', 'side_quests'."
+    description: str = (
+        "Query sections of the world state. Useful for getting information about locations, NPCs, quests, or lore. "
+        "Valid sections are: 'lore', 'factions', 'locations', 'npcs', 'main_quest', 'side_quests'. "
+        "To fetch a single entry, use 'locations:<name>', 'npcs:<name>' or 'quests:<title>' instead of the whole section."
+    )
     world_state_path: str = "output/world_state.json"
+    # The session's world; when set, world_state_path is not read
+    world: Optional[WorldIndex] = None
+    # Shared with the session's other tools; answers repeated queries until the world file changes
+    memo: Optional[ToolMemo] = None
 
     def _run(self, section: str) -> str:
+        if self.memo is None:
+            return self._query(section)
+        kind, _, name = section.partition(":")
+        query = (kind.strip().lower(), name.strip().lower())
+        if self.world is not None:
+            return self.memo.lookup(self.name, query, lambda: self._query(section))
+        try:
+            stat = os.stat(self.world_state_path)
+        except OSError:
+            return self._query(section)
+        args = (self.world_state_path, stat.st_mtime_ns, stat.st_size) + query
+        return self.memo.lookup(self.name, args, lambda: self._query(section))
+
+    def _query(self, section: str) -> str:
         try:
-            with open(self.world_state_path, 'r') as f:
-                state_data = json.load(f)
-        except Exception as e:
+            index = self.world if self.world is not None else load_world_index(self.world_state_path)
+        except (OSError, ValidationError) as e:
             return f"Error reading world state from {self.world_state_path}: {e}"
 
+        section, _, name = section.strip().partition(":")
         section = section.strip().lower()
-        if section not in state_data:
+        name = name.strip()
+
+        if name:
+            if section not in POINT_QUERY_SECTIONS:
+                return f"Error: '{section}' does not support lookups by name. Use one of: {sorted(POINT_QUERY_SECTIONS)}"
+            entries = getattr(index, POINT_QUERY_SECTIONS[section])
+            entry = entries.get(name.lower())
+            if entry is None:
+                names = [getattr(e, "name", None) or e.title for e in entries.values()]
+                return f"Error: '{name}' not found in '{section}'. Known entries: {names}"
+            return entry.model_dump_json()
+
+        state_data = index.data
+        if section == "quests":
+            section_data = [state_data["main_quest"]] + state_data["side_quests"]
+        elif section in state_data:
+            section_data = state_data[section]
+        else:
             return f"Error: '{section}' is not a valid section. Valid sections are: {list(state_data.keys())}"
 
-        section_data = state_data[section]
         if isinstance(section_data, (dict, list)):
-            return json.dumps(section_data, indent=2)
+            # Compact separators: this text is fed straight back into the prompt
+            return json.dumps(section_data, separators=(",", ":"))
         return str(section_data)
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+from crewai import Task
+from crewai.utilities.formatter import aggregate_raw_outputs_from_tasks
+
+TRACE_FILENAME = "llm_trace.jsonl"
+
+
+class TraceMissError(LookupError):
+    """The trace being replayed has no response for a task the session asked for."""
+
+
+def request_fingerprint(task: Task) -> str:
+    """Digest of a task's prompt inputs (description and context outputs), independent of the model."""
+    context = aggregate_raw_outputs_from_tasks(task.context) if isinstance(task.context, list) else ""
+    payload = json.dumps([task.description, context], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class LLMTrace:
+    """
+    Append-only record (llm_trace.jsonl) of every task a session sent to its agents and the response it used,
+    keyed by round, phase and agent. The first line holds the session's dice seed.
+    """
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def start(self, seed: int):
+        """Starts a new trace, replacing any previous one."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.path, "w") as f:
+            f.write(json.dumps({"type": "session", "seed": seed, "ts": time.time()}) + "\n")
+
+    def record(self, round_number: int, phase: str, agent: str, request: str, fingerprint: str, response: str, source: str):
+        entry = {
+            "type": "task", "ts": time.time(), "round": round_number, "phase": phase, "agent": agent,
+            "fingerprint": fingerprint, "source": source, "request": request, "response": response,
+        }
+        with self._lock, open(self.path, "a") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def seed(self) -> Optional[int]:
+        if not self.path.exists():
+            return None
+        with open(self.path) as f:
+            try:
+                header = json.loads(f.readline())
+            except json.JSONDecodeError:
+                return None
+        return header.get("seed") if header.get("type") == "session" else None
+
+    def read(self) -> tuple[Optional[int], list[dict]]:
+        """The seed and the task entries; a torn last line (from a crash mid-write) is ignored."""
+        seed, entries = None, []
+        if not self.path.exists():
+            return seed, entries
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get("type") == "session":
+                    seed = entry.get("seed")
+                elif entry.get("type") == "task":
+                    entries.append(entry)
+        return seed, entries
+
+
+class TraceReplayer:
+    """
+    Serves a recorded session's responses back, so GameplayCrew re-runs it without calling a model.
+    Rounds up to `until_round` (by default, every completed recorded round) are replayed; later rounds go to the live model.
+    Prompts that no longer match the recording are replayed anyway and counted in `divergences`.
+    """
+    def __init__(self, path: Union[str, Path], until_round: Optional[int] = None):
+        path = Path(path)
+        self.path = path / TRACE_FILENAME if path.is_dir() else path
+        if not self.path.exists():
+            raise FileNotFoundError(f"No LLM trace at {self.path}")
+        self.seed, entries = LLMTrace(self.path).read()
+        resolved = [e["round"] for e in entries if e["phase"] == "resolve"]
+        self.until_round = until_round if until_round is not None else max(resolved, default=0)
+        self.divergences = 0
+        self._lock = threading.Lock()
+        self._responses: dict[tuple, list[dict]] = {}
+        for entry in entries:
+            self._responses.setdefault((entry["round"], entry["phase"], entry["agent"]), []).append(entry)
+
+    def replays(self, round_number: int) -> bool:
+        return round_number <= self.until_round
+
+    def recorded(self, round_number: int, phase: str) -> bool:
+        """Whether a `phase` response for this round is still to be served, e.g. whether the recorded session summarized."""
+        with self._lock:
+            return any(entries for (r, p, _), entries in self._responses.items() if r == round_number and p == phase)
+
+    def take(self, round_number: int, phase: str, agent: str, fingerprint: str) -> Optional[str]:
+        """
+        The recorded response for this task, in recording order, or None once past `until_round`.
+        A prefetched scene stands in for the round's scene description if that was never generated itself.
+        """
+        with self._lock:
+            recorded = self._responses.get((round_number, phase, agent))
+            if not self.replays(round_number):
+                # The summary folded in right after the last replayed round still follows from replayed state
+                if not (phase == "summary" and round_number == self.until_round + 1 and recorded):
+                    return None
+            if not recorded and phase == "describe":
+                recorded = self._responses.get((round_number, "prefetch", agent))
+            if not recorded:
+                raise TraceMissError(f"{self.path} has no '{phase}' response by {agent} for round {round_number}")
+            entry = recorded.pop(0)
+            if entry["fingerprint"] != fingerprint:
+                self.divergences += 1
+        return entry["response"]
@@ -0,0 +1,235 @@
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+from agentquest.persistence import atomic_write
+
+TRANSCRIPT_FILENAME = "transcript.md"
+TRANSCRIPT_INDEX_FILENAME = "transcript.db"
+
+ROUND_HEADING = re.compile(r"## Round (\d+)\n")
+SECTION_PATTERN = re.compile(r"### \*\*DM\*\* \((?:Scene Description|Resolution)\)\n(.*?)(?=\n### |\Z)", re.DOTALL)
+# Older sessions separated rounds with this literal text instead of a blank line
+LEGACY_SEPARATOR = "\\n\\n"
+
+
+def _whole_characters(data: bytes) -> bytes:
+    """Drops a multi-byte UTF-8 character cut off at the end of `data`."""
+    for back in range(1, min(4, len(data)) + 1):
+        byte = data[-back]
+        if byte & 0xC0 == 0x80:
+            continue  # continuation byte
+        length = 1 if byte < 0x80 else 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+        return data if back >= length else data[:-back]
+    return data
+
+
+def read_transcript(path: Path, offset: int = 0, limit: Optional[int] = None) -> dict:
+    """
+    Reads a transcript from byte `offset` onward, at most `limit` bytes and always ending on a whole character.
+    Returns the text with its `offset`, the `next_offset` to continue from and the transcript's `size`.
+    An offset past the end means the transcript was started over, so it reads from the start and sets `reset`.
+    """
+    path = Path(path)
+    if not path.exists():
+        return {"text": "", "offset": 0, "next_offset": 0, "size": 0, "reset": offset > 0}
+    with open(path, "rb") as f:
+        size = f.seek(0, 2)
+        reset = offset > size
+        offset = 0 if reset else max(0, offset)
+        f.seek(offset)
+        data = f.read(limit if limit is not None else -1)
+    if limit is not None and offset + len(data) < size:
+        # A page too small for one character still has to make progress
+        data = _whole_characters(data) or data
+    return {
+        "text": data.decode("utf-8", errors="replace"),
+        "offset": offset,
+        "next_offset": offset + len(data),
+        "size": size,
+        "reset": reset,
+    }
+
+
+def split_rounds(text: str) -> list[tuple[int, str]]:
+    """Splits a rendered transcript into (round number, markdown) pairs."""
+    starts = list(ROUND_HEADING.finditer(text))
+    rounds = []
+    for match, following in zip(starts, starts[1:] + [None]):
+        markdown = text[match.start():following.start() if following else len(text)]
+        markdown = markdown.rstrip("\n").removesuffix(LEGACY_SEPARATOR).rstrip("\n") + "\n\n"
+        rounds.append((int(match.group(1)), markdown))
+    return rounds
+
+
+def narration_of(markdown: str) -> str:
+    """The DM's scene description and resolution in a round's markdown; what transcript search looks at."""
+    return "\n\n".join(section.strip() for section in SECTION_PATTERN.findall(markdown))
+
+
+class TranscriptStore:
+    """
+    A session's transcript indexed by round, in SQLite (transcript.db) beside the rendered transcript.md.
+    Each round is one row holding its markdown, its narration and the byte offset where it starts in
+    transcript.md, so reading round N, a range of rounds or the offset to page transcript.md from never
+    reads the whole file. Narration is searchable with FTS5 where SQLite has it, by substring otherwise.
+    An existing transcript.md without an index (an older session) is indexed when the store is opened,
+    unless it is opened `readonly`: then neither file is created or changed.
+    """
+    def __init__(self, directory: Path, readonly: bool = False):
+        self.directory = Path(directory)
+        self.path = self.directory / TRANSCRIPT_INDEX_FILENAME
+        self.markdown_path = self.directory / TRANSCRIPT_FILENAME
+        self.readonly = readonly
+        self._lock = threading.Lock()
+        if readonly:
+            self._conn = sqlite3.connect(
+                self.path.resolve().as_uri() + "?mode=ro", uri=True, check_same_thread=False, timeout=30
+            )
+            self.full_text = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'rounds_fts'"
+            ).fetchone() is not None
+            return
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rounds ("
+                "round INTEGER PRIMARY KEY, offset INTEGER NOT NULL, markdown TEXT NOT NULL, narration TEXT NOT NULL)"
+            )
+            try:
+                self._conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS rounds_fts USING fts5(narration)")
+                self.full_text = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5
+                self.full_text = False
+            indexed = self._conn.execute("SELECT COUNT(*) FROM rounds").fetchone()[0]
+        if not indexed and self.markdown_path.exists() and self.markdown_path.stat().st_size:
+            self._import_markdown()
+
+    @classmethod
+    def open_existing(cls, directory: Path) -> Optional["TranscriptStore"]:
+        """The index of a session directory opened read-only, or None if the session has no index yet."""
+        directory = Path(directory)
+        if not (directory / TRANSCRIPT_INDEX_FILENAME).exists():
+            return None
+        try:
+            return cls(directory, readonly=True)
+        except sqlite3.Error:
+            # Not (yet) a complete index, e.g. one the game is creating right now
+            return None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "TranscriptStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append(self, round_number: int, markdown: str):
+        """Appends a round to transcript.md and indexes it; a round played again replaces its entry."""
+        markdown = markdown.rstrip("\n") + "\n\n"
+        with self._lock:
+            with open(self.markdown_path, "ab") as f:
+                offset = f.seek(0, 2)
+                f.write(markdown.encode("utf-8"))
+            with self._conn:
+                self._index(round_number, offset, markdown)
+
+    def clear(self):
+        """Empties the transcript, for a new game in the same directory."""
+        with self._lock:
+            self.markdown_path.write_text("")
+            with self._conn:
+                self._conn.execute("DELETE FROM rounds")
+                if self.full_text:
+                    self._conn.execute("DELETE FROM rounds_fts")
+
+    def get(self, round_number: int) -> Optional[str]:
+        """The markdown of one round, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT markdown FROM rounds WHERE round = ?", (round_number,)).fetchone()
+        return row[0] if row else None
+
+    def rounds(self, start: int = 1, end: Optional[int] = None, limit: Optional[int] = None) -> list[tuple[int, str]]:
+        """(round number, markdown) of the rounds from `start` to `end` inclusive, in order."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT round, markdown FROM rounds WHERE round >= ? AND round <= ? ORDER BY round LIMIT ?",
+                (start, end if end is not None else 2 ** 62, limit if limit is not None else -1)
+            ).fetchall()
+
+    def last_round(self) -> Optional[int]:
+        with self._lock:
+            return self._conn.execute("SELECT MAX(round) FROM rounds").fetchone()[0]
+
+    def offset_of(self, round_number: int) -> Optional[int]:
+        """Byte offset in transcript.md of the first round numbered `round_number` or later, or None if there is none."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT offset FROM rounds WHERE round >= ? ORDER BY round LIMIT 1", (round_number,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def search(self, query: str, limit: int = 20) -> list[dict]:
+        """Rounds whose narration matches all words of `query`, best matches first, each with a snippet."""
+        words = query.split()
+        if not words:
+            return []
+        with self._lock:
+            if self.full_text:
+                # Quoted, so the words are matched literally rather than as FTS query syntax
+                match = " ".join('"' + word.replace('"', '""') + '"' for word in words)
+                rows = self._conn.execute(
+                    "SELECT rowid, snippet(rounds_fts, 0, '**', '**', '...', 16) FROM rounds_fts "
+                    "WHERE rounds_fts MATCH ? ORDER BY rank LIMIT ?",
+                    (match, limit)
+                ).fetchall()
+                return [{"round": round_number, "snippet": snippet} for round_number, snippet in rows]
+            conditions = " AND ".join("narration LIKE ?" for _ in words)
+            rows = self._conn.execute(
+                f"SELECT round, narration FROM rounds WHERE {conditions} ORDER BY round LIMIT ?",
+                [f"%{word}%" for word in words] + [limit]
+            ).fetchall()
+        return [{"round": round_number, "snippet": self._snippet(narration, words[0])} for round_number, narration in rows]
+
+    def render(self, start: int = 1, end: Optional[int] = None) -> str:
+        """The rounds from `start` to `end` as one markdown document, as in transcript.md."""
+        return "".join(markdown for _, markdown in self.rounds(start, end))
+
+    def _index(self, round_number: int, offset: int, markdown: str):
+        narration = narration_of(markdown)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO rounds (round, offset, markdown, narration) VALUES (?, ?, ?, ?)",
+            (round_number, offset, markdown, narration)
+        )
+        if self.full_text:
+            self._conn.execute("DELETE FROM rounds_fts WHERE rowid = ?", (round_number,))
+            self._conn.execute("INSERT INTO rounds_fts (rowid, narration) VALUES (?, ?)", (round_number, narration))
+
+    def _import_markdown(self):
+        text = self.markdown_path.read_text(encoding="utf-8")
+        rounds = split_rounds(text)
+        first = ROUND_HEADING.search(text)
+        # Whatever precedes the first round is kept as it is
+        preamble = text[:first.start()] if first else text
+        rendered = preamble + "".join(markdown for _, markdown in rounds)
+        with self._lock:
+            if rendered != text:
+                # Rewritten with real blank lines between rounds, so the offsets below hold
+                atomic_write(self.markdown_path, rendered)
+            with self._conn:
+                offset = len(preamble.encode("utf-8"))
+                for round_number, markdown in rounds:
+                    self._index(round_number, offset, markdown)
+                    offset += len(markdown.encode("utf-8"))
+
+    @staticmethod
+    def _snippet(text: str, word: str, width: int = 80) -> str:
+        at = max(0, text.lower().find(word.lower()))
+        start = max(0, at - width // 2)
+        return ("..." if start else "") + text[start:start + width] + ("..." if start + width < len(text) else "")
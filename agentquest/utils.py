@@ -1,18 +1,137 @@
 import os
+import threading
+from typing import TYPE_CHECKING, Optional
 from dotenv import load_dotenv
-from crewai import LLM
+from agentquest.cache import ResponseCache, SQLiteResponseCache
 
-# Load environment variables if they haven't been loaded already
-load_dotenv()
+if TYPE_CHECKING:
+    from crewai import LLM
 
-def get_configured_llm() -> LLM | str | None:
+_env_loaded = False
+_env_lock = threading.Lock()
+
+def load_env():
+    """Loads `.env` into the environment once per process, on first use of the configuration."""
+    global _env_loaded
+    with _env_lock:
+        if not _env_loaded:
+            load_dotenv()
+            _env_loaded = True
+
+def llm_config_key(stream: bool = False) -> Optional[tuple]:
+    """Identifies the LLM client get_configured_llm would build; None if MODEL is not set."""
+    load_env()
+    model_name = os.environ.get("MODEL")
+    if not model_name:
+        return None
+    latency = os.environ.get("FAKE_LLM_LATENCY", "0") if model_name.startswith("fake/") else None
+    return model_name, stream, latency
+
+def get_configured_llm(stream: bool = False) -> "LLM | str | None":
     """
     Returns the explicitly configured LLM base on the MODEL environment variable, 
     so standard CrewAI can interface seamlessly with Anthropic, Gemini, Ollama, etc.
     If MODEL is not set, it returns None, falling back to CrewAI's default (OpenAI).
+    MODEL=fake/<name> selects the offline FakeLLM used by tests and benchmarks;
+    FAKE_LLM_LATENCY sets its simulated round-trip time in seconds.
+    With `stream`, the LLM streams its tokens (as crewai stream chunk events) while it answers.
     """
+    load_env()
     model_name = os.environ.get("MODEL")
     if not model_name:
         return None
+    if model_name.startswith("fake/"):
+        from agentquest.fake_llm import FakeLLM
+        return FakeLLM(model=model_name, latency=float(os.environ.get("FAKE_LLM_LATENCY", "0")), stream=stream)
         
-    return LLM(model=model_name)
+    # Imported here: crewai takes seconds to import, and most entry points never build an LLM
+    from crewai import LLM
+    return LLM(model=model_name, stream=stream)
+
+class LLMPool:
+    """
+    Idle LLM clients, keyed by model configuration, leased to one agent at a time.
+    Building a provider client (with its HTTP connection pool) costs tens of milliseconds; a session leases one per
+    agent and returns them when it closes, so later sessions reuse warm clients and connections. A client is never
+    leased twice at once, so its token counters (read per kickoff by telemetry) only ever count one agent's calls.
+    """
+    def __init__(self, max_idle_per_config: int = 32):
+        self.max_idle_per_config = max_idle_per_config
+        self._idle: dict[tuple, list] = {}
+        self._leased: dict[int, tuple] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, stream: bool = False) -> "LLM | None":
+        key = llm_config_key(stream)
+        if key is None:
+            return None
+        with self._lock:
+            idle = self._idle.get(key)
+            llm = idle.pop() if idle else None
+        if llm is None:
+            llm = get_configured_llm(stream=stream)
+        with self._lock:
+            self._leased[id(llm)] = key
+        return llm
+
+    def release(self, llm: "LLM | None"):
+        if llm is None:
+            return
+        with self._lock:
+            key = self._leased.pop(id(llm), None)
+            if key is None or key != llm_config_key(key[1]):
+                # Not leased from this pool, or the configuration has changed since
+                return
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_config:
+                idle.append(llm)
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(idle) for idle in self._idle.values())
+
+_llm_pool = LLMPool()
+
+def get_llm_pool() -> LLMPool:
+    """The process-wide LLM client pool shared by all sessions."""
+    return _llm_pool
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_configured = False
+_response_cache_lock = threading.Lock()
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Returns the shared LLM response cache, or None if caching is disabled.
+    Configured like the LLM itself, via environment variables:
+    LLM_CACHE ('sqlite' to enable, 'off' by default), LLM_CACHE_PATH and LLM_CACHE_MAX_MB.
+    A backend installed with `set_response_cache` takes precedence.
+    """
+    global _response_cache, _response_cache_configured
+    load_env()
+    with _response_cache_lock:
+        if not _response_cache_configured:
+            backend = os.environ.get("LLM_CACHE", "off").strip().lower()
+            if backend == "sqlite":
+                _response_cache = SQLiteResponseCache(
+                    os.environ.get("LLM_CACHE_PATH", ".agentquest_cache/llm_responses.sqlite"),
+                    max_bytes=int(float(os.environ.get("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024),
+                )
+            elif backend not in ("", "off", "none"):
+                raise ValueError(f"Unknown LLM_CACHE backend '{backend}'. Use 'sqlite' or 'off'.")
+            _response_cache_configured = True
+        return _response_cache
+
+def set_response_cache(cache: Optional[ResponseCache]):
+    """Installs a custom response cache backend (or None to disable caching) for all crews."""
+    global _response_cache, _response_cache_configured
+    with _response_cache_lock:
+        _response_cache = cache
+        _response_cache_configured = True
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap, provider-agnostic token estimate (~4 characters per token for English prose).
+    Used for prompt budgeting, not billing.
+    """
+    return (len(text) + 3) // 4
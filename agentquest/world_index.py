@@ -0,0 +1,138 @@
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Optional, Union
+
+from agentquest.models import WorldState, Location, NPC, Quest
+
+
+class WorldGraph:
+    """
+    Adjacency index over the world's locations. Each location's ID is its position in
+    `WorldState.locations`; names resolve to IDs case-insensitively. Connections are two-way,
+    since generated worlds often list a path on one side only. `connected_to` entries naming no
+    known location are not edges; they are reported in `dangling` as (location, missing name) pairs.
+    Shortest paths come from a breadth-first search per starting location, done once and kept.
+    """
+    def __init__(self, locations: list[Location]):
+        self.names = [loc.name for loc in locations]
+        self.ids: dict[str, int] = {}
+        for i, name in enumerate(self.names):
+            self.ids.setdefault(name.strip().lower(), i)
+        self.adjacency: list[set[int]] = [set() for _ in locations]
+        self.dangling: list[tuple[str, str]] = []
+        for i, loc in enumerate(locations):
+            for target in loc.connected_to:
+                j = self.ids.get(target.strip().lower())
+                if j is None:
+                    self.dangling.append((loc.name, target))
+                elif j != i:
+                    self.adjacency[i].add(j)
+                    self.adjacency[j].add(i)
+        self._parents: dict[int, list[Optional[int]]] = {}
+        self._distances: dict[int, list[Optional[int]]] = {}
+
+    def location_id(self, name: str) -> Optional[int]:
+        return self.ids.get(name.strip().lower())
+
+    def _search(self, source: int) -> tuple[list[Optional[int]], list[Optional[int]]]:
+        if source not in self._distances:
+            distances: list[Optional[int]] = [None] * len(self.names)
+            parents: list[Optional[int]] = [None] * len(self.names)
+            distances[source] = 0
+            queue = deque([source])
+            while queue:
+                node = queue.popleft()
+                # Sorted, so ties between equally short routes always resolve the same way
+                for neighbor in sorted(self.adjacency[node]):
+                    if distances[neighbor] is None:
+                        distances[neighbor] = distances[node] + 1
+                        parents[neighbor] = node
+                        queue.append(neighbor)
+            # Parents first: a reader that finds the distances also finds the parents
+            self._parents[source] = parents
+            self._distances[source] = distances
+        return self._distances[source], self._parents[source]
+
+    def route(self, start: str, goal: str) -> Optional[list[str]]:
+        """Location names along a shortest route from `start` to `goal`, both included; None if there is none."""
+        source, target = self.location_id(start), self.location_id(goal)
+        if source is None or target is None:
+            return None
+        distances, parents = self._search(source)
+        if distances[target] is None:
+            return None
+        path = [target]
+        while path[-1] != source:
+            path.append(parents[path[-1]])
+        return [self.names[i] for i in reversed(path)]
+
+    def within(self, name: str, hops: int = 1) -> dict[str, int]:
+        """Locations reachable from `name` in 1 to `hops` moves, mapped to their distance, nearest first."""
+        source = self.location_id(name)
+        if source is None:
+            return {}
+        distances, _ = self._search(source)
+        reachable = [(d, i) for i, d in enumerate(distances) if d is not None and 0 < d <= hops]
+        return {self.names[i]: d for d, i in sorted(reachable)}
+
+
+class WorldIndex:
+    """
+    Read-only view over a WorldState with case-insensitive name lookups
+    for locations, NPCs and quests (main quest and side quests, keyed by title),
+    and the graph of connections between locations.
+    """
+    def __init__(self, world_state: WorldState):
+        self.world_state = world_state
+        # JSON-ready sections, dumped once instead of on every query
+        self.data = world_state.model_dump(mode="json")
+        self.locations: dict[str, Location] = {loc.name.strip().lower(): loc for loc in world_state.locations}
+        self.npcs: dict[str, NPC] = {npc.name.strip().lower(): npc for npc in world_state.npcs}
+        self.quests: dict[str, Quest] = {
+            q.title.strip().lower(): q for q in [world_state.main_quest] + world_state.side_quests
+        }
+        self.graph = WorldGraph(world_state.locations)
+
+    def location(self, name: str) -> Optional[Location]:
+        return self.locations.get(name.strip().lower())
+
+    def npc(self, name: str) -> Optional[NPC]:
+        return self.npcs.get(name.strip().lower())
+
+    def quest(self, title: str) -> Optional[Quest]:
+        return self.quests.get(title.strip().lower())
+
+
+class _CacheEntry:
+    def __init__(self, stamp: tuple[int, int], index: WorldIndex):
+        self.stamp = stamp
+        self.index = index
+
+
+_cache: dict[str, _CacheEntry] = {}
+_cache_lock = threading.Lock()
+
+
+def load_world_index(path: Union[str, Path]) -> WorldIndex:
+    """
+    Returns the WorldIndex for a world_state.json file, shared across callers.
+    The file is only re-read and re-parsed when its mtime or size changes.
+    Raises OSError or pydantic.ValidationError if the file cannot be loaded.
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and entry.stamp == stamp:
+            return entry.index
+
+    with open(key, "r") as f:
+        index = WorldIndex(WorldState.model_validate_json(f.read()))
+
+    with _cache_lock:
+        _cache[key] = _CacheEntry(stamp, index)
+    return index
@@ -0,0 +1,93 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+from agentquest.models import WorldState
+from agentquest.world_index import WorldGraph
+
+
+class WorldIssue(BaseModel):
+    """One mechanical problem in a generated world, attributed to the generation stage that can fix it."""
+    stage: Literal["world", "npcs", "quests"]
+    severity: Literal["error", "warning"]
+    message: str
+
+
+def _duplicates(names: list[str]) -> list[str]:
+    seen, duplicates = set(), []
+    for name in names:
+        key = name.strip().lower()
+        if key in seen and name not in duplicates:
+            duplicates.append(name)
+        seen.add(key)
+    return duplicates
+
+
+def repair_world(world: WorldState) -> list[str]:
+    """
+    Fixes in place what needs no judgement: connections to locations that do not exist, and
+    locations connected to themselves, are dropped. Returns a note per repair.
+    """
+    graph = WorldGraph(world.locations)
+    notes = [f"Dropped the connection from '{source}' to unknown location '{target}'" for source, target in graph.dangling]
+    for i, location in enumerate(world.locations):
+        if any(graph.location_id(target) == i for target in location.connected_to):
+            notes.append(f"Dropped the connection from '{location.name}' to itself")
+        location.connected_to = [t for t in location.connected_to if graph.location_id(t) not in (None, i)]
+    return notes
+
+
+def validate_world(world: WorldState) -> list[WorldIssue]:
+    """
+    Rule-based checks of the references between locations, NPCs and quests, fast enough to run
+    before every LLM consistency check. Errors must be fixed by rerunning their stage; warnings
+    are only worth pointing out to the consistency checker.
+    """
+    issues: list[WorldIssue] = []
+    if not world.locations:
+        issues.append(WorldIssue(stage="world", severity="error", message="The world has no locations; create several interconnected ones."))
+
+    quests = [world.main_quest] + world.side_quests
+    for stage, kind, names in (
+        ("world", "location", [loc.name for loc in world.locations]),
+        ("npcs", "NPC", [npc.name for npc in world.npcs]),
+        ("quests", "quest", [quest.title for quest in quests]),
+    ):
+        for name in _duplicates(names):
+            issues.append(WorldIssue(stage=stage, severity="error", message=f"There is more than one {kind} named '{name}'; give each {kind} a unique name."))
+
+    graph = WorldGraph(world.locations)
+    for source, target in graph.dangling:
+        issues.append(WorldIssue(stage="world", severity="error", message=f"'{source}' is connected to '{target}', which is not a location; connect it only to existing locations."))
+
+    npc_names = {npc.name.strip().lower() for npc in world.npcs}
+    present = set()
+    for location in world.locations:
+        for name in location.npcs_present:
+            present.add(name.strip().lower())
+            if name.strip().lower() not in npc_names:
+                issues.append(WorldIssue(stage="npcs", severity="error", message=f"'{name}' is present at '{location.name}' but is not an NPC; create an NPC named exactly '{name}'."))
+    for npc in world.npcs:
+        if npc.name.strip().lower() not in present:
+            issues.append(WorldIssue(stage="npcs", severity="warning", message=f"NPC '{npc.name}' is not present at any location."))
+
+    if len(world.locations) > 1:
+        reachable = len(graph.within(world.locations[0].name, len(world.locations))) + 1
+        if reachable < len(world.locations):
+            issues.append(WorldIssue(stage="world", severity="warning", message=f"Only {reachable} of {len(world.locations)} locations can be reached from '{world.locations[0].name}'."))
+
+    known = [loc.name.lower() for loc in world.locations] + sorted(npc_names)
+    for quest in quests:
+        text = " ".join([quest.title, quest.description] + quest.objectives + quest.twists).lower()
+        if not any(name and name in text for name in known):
+            issues.append(WorldIssue(stage="quests", severity="warning", message=f"Quest '{quest.title}' mentions none of the world's locations or NPCs."))
+    return issues
+
+
+def fix_instructions(issues: list[WorldIssue]) -> dict[str, str]:
+    """The errors of each stage as a bulleted list, to pass to that stage when it reruns."""
+    fixes: dict[str, list[str]] = {}
+    for issue in issues:
+        if issue.severity == "error":
+            fixes.setdefault(issue.stage, []).append(f"- {issue.message}")
+    return {stage: "\n".join(lines) for stage, lines in fixes.items()}
@@ -0,0 +1,374 @@
+"""
+Offline benchmark suite for AgentQuest.
+
+Every LLM call goes to the deterministic FakeLLM (MODEL=fake/bench), which answers after a
+configurable latency, so the numbers isolate orchestration, parsing, persistence and tool
+overhead from provider speed. Results are appended as JSON lines for tracking over time.
+
+    python benchmarks/run_benchmarks.py --latency 0.05 --output bench_results.jsonl
+    python benchmarks/run_benchmarks.py --only round,tools
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Targets from docs/specs.md (non-functional requirements)
+ROUND_TARGET_SECONDS = 30
+GENERATION_TARGET_SECONDS = 300
+
+
+def configure_environment(latency: float):
+    os.environ["MODEL"] = "fake/bench"
+    os.environ["FAKE_LLM_LATENCY"] = str(latency)
+    os.environ.setdefault("OPENAI_API_KEY", "dummy")
+    os.environ["CREWAI_DISABLE_TELEMETRY"] = "true"
+    os.environ["OTEL_SDK_DISABLED"] = "true"
+    # Benchmarks must always hit the (fake) model, never the response cache
+    os.environ["LLM_CACHE"] = "off"
+
+
+def summarize(samples: list[float]) -> dict:
+    return {
+        "runs": len(samples),
+        "min": round(min(samples), 6),
+        "median": round(statistics.median(samples), 6),
+        "mean": round(statistics.mean(samples), 6),
+        "max": round(max(samples), 6),
+    }
+
+
+def timed(fn, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+@contextlib.contextmanager
+def quiet():
+    """Swallows crew console output so it does not drown the results."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def make_world():
+    from agentquest.fake_llm import FAKE_WORLD
+    from agentquest.models import WorldState
+    return WorldState(**FAKE_WORLD)
+
+
+def make_players(count: int):
+    from agentquest.models import PlayerConfig
+    return [
+        PlayerConfig(name=f"Player {i + 1}", character_class="Fighter", personality="Bold", goal="Win", alignment="Neutral")
+        for i in range(count)
+    ]
+
+
+def prompt_tokens_per_round(crew) -> float:
+    rounds = crew.telemetry.summary()["rounds"]
+    return round(sum(r["prompt_tokens"] for r in rounds) / max(1, len(rounds)), 1)
+
+
+def bench_round(workdir: Path, args) -> list[dict]:
+    """GameplayCrew.run_round latency across party sizes."""
+    from agentquest.crew.gameplay_crew import GameplayCrew
+
+    results = []
+    for party_size in args.party_sizes:
+        with quiet():
+            crew = GameplayCrew(make_world(), make_players(party_size), workdir / f"round_{party_size}", resume=False, context_mode=args.context)
+            stats = timed(crew.run_round, args.rounds)
+            crew.wait_for_background_tasks()
+        results.append({
+            "benchmark": "gameplay.run_round",
+            "params": {"party_size": party_size, "latency": args.latency, "context": args.context},
+            "stats": stats,
+            "prompt_tokens_per_round": prompt_tokens_per_round(crew),
+            "target_seconds": ROUND_TARGET_SECONDS,
+            "within_target": stats["max"] <= ROUND_TARGET_SECONDS,
+        })
+    return results
+
+
+def bench_session_length(workdir: Path, args) -> list[dict]:
+    """run_round latency for long sessions, with history pre-filled to the given number of rounds."""
+    from agentquest.crew.gameplay_crew import GameplayCrew
+
+    results = []
+    for length in args.session_lengths:
+        with quiet():
+            crew = GameplayCrew(make_world(), make_players(3), workdir / f"session_{length}", resume=False, context_mode=args.context)
+            crew.game_state.session_history = [f"Round {i + 1}: " + "The party fought bravely. " * 20 for i in range(length)]
+            crew.game_state.round_number = length + 1
+            crew._save_game_state()
+            stats = timed(crew.run_round, args.rounds)
+            crew.wait_for_background_tasks()
+        results.append({
+            "benchmark": "gameplay.run_round.session_length",
+            "params": {"session_length": length, "party_size": 3, "latency": args.latency, "context": args.context},
+            "stats": stats,
+            "prompt_tokens_per_round": prompt_tokens_per_round(crew),
+            "target_seconds": ROUND_TARGET_SECONDS,
+            "within_target": stats["max"] <= ROUND_TARGET_SECONDS,
+        })
+    return results
+
+
+def bench_session_start(workdir: Path, args) -> list[dict]:
+    """Cost of starting (and closing) a session: agents, LLM clients and initial state, for each party size."""
+    from agentquest.crew.gameplay_crew import GameplayCrew
+
+    counter = iter(range(1_000_000))
+    results = []
+    for party_size in args.party_sizes:
+        def start(party_size=party_size):
+            crew = GameplayCrew(make_world(), make_players(party_size), workdir / f"start_{next(counter)}", resume=False)
+            crew.close()
+
+        with quiet():
+            stats = timed(start, args.rounds)
+        results.append({
+            "benchmark": "gameplay.session_start",
+            "params": {"party_size": party_size},
+            "stats": stats,
+        })
+    return results
+
+
+def bench_generation(workdir: Path, args) -> list[dict]:
+    """GenerationCrew.run with every stage answered by the fake model."""
+    from agentquest.crew.generation_crew import GenerationCrew
+
+    counter = iter(range(1_000_000))
+
+    def run():
+        GenerationCrew(world_seed="A quiet valley.", output_dir=workdir / f"generation_{next(counter)}").run()
+
+    with quiet():
+        stats = timed(run, args.generations)
+    return [{
+        "benchmark": "generation.run",
+        "params": {"latency": args.latency},
+        "stats": stats,
+        "target_seconds": GENERATION_TARGET_SECONDS,
+        "within_target": stats["max"] <= GENERATION_TARGET_SECONDS,
+    }]
+
+
+def bench_tools(workdir: Path, args) -> list[dict]:
+    """Per-call cost of the agent tools (no LLM involved)."""
+    from agentquest.models import GameState, CharacterState
+    from agentquest.tools import CharacterSheetTool, DiceRollerTool, WorldStateTool
+
+    world_path = workdir / "world_state.json"
+    world_path.write_text(make_world().model_dump_json(indent=2))
+    world_tool = WorldStateTool(world_state_path=str(world_path))
+
+    state = GameState(
+        round_number=1, current_location="Millbrook",
+        characters=[CharacterState(name=f"Player {i + 1}", hp=10, max_hp=10, inventory=["Rope"], status_effects=[]) for i in range(6)],
+        npc_attitudes={}, quest_progress={}, session_history=[],
+    )
+    sheet_tool = CharacterSheetTool(game_state_getter=lambda: state)
+    dice_tool = DiceRollerTool()
+
+    calls = {
+        "query_world_state.section": lambda: world_tool._run("locations"),
+        "query_world_state.point": lambda: world_tool._run("npcs:Elder Rowan"),
+        "character_sheet": lambda: sheet_tool._run("Player 6"),
+        "roll_dice": lambda: dice_tool._run("2d6+3"),
+    }
+    results = []
+    for name, call in calls.items():
+        output = call()
+        stats = timed(lambda call=call: [call() for _ in range(100)], args.tool_repeat)
+        results.append({
+            "benchmark": f"tools.{name}",
+            "params": {"calls_per_run": 100},
+            "stats": stats,
+            "output_chars": len(output),
+        })
+    return results
+
+
+def bench_persistence(workdir: Path, args) -> list[dict]:
+    """Cost of persisting one more round, as the session grows."""
+    from agentquest.models import GameState, CharacterState
+    from agentquest.persistence import GameStateStore
+
+    results = []
+    for length in args.session_lengths:
+        store = GameStateStore(workdir / f"persistence_{length}")
+        store.directory.mkdir(parents=True, exist_ok=True)
+        state = GameState(
+            round_number=1, current_location="Millbrook",
+            characters=[CharacterState(name="Player 1", hp=10, max_hp=10, inventory=[], status_effects=[])],
+            npc_attitudes={}, quest_progress={},
+            session_history=["The party fought bravely. " * 20 for _ in range(length)],
+        )
+        store.save(state)
+
+        def save_round(state=state, store=store):
+            state.session_history.append("Another round. " * 20)
+            state.round_number += 1
+            store.save(state)
+
+        results.append({
+            "benchmark": "persistence.save_round",
+            "params": {"session_length": length},
+            "stats": timed(save_round, args.tool_repeat * 10),
+        })
+    return results
+
+
+def bench_server(workdir: Path, args) -> list[dict]:
+    """
+    Server round trip: /api/play/step over SSE, time to first byte and to completion.
+    Runs in-process through TestClient, so first byte is only as early as its transport delivers chunks.
+    """
+    from fastapi.testclient import TestClient
+    import agentquest.server as server
+
+    server.OUTPUT_DIR = workdir / "server"
+    server.WORLD_STATE_PATH = server.OUTPUT_DIR / "world_state.json"
+    server.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    server.WORLD_STATE_PATH.write_text(make_world().model_dump_json())
+    players_yaml = json.dumps({"players": [p.model_dump() for p in make_players(3)]})
+
+    client = TestClient(server.app)
+    first_byte, total = [], []
+    with quiet():
+        client.post("/api/play/start", json={"players_yaml": players_yaml, "resume": False, "session_id": "bench"})
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            seen_first = False
+            with client.stream("POST", "/api/play/step", params={"session_id": "bench"}) as response:
+                for _chunk in response.iter_bytes():
+                    if not seen_first:
+                        first_byte.append(time.perf_counter() - start)
+                        seen_first = True
+            total.append(time.perf_counter() - start)
+
+    return [
+        {"benchmark": "server.play_step.first_byte", "params": {"party_size": 3, "latency": args.latency}, "stats": summarize(first_byte)},
+        {"benchmark": "server.play_step.total", "params": {"party_size": 3, "latency": args.latency}, "stats": summarize(total),
+         "target_seconds": ROUND_TARGET_SECONDS, "within_target": max(total) <= ROUND_TARGET_SECONDS},
+    ]
+
+
+def bench_startup(workdir: Path, args) -> list[dict]:
+    """
+    Process startup: `agentquest --help` in a fresh interpreter, and a uvicorn server from launch until it answers
+    HTTP. Short-lived CLI processes per job pay this every time.
+    """
+    import socket
+    import urllib.request
+
+    # The server runs in a scratch directory (it writes output/ relative to it) but imports this checkout
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])))
+
+    def cli_help():
+        subprocess.run([sys.executable, "-m", "agentquest.cli", "--help"], cwd=REPO_ROOT, check=True, capture_output=True)
+
+    def server_ready():
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "agentquest.server:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+            cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            deadline = time.monotonic() + 60
+            while time.monotonic() < deadline:
+                try:
+                    urllib.request.urlopen(f"http://127.0.0.1:{port}/api/sessions", timeout=1).read()
+                    return
+                except OSError:
+                    time.sleep(0.01)
+            raise RuntimeError("Server did not become ready within 60s")
+        finally:
+            server.terminate()
+            server.wait()
+
+    return [
+        {"benchmark": "startup.cli_help", "params": {}, "stats": timed(cli_help, args.rounds)},
+        {"benchmark": "startup.server_ready", "params": {}, "stats": timed(server_ready, args.rounds)},
+    ]
+
+
+BENCHMARKS = {
+    "round": bench_round,
+    "session": bench_session_length,
+    "session_start": bench_session_start,
+    "generation": bench_generation,
+    "tools": bench_tools,
+    "persistence": bench_persistence,
+    "server": bench_server,
+    "startup": bench_startup,
+}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def parse_int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the offline AgentQuest benchmarks.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated LLM round-trip in seconds")
+    parser.add_argument("--party-sizes", type=parse_int_list, default=[1, 3, 6])
+    parser.add_argument("--session-lengths", type=parse_int_list, default=[10, 100, 500])
+    parser.add_argument("--context", choices=["slim", "full"], default="slim", help="GameplayCrew context mode")
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds timed per configuration")
+    parser.add_argument("--generations", type=int, default=2)
+    parser.add_argument("--tool-repeat", type=int, default=5)
+    parser.add_argument("--only", type=lambda v: v.split(","), default=list(BENCHMARKS), help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--output", default="bench_results.jsonl", help="JSON-lines file the results are appended to")
+    args = parser.parse_args(argv)
+
+    configure_environment(args.latency)
+    output_path = Path(args.output).resolve()
+    run_info = {
+        "timestamp": time.time(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+    }
+
+    with tempfile.TemporaryDirectory(prefix="agentquest-bench-") as tmp:
+        workdir = Path(tmp)
+        with open(output_path, "a") as out:
+            for name in args.only:
+                for result in BENCHMARKS[name](workdir, args):
+                    record = dict(run_info, **result)
+                    out.write(json.dumps(record) + "\n")
+                    stats = result["stats"]
+                    flag = "" if result.get("within_target", True) else "  [OVER TARGET]"
+                    print(f"{result['benchmark']:<40} {json.dumps(result['params']):<50} median {stats['median']:.4f}s{flag}", file=sys.stderr)
+
+    print(f"Results appended to {output_path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,67 @@
 import { useState, useEffect, useRef } from "react";
 import ReactMarkdown from "react-markdown";
 
+// Tokens of an agent's task in progress, streamed as `[TOKEN]` events until its full output arrives
+type LivePreview = { agent: string; phase: string; text: string };
+
 export default function GameView({ onRefresh }: { onRefresh: () => void }) {
     const [gameState, setGameState] = useState<any>(null);
     const [worldState, setWorldState] = useState<any>(null);
     const [transcript, setTranscript] = useState<string>("");
+    const [live, setLive] = useState<Record<string, LivePreview>>({});
     const [loading, setLoading] = useState(false);
     const [error, setError] = useState<string | null>(null);
 
     const transcriptEndRef = useRef<HTMLDivElement>(null);
 
+    // What the server last sent: the game state its deltas apply to, and how far the transcript was read
+    const heldGame = useRef<{ version: string | null; state: any }>({ version: null, state: null });
+    const transcriptOffset = useRef(0);
+    const savedTranscript = useRef("");
+
+    const fetchWorld = async () => {
+        // The world is served with an ETag; "no-cache" revalidates it and reuses the cached copy on a 304
+        const res = await fetch("http://127.0.0.1:8000/api/state/world", { cache: "no-cache" });
+        if (res.ok) setWorldState(await res.json());
+    };
+
+    const fetchGameState = async () => {
+        const held = heldGame.current;
+        const query = held.version ? `?since_version=${encodeURIComponent(held.version)}` : "";
+        const data = await (await fetch(`http://127.0.0.1:8000/api/state/game${query}`)).json();
+        if (!data.changed) return;
+        let state = data.game_state;
+        if (data.deltas) {
+            state = { ...held.state };
+            for (const delta of data.deltas) {
+                Object.assign(state, delta.set ?? {});
+                if (delta.history) {
+                    state.session_history = state.session_history.slice(delta.history.drop).concat(delta.history.append);
+                }
+            }
+        }
+        heldGame.current = { version: data.version, state };
+        setGameState(state);
+    };
+
+    const fetchTranscript = async () => {
+        // Only the part written since the last read; long transcripts arrive in pages
+        let text = savedTranscript.current;
+        while (true) {
+            const res = await fetch(`http://127.0.0.1:8000/api/state/transcript?offset=${transcriptOffset.current}`);
+            const page = await res.json();
+            text = page.reset ? page.text : text + page.text;
+            transcriptOffset.current = page.next_offset;
+            if (page.next_offset >= page.size) break;
+        }
+        savedTranscript.current = text;
+        // Replaces whatever was streamed during the round with what was saved
+        setTranscript(text);
+    };
+
     const fetchState = async () => {
         try {
-            const res = await fetch("http://127.0.0.1:8000/api/state");
-            const data = await res.json();
-            setGameState(data.game_state);
-            setWorldState(data.world_state);
-            setTranscript(data.transcript || "");
+            await Promise.all([fetchWorld(), fetchGameState(), fetchTranscript()]);
         } catch (e) {
             console.error("Failed to fetch game state", e);
         }
@@ -29,7 +74,20 @@ export default function GameView({ onRefresh }: { onRefresh: () => void }) {
     useEffect(() => {
         // Scroll transcript to bottom on update
         transcriptEndRef.current?.scrollIntoView({ behavior: "smooth" });
-    }, [transcript]);
+    }, [transcript, live]);
+
+    const handleToken = (token: LivePreview & { done: boolean }) => {
+        const key = `${token.phase}:${token.agent}`;
+        setLive((prev) => {
+            const next = { ...prev };
+            if (token.done) {
+                delete next[key];
+            } else {
+                next[key] = { ...token, text: (prev[key]?.text ?? "") + token.text };
+            }
+            return next;
+        });
+    };
 
     const handleNextRound = async () => {
         setLoading(true);
@@ -55,17 +113,22 @@ export default function GameView({ onRefresh }: { onRefresh: () => void }) {
             }
 
             let done = false;
+            // A network read can end mid-line; keep the partial line for the next read
+            let buffered = "";
             while (!done) {
                 const { value, done: readerDone } = await reader.read();
                 done = readerDone;
                 if (value) {
-                    const chunk = decoder.decode(value, { stream: true });
-                    const lines = chunk.split('\n');
+                    buffered += decoder.decode(value, { stream: true });
+                    const lines = buffered.split('\n');
+                    buffered = lines.pop() ?? "";
 
                     for (const line of lines) {
                         if (line.startsWith('data: ')) {
                             const data = line.slice(6);
-                            if (data === '[DONE]') {
+                            if (data.startsWith('[TOKEN] ')) {
+                                handleToken(JSON.parse(data.slice(8)));
+                            } else if (data === '[DONE]') {
                                 // Round complete
                             } else if (data.startsWith('[STATE] ')) {
                                 const stateJson = JSON.parse(data.slice(8));
@@ -88,7 +151,11 @@ export default function GameView({ onRefresh }: { onRefresh: () => void }) {
         } catch (err: any) {
             setError(err.message || "Failed to step game");
         } finally {
+            setLive({});
             setLoading(false);
+            // Catch up with what the round saved, fetching only what changed
+            fetchGameState().catch((e) => console.error("Failed to fetch game state", e));
+            fetchTranscript().catch((e) => console.error("Failed to fetch transcript", e));
         }
     };
 
@@ -138,6 +205,12 @@ export default function GameView({ onRefresh }: { onRefresh: () => void }) {
                     {transcript ? (
                         <div className="max-w-3xl mx-auto space-y-4 text-zinc-300 leading-relaxed">
                             <ReactMarkdown>{transcript}</ReactMarkdown>
+                            {Object.entries(live).map(([key, preview]) => (
+                                <div key={key} className="border-l-2 border-zinc-700 pl-3 text-sm text-zinc-500">
+                                    <div className="text-xs uppercase tracking-wider mb-1">{preview.agent} · {preview.phase}…</div>
+                                    <div className="whitespace-pre-wrap">{preview.text}</div>
+                                </div>
+                            ))}
                         </div>
                     ) : (
                         <div className="h-full flex items-center justify-center text-zinc-600 italic">
@@ -8,9 +8,9 @@ export default function LobbyView({ onStart }: { onStart: () => void }) {
     useEffect(() => {
         const fetchWorld = async () => {
             try {
-                const res = await fetch("http://127.0.0.1:8000/api/state");
-                const data = await res.json();
-                setWorldState(data.world_state);
+                // Only the world is needed here; its ETag lets the browser revalidate instead of downloading it again
+                const res = await fetch("http://127.0.0.1:8000/api/state/world", { cache: "no-cache" });
+                if (res.ok) setWorldState(await res.json());
             } catch (e) {
                 console.error("Failed to fetch world state", e);
             }
@@ -35,7 +35,206 @@ def test_gameplay_crew_success(tmp_path):
         
         assert crew.game_state.round_number == 2
         assert len(crew.game_state.session_history) == 1
+        # Without a state block nothing but the round changes
+        assert crew.game_state.current_location == "Start"
+        assert all(c.hp == c.max_hp for c in crew.game_state.characters)
         
         # Verify files were saved
         assert (tmp_path / "game_state.json").exists()
         assert (tmp_path / "transcript.md").exists()
+
+@patch.dict(os.environ, {"OPENAI_API_KEY": "dummy"})
+def test_gameplay_crew_parallel_players(tmp_path):
+    world_state = WorldState(
+        seed="fantasy",
+        setting="fantasy",
+        lore="old",
+        factions=[],
+        locations=[{"name": "Start", "description": "start desc", "connected_to": [], "npcs_present": []}],
+        npcs=[],
+        main_quest={"title": "Main", "description": "main desc", "objectives": [], "twists": [], "is_main_quest": True},
+        side_quests=[],
+        consistency_approved=True
+    )
+    players = [
+        PlayerConfig(name=name, character_class="Mage", personality="Smart", goal="Learn", alignment="Neutral")
+        for name in ["Alice", "Bob", "Cara"]
+    ]
+    
+    kicked_off = []
+
+    def make_crew(**kwargs):
+        # Crews are reused with a new task per kickoff, so record the task each kickoff runs
+        crew = MagicMock()
+        crew.tasks = kwargs["tasks"]
+        crew.kickoff.side_effect = lambda: kicked_off.append(crew.tasks[0]) or "Everyone survives. STATUS: CONTINUE"
+        return crew
+    
+    with patch("agentquest.crew.gameplay_crew.Crew", side_effect=make_crew) as mock_crew_cls:
+        crew = GameplayCrew(world_state=world_state, players=players, output_dir=tmp_path, max_parallel_players=2)
+        assert crew.run_round() is True
+        
+        # The scene, one task per player, the resolution
+        assert len(kicked_off) == 5
+        resolve_task = kicked_off[-1]
+        # Players may finish in any order, but the resolution sees them in config order
+        player_tasks = kicked_off[1:4]
+        assert {id(t) for t in resolve_task.context} == {id(t) for t in player_tasks}
+        assert [t.agent.role for t in resolve_task.context] == ["Alice", "Bob", "Cara"]
+        
+        # One crew per agent for the whole session
+        assert crew.run_round() is True
+        assert len(kicked_off) == 10
+        assert mock_crew_cls.call_count == 4
+
+@patch.dict(os.environ, {"OPENAI_API_KEY": "dummy"})
+def test_gameplay_crew_rolling_summary(tmp_path):
+    world_state = WorldState(
+        seed="fantasy",
+        setting="fantasy",
+        lore="old",
+        factions=[],
+        locations=[{"name": "Start", "description": "start desc", "connected_to": [], "npcs_present": []}],
+        npcs=[],
+        main_quest={"title": "Main", "description": "main desc", "objectives": [], "twists": [], "is_main_quest": True},
+        side_quests=[],
+        consistency_approved=True
+    )
+    players = [
+        PlayerConfig(name="Alice", character_class="Mage", personality="Smart", goal="Learn", alignment="Neutral")
+    ]
+    
+    mock_crew_instance = MagicMock()
+    mock_crew_instance.kickoff.return_value = "A long round. " * 20
+    
+    with patch("agentquest.crew.gameplay_crew.Crew", return_value=mock_crew_instance):
+        crew = GameplayCrew(
+            world_state=world_state, players=players, output_dir=tmp_path,
+            history_token_budget=200, background_summarization=False
+        )
+        for _ in range(4):
+            crew.run_round()
+        
+        # Older rounds were folded into the summary; the newest ones stay verbatim
+        assert crew.game_state.history_summary
+        assert 1 <= len(crew.game_state.session_history) < 4
+        assert crew.game_state.round_number == 5
+
+@patch.dict(os.environ, {"OPENAI_API_KEY": "dummy"})
+def test_gameplay_crew_prefetched_scene(tmp_path):
+    world_state = WorldState(
+        seed="fantasy",
+        setting="fantasy",
+        lore="old",
+        factions=[],
+        locations=[{"name": "Start", "description": "start desc", "connected_to": [], "npcs_present": []}],
+        npcs=[],
+        main_quest={"title": "Main", "description": "main desc", "objectives": [], "twists": [], "is_main_quest": True},
+        side_quests=[],
+        consistency_approved=True
+    )
+    players = [
+        PlayerConfig(name="Alice", character_class="Mage", personality="Smart", goal="Learn", alignment="Neutral")
+    ]
+    
+    mock_crew_instance = MagicMock()
+    mock_crew_instance.kickoff.return_value = "The round was resolved. STATUS: CONTINUE"
+    
+    with patch("agentquest.crew.gameplay_crew.Crew", return_value=mock_crew_instance):
+        crew = GameplayCrew(
+            world_state=world_state, players=players, output_dir=tmp_path,
+            background_summarization=False, prefetch_scene=True
+        )
+        crew.run_round()
+        crew.wait_for_background_tasks()
+        # Scene, player and resolution, then the next scene in the background
+        assert mock_crew_instance.kickoff.call_count == 4
+        
+        crew.run_round()
+        crew.wait_for_background_tasks()
+        # Round 2 used the prefetched scene: only the player and the resolution ran, plus the next prefetch
+        assert mock_crew_instance.kickoff.call_count == 7
+        
+        # A hand edit of the saved state invalidates the prefetched scene
+        with open(tmp_path / "game_state.json", "a") as f:
+            f.write("\n")
+        crew.run_round()
+        crew.wait_for_background_tasks()
+        assert mock_crew_instance.kickoff.call_count == 11
+        
+        # So does any change to the scene's inputs
+        crew.game_state.current_location = "Elsewhere"
+        crew.run_round()
+        crew.wait_for_background_tasks()
+        assert mock_crew_instance.kickoff.call_count == 15
+
+@patch.dict(os.environ, {"OPENAI_API_KEY": "dummy"})
+def test_gameplay_crew_applies_structured_resolution(tmp_path):
+    world_state = WorldState(
+        seed="fantasy",
+        setting="fantasy",
+        lore="old",
+        factions=[],
+        locations=[
+            {"name": "Start", "description": "start desc", "connected_to": ["Cave"], "npcs_present": []},
+            {"name": "Cave", "description": "cave desc", "connected_to": ["Start"], "npcs_present": []},
+        ],
+        npcs=[],
+        main_quest={"title": "Main", "description": "main desc", "objectives": [], "twists": [], "is_main_quest": True},
+        side_quests=[],
+        consistency_approved=True
+    )
+    players = [PlayerConfig(name="Alice", character_class="Mage", personality="Smart", goal="Learn", alignment="Neutral")]
+
+    mock_crew_instance = MagicMock()
+    mock_crew_instance.kickoff.return_value = (
+        "Alice falls into the cave and finds the artifact.\n"
+        '```json\n{"characters": [{"name": "Alice", "hp_change": -4, "items_gained": ["Artifact"]}], '
+        '"location": "cave", "quest_progress": {"main": true, "Imaginary": true}, "game_over": true}\n```'
+    )
+
+    with patch("agentquest.crew.gameplay_crew.Crew", return_value=mock_crew_instance):
+        crew = GameplayCrew(world_state=world_state, players=players, output_dir=tmp_path, background_summarization=False)
+        assert crew.run_round() is False
+
+    alice = crew.game_state.get_character("Alice")
+    assert alice.hp == alice.max_hp - 4 and "Artifact" in alice.inventory
+    # Names are mapped onto the world's; unknown quests are dropped
+    assert crew.game_state.current_location == "Cave"
+    assert crew.game_state.quest_progress == {"Main": True}
+    assert "```" not in (tmp_path / "transcript.md").read_text()
+
+@patch.dict(os.environ, {"OPENAI_API_KEY": "dummy"})
+def test_reused_crew_runs_one_task_at_a_time(tmp_path):
+    import threading
+    import time
+    from crewai import Task
+
+    world_state = WorldState(
+        seed="fantasy", setting="fantasy", lore="old", factions=[],
+        locations=[{"name": "Start", "description": "start desc", "connected_to": [], "npcs_present": []}],
+        npcs=[], side_quests=[], consistency_approved=True,
+        main_quest={"title": "Main", "description": "main desc", "objectives": [], "twists": [], "is_main_quest": True},
+    )
+    players = [PlayerConfig(name="Alice", character_class="Mage", personality="Smart", goal="Learn", alignment="Neutral")]
+    shared = MagicMock()
+    seen = []
+    def kickoff():
+        task = shared.tasks[0]
+        time.sleep(0.05)
+        # Another thread must not have swapped the task while this one ran
+        seen.append(shared.tasks[0] is task)
+        return task.description
+
+    shared.kickoff.side_effect = kickoff
+    with patch("agentquest.crew.gameplay_crew.Crew", return_value=shared):
+        crew = GameplayCrew(world_state=world_state, players=players, output_dir=tmp_path)
+        crew.cache = None  # every task goes to the crew
+        tasks = [Task(description=f"Task {i}", expected_output="Text", agent=crew.dm_agent) for i in range(3)]
+        threads = [threading.Thread(target=crew._kickoff_task, args=(crew.dm_agent, task)) for task in tasks]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert seen == [True, True, True]
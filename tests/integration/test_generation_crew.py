@@ -57,3 +57,127 @@ def test_generation_crew_success(tmp_path):
         with open(saved_file) as f:
             data = json.load(f)
             assert data["setting"] == "A dark fantasy world."
+
+WORLD_DICT = {
+    "setting": "A dark fantasy world.",
+    "lore": "The old gods are dead.",
+    "factions": [],
+    "locations": [{"name": "Stormkeep", "description": "A ruined fortress.", "connected_to": [], "npcs_present": []}],
+    "npcs": [],
+    "main_quest": {"title": "The Fallen Crown", "description": "Retrieve it.", "objectives": [], "twists": [], "is_main_quest": True},
+    "side_quests": [],
+    "consistency_approved": True
+}
+
+def make_fake_crew(checker_outputs, calls):
+    """Crew stand-in that completes its single task like CrewAI would, recording which agent ran."""
+    from crewai.tasks.task_output import TaskOutput
+    
+    def fake_crew(agents, tasks, **kwargs):
+        task = tasks[0]
+        crew = MagicMock()
+        def kickoff():
+            calls.append(task.agent.role)
+            json_dict = checker_outputs.pop(0) if task.output_json else None
+            raw = json.dumps(json_dict) if json_dict else f"{task.agent.role} output"
+            task.output = TaskOutput(description=task.description, raw=raw, agent=task.agent.role)
+            return MagicMock(raw=raw, json_dict=json_dict)
+        crew.kickoff.side_effect = kickoff
+        return crew
+    return fake_crew
+
+@patch.dict(os.environ, {"OPENAI_API_KEY": "dummy"})
+def test_generation_crew_uses_response_cache(tmp_path):
+    from agentquest.cache import SQLiteResponseCache
+    
+    calls = []
+    cache = SQLiteResponseCache(tmp_path / "cache.sqlite")
+    
+    with patch("agentquest.crew.generation_crew.Crew", side_effect=make_fake_crew([WORLD_DICT], calls)):
+        first = GenerationCrew(world_seed="dark fantasy", output_dir=tmp_path / "a", cache=cache).run()
+        second = GenerationCrew(world_seed="dark fantasy", output_dir=tmp_path / "b", cache=cache).run()
+        
+        # The second, identical run is answered from the cache without kicking off any stage
+        assert len(calls) == 4
+        assert second == first
+        assert (tmp_path / "b" / "world_state.json").exists()
+
+@patch.dict(os.environ, {"OPENAI_API_KEY": "dummy"})
+def test_generation_crew_retries_only_implicated_stages(tmp_path):
+    calls = []
+    bad_npcs = dict(WORLD_DICT, npcs=[{"name": "Vane"}])
+    
+    with patch("agentquest.crew.generation_crew.Crew", side_effect=make_fake_crew([bad_npcs, WORLD_DICT], calls)):
+        crew = GenerationCrew(world_seed="dark fantasy", output_dir=tmp_path)
+        crew.run()
+    
+    # An NPC schema error reruns the character creator, the quests built on its NPCs and the checker, not the world
+    assert calls == [
+        "World Builder", "Character Creator", "Quest Designer", "Consistency Checker",
+        "Character Creator", "Quest Designer", "Consistency Checker",
+    ]
+    assert crew.iterations == 2
+    assert not (tmp_path / "checkpoints" / "world.json").exists()
+
+@patch.dict(os.environ, {"OPENAI_API_KEY": "dummy"})
+def test_generation_crew_resumes_from_checkpoints(tmp_path):
+    calls = []
+    with patch("agentquest.crew.generation_crew.Crew", side_effect=make_fake_crew([WORLD_DICT], calls)):
+        crew = GenerationCrew(world_seed="dark fantasy", output_dir=tmp_path)
+        # Simulate a crash after the first three stages had finished
+        crew._save_checkpoint("world", "world output")
+        crew._save_checkpoint("npcs", "npcs output")
+        crew._save_checkpoint("quests", "quests output")
+        crew.run()
+    
+    assert calls == ["Consistency Checker"]
+
+def make_stage_crew(stage_outputs, calls):
+    """Crew stand-in whose content stages return JSON, so the rule-based validation can assemble the world."""
+    from crewai.tasks.task_output import TaskOutput
+    
+    def fake_crew(agents, tasks, **kwargs):
+        task = tasks[0]
+        crew = MagicMock()
+        def kickoff():
+            calls.append(task.agent.role)
+            outputs = stage_outputs[task.agent.role]
+            raw = json.dumps(outputs.pop(0) if len(outputs) > 1 else outputs[0])
+            task.output = TaskOutput(description=task.description, raw=raw, agent=task.agent.role)
+            return MagicMock(raw=raw, json_dict=json.loads(raw) if task.output_json else None)
+        crew.kickoff.side_effect = kickoff
+        return crew
+    return fake_crew
+
+@patch.dict(os.environ, {"OPENAI_API_KEY": "dummy"})
+def test_rule_errors_rerun_their_stage_without_the_checker(tmp_path):
+    calls = []
+    world = {k: WORLD_DICT[k] for k in ("setting", "lore", "factions")}
+    world["locations"] = [{"name": "Stormkeep", "description": "A ruined fortress.", "connected_to": [], "npcs_present": ["Commander Vane"]}]
+    vane = {"name": "Commander Vane", "role": "Leader", "personality": "Gruff", "attitude_toward_party": "neutral", "backstory": "Veteran."}
+    quests = {"main_quest": WORLD_DICT["main_quest"], "side_quests": []}
+    stage_outputs = {
+        "World Builder": [world],
+        "Character Creator": [[], [vane]],  # forgets Commander Vane the first time
+        "Quest Designer": [quests],
+        "Consistency Checker": [dict(WORLD_DICT, locations=world["locations"], npcs=[vane])],
+    }
+    
+    with patch("agentquest.crew.generation_crew.Crew", side_effect=make_stage_crew(stage_outputs, calls)):
+        crew = GenerationCrew(world_seed="dark fantasy", output_dir=tmp_path)
+        world_state = crew.run()
+    
+    # The missing NPC goes straight back to the character creator, with no checker call in between
+    assert calls == [
+        "World Builder", "Character Creator", "Quest Designer",
+        "Character Creator", "Quest Designer", "Consistency Checker",
+    ]
+    assert world_state.npcs[0].name == "Commander Vane"
+    
+    # Without the LLM check, a world that passes the rules is approved as assembled
+    calls.clear()
+    stage_outputs["Character Creator"] = [[vane]]
+    with patch("agentquest.crew.generation_crew.Crew", side_effect=make_stage_crew(stage_outputs, calls)):
+        world_state = GenerationCrew(world_seed="dark fantasy", output_dir=tmp_path / "quick", llm_check=False).run()
+    assert calls == ["World Builder", "Character Creator", "Quest Designer"]
+    assert world_state.consistency_approved and world_state.seed == "dark fantasy"
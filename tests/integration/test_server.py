@@ -0,0 +1,129 @@
+import json
+import os
+from unittest.mock import patch
+import pytest
+from fastapi.testclient import TestClient
+import agentquest.server as server
+from agentquest.fake_llm import FAKE_WORLD
+
+FAKE_ENV = {"MODEL": "fake/test", "OPENAI_API_KEY": "dummy", "LLM_CACHE": "off"}
+PLAYERS_YAML = json.dumps({"players": [
+    {"name": "Alice", "character_class": "Mage", "personality": "Smart", "goal": "Learn", "alignment": "Neutral"},
+    {"name": "Bob", "character_class": "Rogue", "personality": "Sly", "goal": "Loot", "alignment": "Chaotic"},
+]})
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(server, "WORLD_STATE_PATH", tmp_path / "world_state.json")
+    (tmp_path / "world_state.json").write_text(json.dumps(FAKE_WORLD))
+    yield TestClient(server.app)
+    for session in server.sessions.list():
+        server.sessions.remove(session.session_id)
+
+
+def read_events(response) -> list[str]:
+    return [line[len("data: "):] for line in response.iter_lines() if line.startswith("data: ")]
+
+
+@patch.dict(os.environ, FAKE_ENV)
+def test_play_step_streams_tagged_tokens(client):
+    res = client.post("/api/play/start", json={"players_yaml": PLAYERS_YAML, "resume": False, "session_id": "stream"})
+    assert res.status_code == 200
+
+    with client.stream("POST", "/api/play/step", params={"session_id": "stream"}) as response:
+        events = read_events(response)
+
+    tokens = [json.loads(e[len("[TOKEN] "):]) for e in events if e.startswith("[TOKEN] ")]
+    assert {(t["agent"], t["phase"]) for t in tokens} == {
+        ("Dungeon Master", "describe"), ("Alice", "act"), ("Bob", "act"), ("Dungeon Master", "resolve"),
+    }
+    # Every preview is closed, and each task's full output still arrives as a plain message
+    assert sum(t["done"] for t in tokens) == 4
+    messages = "".join(e for e in events if not e.startswith("["))
+    assert "(Scene Description)" in messages and "**Alice**" in messages and "**Bob**" in messages
+    assert "(Resolution)" in messages and "State changes: Elder Rowan is now hopeful" in messages
+    assert events[-2].startswith("[STATE] ") and events[-1] == "[DONE]"
+
+
+@patch.dict(os.environ, FAKE_ENV)
+def test_play_step_without_token_streaming(client):
+    start = {"players_yaml": PLAYERS_YAML, "resume": False, "session_id": "plain", "stream_tokens": False, "max_parallel_players": 1}
+    assert client.post("/api/play/start", json=dict(start, max_parallel_players=0)).status_code == 422
+    client.post("/api/play/start", json=start)
+    assert server.sessions.get("plain").crew.max_parallel_players == 1
+
+    with client.stream("POST", "/api/play/step", params={"session_id": "plain"}) as response:
+        events = read_events(response)
+
+    assert not any(e.startswith("[TOKEN]") for e in events)
+    assert events[-1] == "[DONE]"
+
+
+@patch.dict(os.environ, FAKE_ENV)
+def test_incremental_state_endpoints(client):
+    world = client.get("/api/state/world")
+    assert world.status_code == 200 and world.json()["setting"] == FAKE_WORLD["setting"]
+    assert client.get("/api/state/world", headers={"If-None-Match": world.headers["etag"]}).status_code == 304
+
+    client.post("/api/play/start", json={"players_yaml": PLAYERS_YAML, "resume": False, "session_id": "inc"})
+    with client.stream("POST", "/api/play/step", params={"session_id": "inc"}) as response:
+        read_events(response)
+
+    first = client.get("/api/state/game", params={"session_id": "inc"}).json()
+    assert first["game_state"]["round_number"] == 2
+    assert client.get("/api/state/game", params={"session_id": "inc", "since_version": first["version"]}).json() == {
+        "version": first["version"], "changed": False,
+    }
+    page = client.get("/api/state/transcript", params={"session_id": "inc"}).json()
+    assert page["text"].startswith("## Round 1") and page["next_offset"] == page["size"]
+
+    with client.stream("POST", "/api/play/step", params={"session_id": "inc"}) as response:
+        read_events(response)
+
+    # Only the deltas saved during round 2 come back, and only the new round of the transcript
+    update = client.get("/api/state/game", params={"session_id": "inc", "since_version": first["version"]}).json()
+    assert update["changed"] and "game_state" not in update
+    assert update["deltas"][-1]["set"]["round_number"] == 3
+    more = client.get("/api/state/transcript", params={"session_id": "inc", "offset": page["next_offset"]}).json()
+    assert "## Round 2" in more["text"] and "## Round 1" not in more["text"]
+    by_round = client.get("/api/state/transcript", params={"session_id": "inc", "from_round": 2}).json()
+    assert by_round["text"].startswith("## Round 2") and by_round["next_offset"] == more["next_offset"]
+    
+    rounds = client.get("/api/state/transcript/rounds", params={"session_id": "inc", "start": 2}).json()
+    assert [r["round"] for r in rounds["rounds"]] == [2] and rounds["last_round"] == 2
+    results = client.get("/api/state/transcript/search", params={"session_id": "inc", "q": "Elder Rowan"}).json()["results"]
+    assert sorted(r["round"] for r in results) == [1, 2]
+
+
+@patch.dict(os.environ, FAKE_ENV)
+def test_start_is_refused_while_the_session_plays_a_round(client):
+    start = {"players_yaml": PLAYERS_YAML, "resume": False, "session_id": "busy"}
+    client.post("/api/play/start", json=start)
+    session = server.sessions.get("busy")
+    
+    with session.playing():
+        assert client.post("/api/play/start", json=start).status_code == 409
+    assert server.sessions.get("busy") is session
+    
+    # Once the round is over the session can be restarted, and the old crew is closed
+    assert client.post("/api/play/start", json=start).status_code == 200
+    assert server.sessions.get("busy") is not session and session.closed
+
+
+@patch.dict(os.environ, FAKE_ENV)
+def test_session_tools_answer_from_the_sessions_world(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(server.generation_jobs, "jobs_dir", tmp_path / "worlds")
+    other = dict(FAKE_WORLD, locations=[dict(FAKE_WORLD["locations"][0], name="Saltmarsh")])
+    (tmp_path / "worlds" / "other").mkdir(parents=True)
+    (tmp_path / "worlds" / "other" / "world_state.json").write_text(json.dumps(other))
+
+    start = {"players_yaml": PLAYERS_YAML, "resume": False, "session_id": "elsewhere", "world_id": "other"}
+    assert client.post("/api/play/start", json=start).status_code == 200
+    world_tool = next(t for t in server.sessions.get("elsewhere").crew.dm_agent.tools if t.name == "query_world_state")
+
+    assert '"name":"Saltmarsh"' in world_tool._run("locations")
+    # Republishing the default world does not change what a running session sees
+    (tmp_path / "world_state.json").write_text(json.dumps(dict(FAKE_WORLD, lore="Rewritten.")))
+    assert world_tool._run("lore") == FAKE_WORLD["lore"]
@@ -0,0 +1,37 @@
+import json
+from pathlib import Path
+from agentquest.batch import parse_seeds, run_batch, seed_dir_name
+
+def fake_generate(seed: str, output_dir: str) -> dict:
+    if "fail" in seed:
+        return {"seed": seed, "output_dir": output_dir, "status": "failed", "iterations": 3, "error": "boom", "seconds": 0.0}
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    (Path(output_dir) / "world_state.json").write_text("{}")
+    return {"seed": seed, "output_dir": output_dir, "status": "succeeded", "iterations": 2, "error": None, "seconds": 1.5}
+
+def test_parse_seeds_from_markdown_and_plain_text(tmp_path):
+    seeds = parse_seeds(Path("examples/seeds.md"))
+    assert len(seeds) == 3
+    assert seeds[0].startswith("A dark fantasy world")
+    
+    plain = tmp_path / "seeds.txt"
+    plain.write_text("# comment\nA desert world\n\nAn ocean world\n")
+    assert parse_seeds(plain) == ["A desert world", "An ocean world"]
+    assert seed_dir_name("A desert world") != seed_dir_name("An ocean world")
+
+def test_run_batch_writes_manifest_and_resumes(tmp_path):
+    seeds = ["A desert world", "A world that will fail"]
+    manifest = run_batch(seeds, tmp_path, workers=2, generate_fn=fake_generate)
+    
+    statuses = {e["seed"]: e["status"] for e in manifest["seeds"]}
+    assert statuses == {"A desert world": "succeeded", "A world that will fail": "failed"}
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
+    
+    # A second run skips the finished world and retries the failed one
+    manifest = run_batch(seeds, tmp_path, workers=2, generate_fn=fake_generate)
+    assert [e["status"] for e in manifest["seeds"]] == ["skipped", "failed"]
+    # The skipped world keeps the numbers of the run that generated it, however often the batch resumes
+    for _ in range(2):
+        skipped = manifest["seeds"][0]
+        assert (skipped["iterations"], skipped["seconds"]) == (2, 1.5)
+        manifest = run_batch(seeds, tmp_path, workers=2, generate_fn=fake_generate)
@@ -0,0 +1,47 @@
+from agentquest.cache import SQLiteResponseCache, make_cache_key
+
+def test_cache_key_is_content_addressed():
+    key = make_cache_key("gpt-4o", "Dungeon Master", "Describe the scene", "")
+    assert key == make_cache_key("gpt-4o", "Dungeon Master", "Describe the scene", "")
+    assert key != make_cache_key("gpt-4o", "Dungeon Master", "Describe the scene", "Previous output")
+    assert key != make_cache_key("claude", "Dungeon Master", "Describe the scene", "")
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path):
+    cache = SQLiteResponseCache(tmp_path / "cache.sqlite", max_bytes=250)
+    cache.set("a", "x" * 100)
+    cache.set("b", "y" * 100)
+    assert cache.get("a") == "x" * 100  # "b" is now the least recently used
+    
+    cache.set("c", "z" * 100)
+    assert cache.get("b") is None
+    assert cache.get("a") == "x" * 100
+    assert cache.get("c") == "z" * 100
+    assert cache.total_bytes() <= 250
+    
+    # Entries survive reopening the database
+    assert SQLiteResponseCache(tmp_path / "cache.sqlite").get("c") == "z" * 100
+
+def test_replay_cached_output_completes_task():
+    from crewai import Task
+    from agentquest.cache import replay_cached_output
+    
+    seen = []
+    task = Task(description="Describe the scene", expected_output="A scene", callback=seen.append)
+    output = replay_cached_output(task, "A dark hall.", "Dungeon Master")
+    
+    assert task.output is output
+    assert str(output) == "A dark hall."
+    assert seen == [output]
+
+def test_task_cache_key_covers_the_agent_profile_and_expected_output():
+    from crewai import Agent, Task
+    from agentquest.cache import task_cache_key
+
+    def alice(backstory):
+        return Agent(role="Alice", goal="Learn", backstory=backstory, llm="gpt-4o")
+
+    brave, timid = alice("A brave mage."), alice("A timid mage.")
+    task = Task(description="Act", expected_output="An action", agent=brave)
+    assert task_cache_key(brave, task) == task_cache_key(alice("A brave mage."), task)
+    assert task_cache_key(brave, task) != task_cache_key(timid, task)
+    assert task_cache_key(brave, task) != task_cache_key(brave, Task(description="Act", expected_output="One line", agent=brave))
@@ -0,0 +1,74 @@
+import pytest
+from agentquest.context import ContextBuilder
+from agentquest.fake_llm import FAKE_WORLD
+from agentquest.models import GameState, CharacterState, WorldState
+from agentquest.utils import estimate_tokens
+
+NAMES = ["Alice", "Bob", "Cara", "Dane", "Eve", "Finn"]
+
+
+def make_game_state(rounds: int) -> GameState:
+    return GameState(
+        round_number=rounds + 1,
+        current_location="Millbrook",
+        characters=[CharacterState(name=n, hp=10 - i, max_hp=10, inventory=[f"{n}'s dagger"], status_effects=[]) for i, n in enumerate(NAMES)],
+        npc_attitudes={"Elder Rowan": "friendly", "Sister Vale": "hostile"},
+        quest_progress={"The Weakening Seals": False},
+        session_history=[f"Round {r + 1}: {NAMES[r % len(NAMES)]} explored the valley. " + "The fog thickened. " * 15 for r in range(rounds)],
+    )
+
+
+def test_slim_player_context_is_personal():
+    builder = ContextBuilder(WorldState(**FAKE_WORLD), history_token_budget=10_000)
+    context = builder.for_player(make_game_state(12), "Bob")
+
+    assert "- You (Bob): HP 9/10, carrying Bob's dagger" in context
+    # Other party members only show their condition
+    assert "Alice: HP 10/10" in context and "Alice's dagger" not in context
+    # Only NPCs at the current location
+    assert "Elder Rowan: friendly" in context and "Sister Vale" not in context
+    assert "exits: Old Keep, Fenwood" in context
+    # Bob's rounds plus the newest one
+    assert "Round 2:" in context and "Round 8:" in context and "Round 12:" in context
+    assert "Round 1:" not in context and "Round 3:" not in context
+
+
+def test_slim_dm_context_has_full_sheets_and_history():
+    builder = ContextBuilder(WorldState(**FAKE_WORLD), history_token_budget=10_000)
+    context = builder.for_dm(make_game_state(3))
+
+    assert "Alice: HP 10/10, carrying Alice's dagger" in context
+    assert "Sister Vale: hostile" in context
+    assert "The Weakening Seals: in progress" in context
+    assert all(f"Round {r}:" in context for r in (1, 2, 3))
+
+
+def test_full_mode_gives_everyone_the_same_history():
+    builder = ContextBuilder(WorldState(**FAKE_WORLD), mode="full")
+    game_state = make_game_state(3)
+
+    assert builder.for_player(game_state, "Bob") == builder.for_dm(game_state)
+    assert "Current state" not in builder.for_dm(game_state)
+    assert "just beginning" in builder.for_dm(make_game_state(0))
+
+
+def test_slim_prompt_tokens_stay_bounded():
+    world = WorldState(**FAKE_WORLD)
+    slim, full = ContextBuilder(world, mode="slim"), ContextBuilder(world, mode="full")
+
+    def round_tokens(builder, rounds, party):
+        game_state = make_game_state(rounds)
+        game_state.characters = game_state.characters[:party]
+        return estimate_tokens(builder.for_dm(game_state)) + sum(
+            estimate_tokens(builder.for_player(game_state, c.name)) for c in game_state.characters
+        )
+
+    # Six players cost far less than six copies of the history
+    assert round_tokens(slim, 60, 6) < round_tokens(full, 60, 6) / 2
+    # A player's context is bounded by the player budget, not the session length
+    assert round_tokens(slim, 200, 6) - round_tokens(slim, 60, 6) < 50
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        ContextBuilder(WorldState(**FAKE_WORLD), mode="tiny")
@@ -0,0 +1,31 @@
+import random
+import pytest
+from agentquest.dice import DiceExpression, DiceError, parse_batch
+
+def test_compound_expression_rolls_and_statistics():
+    expression = DiceExpression.parse("2d6 + 1d4 - 1")
+    assert expression.notation() == "2d6+1d4-1"
+    assert expression.bounds() == (2, 15)
+    assert expression.expected_value() == 8.5
+    distribution = expression.distribution()
+    assert sum(distribution.values()) == pytest.approx(1.0)
+    assert (min(distribution), max(distribution)) == (2, 15)
+
+    total, detail = expression.roll(random.Random(3))
+    assert 2 <= total <= 15 and detail.endswith(f"= {total}")
+    assert expression.roll(random.Random(3)) == (total, detail)
+
+def test_keep_highest_and_advantage():
+    assert DiceExpression.parse("4d6kh3").expected_value() == pytest.approx(12.2446, abs=1e-4)
+    advantage = DiceExpression.parse("1d20+5 adv")
+    assert advantage.notation() == "2d20kh1+5"
+    assert advantage.expected_value() == pytest.approx(18.825)
+    assert DiceExpression.parse("1d20 dis").expected_value() == pytest.approx(7.175)
+
+def test_batch_rolls_and_errors():
+    rolls = parse_batch("Alice, Bob: 1d20+2; Cara: 1d20 adv; 2d6")
+    assert [label for label, _ in rolls] == ["Alice", "Bob", "Cara", None]
+    assert rolls[0][1].notation() == "1d20+2" and rolls[2][1].notation() == "2d20kh1"
+    for bad in ["", "abc", "1d0", "2d6kh3", "2d6 adv", "1000d6"]:
+        with pytest.raises(DiceError):
+            parse_batch(bad)
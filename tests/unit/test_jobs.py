@@ -0,0 +1,58 @@
+import threading
+from unittest.mock import patch, MagicMock
+import pytest
+from agentquest.fake_llm import FAKE_WORLD
+from agentquest.jobs import GenerationJobManager, JobQueueFull
+from agentquest.models import WorldState
+
+def test_generation_job_succeeds_with_progress(tmp_path):
+    def fake_crew(world_seed, output_dir, progress_callback):
+        crew = MagicMock()
+        def run():
+            progress_callback("Iteration 1")
+            return "world"
+        crew.run.side_effect = run
+        return crew
+    
+    manager = GenerationJobManager(tmp_path, max_workers=1)
+    with patch("agentquest.crew.generation_crew.GenerationCrew", side_effect=fake_crew):
+        job = manager.submit("dark fantasy")
+        assert job.future.result(timeout=5) == "world"
+    
+    assert job.status == "succeeded"
+    assert job.output_dir == tmp_path / job.job_id
+    assert "Iteration 1" in job.events
+    assert manager.get(job.job_id) is job
+
+def test_generation_jobs_are_bounded(tmp_path):
+    release = threading.Event()
+    blocking_crew = MagicMock()
+    blocking_crew.run.side_effect = lambda: release.wait(5)
+    
+    manager = GenerationJobManager(tmp_path, max_workers=1, max_queued=1)
+    with patch("agentquest.crew.generation_crew.GenerationCrew", return_value=blocking_crew):
+        running = manager.submit("one")
+        queued = manager.submit("two")
+        with pytest.raises(JobQueueFull):
+            manager.submit("three")
+        release.set()
+        running.future.result(timeout=5)
+        queued.future.result(timeout=5)
+    
+    assert running.status == queued.status == "succeeded"
+
+def test_published_jobs_generate_apart_and_publish_the_world(tmp_path):
+    world = WorldState(**FAKE_WORLD)
+    crew = MagicMock()
+    crew.run.return_value = world
+
+    manager = GenerationJobManager(tmp_path / "worlds", max_workers=2)
+    with patch("agentquest.crew.generation_crew.GenerationCrew", return_value=crew):
+        first = manager.submit("one", publish_to=tmp_path)
+        second = manager.submit("two", publish_to=tmp_path)
+        first.future.result(timeout=5)
+        second.future.result(timeout=5)
+
+    assert first.output_dir != second.output_dir
+    assert first.output_dir.parent == tmp_path / "worlds"
+    assert WorldState.model_validate_json((tmp_path / "world_state.json").read_text()) == world
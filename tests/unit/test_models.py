@@ -1,4 +1,4 @@
-from agentquest.models import Location, PlayerConfig
+from agentquest.models import Location, PlayerConfig, GameState, CharacterState, RoundResult, StateChanges, CharacterChange
 
 def test_location_model():
     loc = Location(
@@ -19,3 +19,49 @@ def test_player_config():
         backstory="A wandering sellsword."
     )
     assert player.name == "Bob"
+
+def make_game_state():
+    return GameState(
+        round_number=1, current_location="Town",
+        characters=[CharacterState(name="Bob", hp=8, max_hp=10, inventory=["Rope"], status_effects=["poisoned"])],
+        npc_attitudes={}, quest_progress={}, session_history=[],
+    )
+
+def test_round_result_parses_state_block():
+    text = (
+        "### Narrative Resolution\nBob is bitten by a wolf.\n\n"
+        '```json\n{"characters": [{"name": "Bob", "hp_change": -3, "items_gained": ["Wolf Pelt"]}], '
+        '"location": "Forest", "game_over": true, "game_over_reason": "The party fled."}\n```\n\nSTATUS: GAME_OVER'
+    )
+    result = RoundResult.parse(text)
+    assert result.structured and result.game_over and result.game_over_reason == "The party fled."
+    assert result.narration == "### Narrative Resolution\nBob is bitten by a wolf."
+    assert result.state_changes.characters[0].hp_change == -3
+    assert result.state_changes.location == "Forest"
+
+def test_round_result_falls_back_to_status_marker():
+    result = RoundResult.parse('The dragon wins.\n```json\n{"characters": "oops"}\n```\nSTATUS: GAME_OVER')
+    assert not result.structured and result.game_over
+    assert result.state_changes == StateChanges()
+    assert RoundResult.parse("All is well. STATUS: CONTINUE").game_over is False
+
+def test_apply_changes_clamps_and_ignores_unknowns():
+    state = make_game_state()
+    notes = state.apply_changes(StateChanges(
+        characters=[
+            CharacterChange(name="bob", hp_change=5, items_lost=["rope", "Sword"], status_removed=["poisoned"]),
+            CharacterChange(name="Nobody", hp_change=-5),
+        ],
+        location="Forest",
+        quest_progress={"Find the Mayor": True},
+    ))
+    bob = state.get_character("Bob")
+    assert (bob.hp, bob.inventory, bob.status_effects) == (10, [], [])
+    assert state.current_location == "Forest" and state.quest_progress == {"Find the Mayor": True}
+    assert notes == [
+        "Bob HP +2 (10/10), loses Rope, is no longer poisoned",
+        "The party moves to Forest",
+        "Quest 'Find the Mayor' completed",
+    ]
+    state.apply_changes(StateChanges(characters=[CharacterChange(name="Bob", hp_change=-99)]))
+    assert bob.hp == 0
@@ -0,0 +1,88 @@
+from agentquest.models import GameState, CharacterState
+from agentquest.persistence import GameStateStore, load_game_state
+
+def make_state() -> GameState:
+    return GameState(
+        round_number=1,
+        current_location="Stormkeep",
+        characters=[CharacterState(name="Alice", hp=10, max_hp=10, inventory=[], status_effects=[])],
+        npc_attitudes={},
+        quest_progress={},
+        session_history=[]
+    )
+
+def test_store_journals_rounds_and_summaries(tmp_path):
+    store = GameStateStore(tmp_path, compact_every=100)
+    state = make_state()
+    store.save(state)
+    snapshot = store.snapshot_path.read_text()
+    
+    for i in range(5):
+        state.session_history.append(f"Round {i + 1} happened.")
+        state.round_number += 1
+        store.save(state)
+    # Summarization drops entries from the front of the history
+    state.history_summary = "Rounds 1-3 happened."
+    del state.session_history[:3]
+    state.characters[0].hp = 3
+    store.save(state)
+    
+    # Rounds only append to the journal; the snapshot is untouched
+    assert store.snapshot_path.read_text() == snapshot
+    assert load_game_state(tmp_path) == state
+
+def test_store_compacts_and_survives_torn_writes(tmp_path):
+    store = GameStateStore(tmp_path, compact_every=2)
+    state = make_state()
+    store.save(state)
+    for i in range(3):
+        state.session_history.append(f"Round {i + 1}")
+        store.save(state)
+    # Two journal entries triggered a compaction into the snapshot
+    assert '"Round 2"' in store.snapshot_path.read_text()
+    
+    # A crash mid-append leaves a partial line that is ignored on load
+    with open(store.journal_path, "a") as f:
+        f.write('{"set": {"round_nu')
+    reloaded_store = GameStateStore(tmp_path, compact_every=2)
+    reloaded = reloaded_store.load()
+    assert reloaded == state
+    
+    # The next save replaces the torn journal with a fresh snapshot
+    reloaded.session_history.append("Round 4")
+    reloaded_store.save(reloaded)
+    assert not store.journal_path.exists()
+    assert load_game_state(tmp_path) == reloaded
+
+def test_stale_journal_is_ignored(tmp_path):
+    store = GameStateStore(tmp_path)
+    state = make_state()
+    store.save(state)
+    state.session_history.append("Round 1")
+    store.save(state)
+    stale_journal = store.journal_path.read_text()
+    
+    # Simulate a crash after compaction replaced the snapshot but before the old journal was removed
+    store.compact(state)
+    store.journal_path.write_text(stale_journal)
+    assert load_game_state(tmp_path).session_history == ["Round 1"]
+
+def test_changes_since_returns_deltas_until_compaction(tmp_path):
+    store = GameStateStore(tmp_path, compact_every=2)
+    state = make_state()
+    store.save(state)
+    held = store.changes_since()
+    assert held["game_state"] == state.model_dump()
+    
+    state.session_history.append("Round 1")
+    state.round_number = 2
+    store.save(state)
+    update = store.changes_since(held["version"])
+    assert update["deltas"] == [{"set": {"round_number": 2}, "history": {"drop": 0, "append": ["Round 1"]}}]
+    assert store.changes_since(update["version"]) == {"version": update["version"], "changed": False}
+    
+    # After a compaction the old version no longer applies, so the whole state comes back
+    for i in range(2):
+        state.session_history.append(f"Round {i + 2}")
+        store.save(state)
+    assert store.changes_since(update["version"])["game_state"] == state.model_dump()
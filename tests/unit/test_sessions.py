@@ -0,0 +1,49 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+import pytest
+from agentquest.sessions import SessionRegistry, session_output_dir
+
+def test_registry_evicts_least_recently_used():
+    registry = SessionRegistry(max_sessions=2, ttl_seconds=0)
+    registry.put("a", MagicMock())
+    evicted = registry.put("b", MagicMock()).crew
+    
+    # Touch "a" so that "b" becomes the least recently used
+    assert registry.get("a") is not None
+    registry.put("c", MagicMock())
+    
+    assert registry.get("b") is None
+    assert {s.session_id for s in registry.list()} == {"a", "c"}
+    # Leaving the registry closes the session, returning its LLM clients to the pool
+    evicted.close.assert_called_once()
+
+def test_registry_keeps_busy_sessions_and_expires_idle_ones():
+    registry = SessionRegistry(max_sessions=10, ttl_seconds=60)
+    busy = registry.put("busy", MagicMock())
+    idle = registry.put("idle", MagicMock())
+    busy.last_used -= 120
+    idle.last_used -= 120
+    
+    with busy.lock:
+        assert registry.get("idle") is None
+        assert registry.get("busy") is busy
+
+def test_session_ids_and_dirs():
+    with pytest.raises(ValueError):
+        SessionRegistry.validate_id("../etc")
+    assert session_output_dir(Path("output"), "default") == Path("output/session")
+    assert session_output_dir(Path("output"), "table-2") == Path("output/sessions/table-2")
+
+def test_session_replaced_mid_round_is_closed_when_the_round_ends():
+    registry = SessionRegistry(max_sessions=10, ttl_seconds=0)
+    old = registry.put("table", MagicMock())
+    
+    with old.playing():
+        registry.put("table", MagicMock())
+        # Still playing its round with its own clients
+        old.crew.close.assert_not_called()
+    old.crew.close.assert_called_once()
+    
+    # A step that was waiting for the old session must not play on its closed crew
+    with pytest.raises(RuntimeError):
+        old.acquire()
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+from agentquest.fake_llm import FakeLLM
+from agentquest.streaming import StreamChannel, stream_tokens
+
+
+def test_channel_applies_backpressure_without_dropping():
+    async def scenario():
+        channel = StreamChannel(asyncio.get_running_loop(), maxsize=2)
+        sent = []
+
+        def produce():
+            for i in range(20):
+                channel.send(i)
+                sent.append(i)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        await asyncio.sleep(0.05)
+        # The producer is held back by the full queue instead of dropping messages
+        assert len(sent) <= 3
+
+        received = [await channel.receive() for _ in range(20)]
+        await asyncio.get_running_loop().run_in_executor(None, producer.join)
+        return received
+
+    assert asyncio.run(scenario()) == list(range(20))
+
+
+def test_closing_the_channel_releases_a_blocked_sender():
+    async def scenario():
+        channel = StreamChannel(asyncio.get_running_loop(), maxsize=1)
+        finished = threading.Event()
+
+        def produce():
+            for i in range(10):
+                channel.send(i)
+            finished.set()
+
+        threading.Thread(target=produce, daemon=True).start()
+        await asyncio.sleep(0.05)
+        assert not finished.is_set()
+        # The client went away: the round must still be able to finish
+        channel.close()
+        await asyncio.get_running_loop().run_in_executor(None, finished.wait, 2)
+        return finished.is_set()
+
+    assert asyncio.run(scenario()) is True
+
+
+def test_llm_tokens_are_tagged_with_agent_and_phase():
+    async def scenario():
+        channel = StreamChannel(asyncio.get_running_loop(), maxsize=256)
+        llm = FakeLLM(model="fake/test", stream=True, responses={"": "The fog lifts."})
+
+        def call():
+            with stream_tokens(channel, agent="Dungeon Master", phase="describe"):
+                llm.call("Describe the scene.")
+            # Outside the block nothing is forwarded
+            llm.call("Summarize.")
+
+        await asyncio.get_running_loop().run_in_executor(None, call)
+        items = []
+        while not channel._queue.empty():
+            items.append(await channel.receive())
+        return items
+
+    items = asyncio.run(scenario())
+    assert all(i["agent"] == "Dungeon Master" and i["phase"] == "describe" for i in items)
+    assert "".join(i["text"] for i in items).endswith("Final Answer: The fog lifts.")
+    assert [i["done"] for i in items][-1] is True and not any(i["done"] for i in items[:-1])
@@ -0,0 +1,80 @@
+import json
+import threading
+import pytest
+from agentquest.telemetry import Telemetry
+
+
+def read_log(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_spans_are_logged_with_their_scope(tmp_path):
+    log_path = tmp_path / "logs" / "telemetry.jsonl"
+    telemetry = Telemetry(log_path)
+
+    with telemetry.span("round", "Round 1", group="round", round=1):
+        with telemetry.span("kickoff", "describe", phase="describe", agent="Dungeon Master") as span:
+            span["prompt_tokens"] = 120
+            span["completion_tokens"] = 30
+        telemetry.record("tool", "roll_dice", 0.01)
+
+    kickoff, tool, round_entry = read_log(log_path)
+    assert kickoff["kind"] == "kickoff" and kickoff["round"] == 1 and kickoff["agent"] == "Dungeon Master"
+    assert kickoff["prompt_tokens"] == 120
+    assert tool["round"] == 1 and "agent" not in tool
+    assert round_entry["kind"] == "round" and round_entry["seconds"] >= kickoff["seconds"]
+
+
+def test_round_aggregates(tmp_path):
+    telemetry = Telemetry()
+
+    for round_number in (1, 2):
+        with telemetry.span("round", f"Round {round_number}", group="round", round=round_number):
+            with telemetry.span("kickoff", "describe", agent="Dungeon Master") as span:
+                span.update(prompt_tokens=100, completion_tokens=10, cache_hit=round_number == 2)
+            telemetry.record("llm_call", "fake/test", 0.5)
+            telemetry.record("tool", "query_world_state", 0.25, retries=1)
+
+    rounds = telemetry.summary()["rounds"]
+    assert [r["round"] for r in rounds] == [1, 2]
+    first = rounds[0]
+    assert first["kickoffs"] == 1 and first["llm_calls"] == 1 and first["tool_calls"] == 1
+    assert first["prompt_tokens"] == 100 and first["completion_tokens"] == 10
+    assert first["llm_seconds"] == 0.5 and first["tool_seconds"] == 0.25 and first["retries"] == 1
+    assert first["agents"]["Dungeon Master"]["kickoffs"] == 1
+    assert first["seconds"] is not None
+    assert (rounds[0]["cache_hits"], rounds[1]["cache_hits"]) == (0, 1)
+    assert telemetry.summary()["generations"] == []
+
+
+def test_failed_span_is_recorded_and_reraised(tmp_path):
+    log_path = tmp_path / "telemetry.jsonl"
+    telemetry = Telemetry(log_path)
+
+    with pytest.raises(RuntimeError):
+        with telemetry.span("generation", "seed", group="generation", generation=1):
+            raise RuntimeError("no consistent world")
+
+    entry, = read_log(log_path)
+    assert entry["status"] == "error" and entry["error"] == "no consistent world"
+    assert telemetry.summary()["generations"][0]["errors"] == 1
+
+
+def test_scopes_do_not_leak_across_threads_or_instances():
+    telemetry, other = Telemetry(), Telemetry()
+    seen = {}
+
+    def worker():
+        with telemetry.span("kickoff", "act", agent="Player"):
+            pass
+        seen["summary"] = telemetry.summary()
+
+    with telemetry.scope(group="round", round=1):
+        # A plain thread starts with an empty context: its records belong to no round
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        other.record("kickoff", "elsewhere", 0.1)
+
+    assert seen["summary"]["rounds"] == []
+    assert other.summary()["rounds"] == []
@@ -0,0 +1,151 @@
+import json
+import os
+from agentquest.models import WorldState
+from agentquest.tools import ToolMemo, WorldStateTool
+from agentquest.world_index import WorldIndex, load_world_index
+
+WORLD_DICT = {
+    "seed": "fantasy",
+    "setting": "fantasy",
+    "lore": "The old gods are dead.",
+    "factions": ["The Iron Legion"],
+    "locations": [
+        {"name": "Stormkeep", "description": "A ruined fortress.", "connected_to": ["Shadow Woods"], "npcs_present": ["Commander Vane"]},
+        {"name": "Shadow Woods", "description": "A dark forest.", "connected_to": ["Stormkeep"], "npcs_present": []}
+    ],
+    "npcs": [
+        {"name": "Commander Vane", "role": "Leader", "personality": "Gruff", "attitude_toward_party": "neutral", "backstory": "Veteran."}
+    ],
+    "main_quest": {"title": "The Fallen Crown", "description": "Retrieve the crown.", "objectives": [], "twists": [], "is_main_quest": True},
+    "side_quests": [],
+    "consistency_approved": True
+}
+
+def write_world(path, world_dict=WORLD_DICT):
+    with open(path, "w") as f:
+        json.dump(world_dict, f)
+
+def test_world_state_tool_sections_and_point_queries(tmp_path):
+    path = tmp_path / "world_state.json"
+    write_world(path)
+    tool = WorldStateTool(world_state_path=str(path))
+    
+    assert tool._run("lore") == "The old gods are dead."
+    assert len(json.loads(tool._run("locations"))) == 2
+    assert json.loads(tool._run("npcs: commander vane"))["role"] == "Leader"
+    assert json.loads(tool._run("quests:The Fallen Crown"))["is_main_quest"] is True
+    assert "not found" in tool._run("locations:Atlantis")
+    assert "not a valid section" in tool._run("dragons")
+
+def test_world_index_is_shared_until_file_changes(tmp_path):
+    path = tmp_path / "world_state.json"
+    write_world(path)
+    first = load_world_index(path)
+    assert load_world_index(path) is first
+    
+    changed = dict(WORLD_DICT, lore="The old gods have returned!")
+    write_world(path, changed)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    
+    second = load_world_index(path)
+    assert second is not first
+    assert second.world_state == WorldState(**changed)
+
+def test_world_graph_routes_and_reports_dangling_edges(tmp_path):
+    from agentquest.tools import WorldMapTool
+    
+    world = dict(WORLD_DICT, locations=WORLD_DICT["locations"] + [
+        # Listed on one side only, plus a path to a place that does not exist
+        {"name": "Ash Gate", "description": "A gate.", "connected_to": ["shadow woods", "Atlantis"], "npcs_present": []},
+        {"name": "Lonely Isle", "description": "An island.", "connected_to": [], "npcs_present": []},
+    ])
+    path = tmp_path / "world_state.json"
+    write_world(path, world)
+    graph = load_world_index(path).graph
+    
+    assert graph.route("stormkeep", "Ash Gate") == ["Stormkeep", "Shadow Woods", "Ash Gate"]
+    assert graph.route("Stormkeep", "Lonely Isle") is None
+    assert graph.within("Stormkeep", 2) == {"Shadow Woods": 1, "Ash Gate": 2}
+    assert graph.dangling == [("Ash Gate", "Atlantis")]
+    
+    tool = WorldMapTool(world_state_path=str(path))
+    assert tool._run("route: Ash Gate -> Stormkeep") == "Ash Gate -> Shadow Woods -> Stormkeep (2 moves)"
+    assert tool._run("near:Shadow Woods") == "Within 1 move(s) of Shadow Woods: Stormkeep (1), Ash Gate (1)"
+    assert "not connected" in tool._run("route:Lonely Isle -> Stormkeep")
+    assert "unknown location" in tool._run("near:Atlantis:2")
+
+    # Bound to a session's world, the file on disk no longer matters
+    bound = WorldMapTool(world=WorldIndex(WorldState(**WORLD_DICT)), world_state_path=str(path), memo=ToolMemo())
+    assert bound._run("route:Stormkeep -> Ash Gate").startswith("Error: unknown location")
+    assert bound._run("near:Stormkeep") == "Within 1 move(s) of Stormkeep: Shadow Woods (1)"
+
+def test_character_sheet_tool_reads_live_game_state():
+    from agentquest.models import GameState, CharacterState
+    from agentquest.tools import CharacterSheetTool
+    
+    state = GameState(
+        round_number=1,
+        current_location="Stormkeep",
+        characters=[CharacterState(name="Alice", hp=10, max_hp=10, inventory=[], status_effects=[])],
+        npc_attitudes={},
+        quest_progress={},
+        session_history=[]
+    )
+    tool = CharacterSheetTool(game_state_getter=lambda: state)
+    assert json.loads(tool._run(" alice "))["hp"] == 10
+    
+    # Changes to the in-memory state are visible immediately, including new characters
+    state.characters[0].hp = 4
+    state.characters.append(CharacterState(name="Bob", hp=8, max_hp=8, inventory=["Rope"], status_effects=[]))
+    assert json.loads(tool._run("Alice"))["hp"] == 4
+    assert json.loads(tool._run("BOB"))["inventory"] == ["Rope"]
+    assert "not found" in tool._run("Carol")
+
+def test_tools_share_a_memo_until_the_state_changes(tmp_path):
+    from agentquest.models import GameState, CharacterState
+    from agentquest.tools import CharacterSheetTool, ToolMemo
+    
+    path = tmp_path / "world_state.json"
+    write_world(path)
+    state = GameState(
+        round_number=1,
+        current_location="Stormkeep",
+        characters=[CharacterState(name="Alice", hp=10, max_hp=10, inventory=[], status_effects=[])],
+        npc_attitudes={},
+        quest_progress={},
+        session_history=[]
+    )
+    memo = ToolMemo()
+    # One tool per agent, as in a session, all sharing the memo
+    dm_tool, other_dm_tool = WorldStateTool(world_state_path=str(path), memo=memo), WorldStateTool(world_state_path=str(path), memo=memo)
+    sheet = CharacterSheetTool(game_state_getter=lambda: state, memo=memo)
+    
+    assert dm_tool._run("npcs:Commander Vane") == other_dm_tool._run(" NPCS : commander vane ")
+    assert sheet._run("Alice") == sheet._run(" alice")
+    assert (memo.hits, memo.misses) == (2, 2)
+    
+    # The crew invalidates the memo when the game state changes; a changed world file needs no invalidation
+    state.characters[0].hp = 4
+    memo.invalidate()
+    assert json.loads(sheet._run("Alice"))["hp"] == 4
+    write_world(path, dict(WORLD_DICT, lore="The old gods have returned!"))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert dm_tool._run("lore") == "The old gods have returned!"
+
+def test_dice_roller_is_deterministic_when_seeded():
+    from agentquest.tools import DiceRollerTool
+    first, second = DiceRollerTool(seed="7:1"), DiceRollerTool(seed="7:1")
+    rolls = [first._run("3d6+1") for _ in range(5)]
+    assert rolls == [second._run("3d6+1") for _ in range(5)]
+    first.reseed("7:1")
+    assert first._run("3d6+1") == rolls[0]
+
+def test_dice_roller_batch_and_stats():
+    from agentquest.tools import DiceRollerTool
+    tool = DiceRollerTool(seed="initiative")
+    lines = tool._run("Alice, Bob: 1d20+2; Cara: 1d20").splitlines()
+    assert [line.split(":")[0] for line in lines] == ["Rolled 1d20+2 for Alice", "Rolled 1d20+2 for Bob", "Rolled 1d20 for Cara"]
+    assert "Chance of 15 or more: 55.0%" in tool._run("stats 1d20+5 vs 15")
+    assert tool._run("1d20+").startswith("Error:")
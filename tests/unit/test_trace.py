@@ -0,0 +1,34 @@
+import pytest
+from agentquest.trace import LLMTrace, TraceReplayer, TraceMissError, TRACE_FILENAME
+
+def write_trace(tmp_path):
+    trace = LLMTrace(tmp_path / TRACE_FILENAME)
+    trace.start(seed=42)
+    trace.record(1, "prefetch", "Dungeon Master", "Describe", "a", "A foggy field.", "llm")
+    trace.record(1, "act", "Alice", "Act", "b", "Alice waves.", "llm")
+    trace.record(1, "resolve", "Dungeon Master", "Resolve", "c", "Nothing happens.", "llm")
+    trace.record(2, "summary", "Dungeon Master", "Summarize", "d", "Alice waved.", "llm")
+    return trace
+
+def test_replayer_serves_recorded_responses(tmp_path):
+    write_trace(tmp_path)
+    replayer = TraceReplayer(tmp_path)
+
+    assert replayer.seed == 42 and replayer.until_round == 1
+    # The prefetched scene stands in for the scene description
+    assert replayer.take(1, "describe", "Dungeon Master", "a") == "A foggy field."
+    assert replayer.take(1, "act", "Alice", "changed") == "Alice waves."
+    assert replayer.divergences == 1
+    with pytest.raises(TraceMissError):
+        replayer.take(1, "act", "Alice", "b")
+    # The summary right after the last replayed round is still served; later rounds are live
+    assert replayer.take(2, "summary", "Dungeon Master", "d") == "Alice waved."
+    assert replayer.take(2, "describe", "Dungeon Master", "e") is None
+
+def test_trace_ignores_torn_last_line(tmp_path):
+    trace = write_trace(tmp_path)
+    with open(trace.path, "a") as f:
+        f.write('{"type": "task", "round": 2, "pha')
+    seed, entries = trace.read()
+    assert seed == 42 and trace.seed() == 42
+    assert len(entries) == 4
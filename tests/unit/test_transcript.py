@@ -0,0 +1,65 @@
+import sqlite3
+
+import pytest
+
+from agentquest.transcript import TranscriptStore, read_transcript
+
+ROUND = "## Round {n}\n\n### **DM** (Scene Description)\n{scene}\n\n### Player Actions\n**Alice**:\nI look around.\n\n### **DM** (Resolution)\n{resolution}\n\n"
+
+def test_read_transcript_pages_on_whole_characters(tmp_path):
+    path = tmp_path / "transcript.md"
+    path.write_text("## Round 1\n\nThe café opens.\n\n## Round 2\n\nThe café closes.\n\n", encoding="utf-8")
+    
+    text, offset = "", 0
+    while True:
+        page = read_transcript(path, offset, limit=7)
+        text += page["text"]
+        offset = page["next_offset"]
+        if offset == page["size"]:
+            break
+    assert text == path.read_text(encoding="utf-8")
+    # The transcript was started over since the client last read it
+    assert read_transcript(path, 10_000)["reset"]
+
+def test_store_indexes_rounds_and_searches_narration(tmp_path):
+    store = TranscriptStore(tmp_path)
+    for n, scene in enumerate(["A misty harbor.", "The lighthouse keeper waits.", "Storm over the cliffs."], start=1):
+        store.append(n, ROUND.format(n=n, scene=scene, resolution=f"Round {n} ends."))
+    
+    assert store.get(2).startswith("## Round 2") and store.get(4) is None
+    assert [n for n, _ in store.rounds(2, 3)] == [2, 3]
+    assert store.render() == store.markdown_path.read_text()
+    assert read_transcript(store.markdown_path, store.offset_of(3))["text"] == store.get(3)
+    assert [r["round"] for r in store.search("lighthouse keeper")] == [2]
+    # Player actions are not narration
+    assert store.search("look around") == []
+
+def test_store_indexes_and_repairs_legacy_transcripts(tmp_path):
+    # Older sessions wrote a literal "\n\n" after each round
+    legacy = "# Adventure Log\n\n" + "".join(ROUND.format(n=n, scene=f"Scene {n}.", resolution="Done.") + "\\n\\n" for n in (1, 2))
+    (tmp_path / "transcript.md").write_text(legacy)
+
+    # Reading a session never indexes or rewrites it
+    assert TranscriptStore.open_existing(tmp_path) is None
+    assert not (tmp_path / "transcript.db").exists()
+    assert (tmp_path / "transcript.md").read_text() == legacy
+
+    store = TranscriptStore(tmp_path)
+    assert store.last_round() == 2
+    assert "\\n" not in store.markdown_path.read_text()
+    assert store.markdown_path.read_text().startswith("# Adventure Log\n\n## Round 1")
+    assert read_transcript(store.markdown_path, store.offset_of(2))["text"].startswith("## Round 2")
+
+def test_readonly_store_reads_without_writing(tmp_path):
+    with TranscriptStore(tmp_path) as store:
+        store.append(1, ROUND.format(n=1, scene="The gate creaks.", resolution="It opens."))
+
+    index = (tmp_path / "transcript.db").read_bytes()
+
+    with TranscriptStore.open_existing(tmp_path) as store:
+        assert store.readonly
+        assert store.last_round() == 1
+        assert [r["round"] for r in store.search("gate")] == [1]
+        with pytest.raises(sqlite3.OperationalError):
+            store._conn.execute("DELETE FROM rounds")
+    assert (tmp_path / "transcript.db").read_bytes() == index
@@ -0,0 +1,38 @@
+import os
+from unittest.mock import patch
+from agentquest.fake_llm import FakeLLM
+from agentquest.utils import LLMPool
+
+@patch.dict(os.environ, {"MODEL": "fake/pool", "FAKE_LLM_LATENCY": "0"})
+def test_llm_pool_reuses_released_clients_per_config():
+    pool = LLMPool()
+    first, second = pool.acquire(), pool.acquire()
+    assert isinstance(first, FakeLLM) and first is not second
+
+    pool.release(first)
+    assert pool.idle_count() == 1
+    # Streaming clients are a different configuration
+    assert pool.acquire(stream=True) is not first
+    assert pool.acquire() is first
+    assert pool.idle_count() == 0
+
+    # Clients of a configuration that has since changed are dropped
+    pool.release(second)
+    with patch.dict(os.environ, {"MODEL": "fake/other"}):
+        assert pool.acquire() is not second
+        pool.release(first)
+    assert pool.idle_count() == 1
+
+def test_llm_pool_without_model():
+    with patch.dict(os.environ, {}, clear=True):
+        pool = LLMPool()
+        assert pool.acquire() is None
+        pool.release(None)
+
+def test_entry_points_import_without_crewai():
+    # crewai takes seconds to import; the CLI and server load it only when a crew is needed
+    import subprocess
+    import sys
+    code = "import sys, agentquest.cli, agentquest.server; print('crewai' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,42 @@
+from agentquest.models import WorldState
+from agentquest.world_validation import fix_instructions, repair_world, validate_world
+
+def make_world(**overrides) -> WorldState:
+    world = {
+        "seed": "fantasy",
+        "setting": "fantasy",
+        "lore": "The old gods are dead.",
+        "factions": [],
+        "locations": [
+            {"name": "Stormkeep", "description": "A fortress.", "connected_to": ["Shadow Woods", "Stormkeep"], "npcs_present": ["Commander Vane"]},
+            {"name": "Shadow Woods", "description": "A forest.", "connected_to": ["Atlantis"], "npcs_present": ["Old Mara"]},
+        ],
+        "npcs": [{"name": "Commander Vane", "role": "Leader", "personality": "Gruff", "attitude_toward_party": "neutral", "backstory": "Veteran."}],
+        "main_quest": {"title": "The Fallen Crown", "description": "Storm the walls of Stormkeep.", "objectives": [], "twists": [], "is_main_quest": True},
+        "side_quests": [{"title": "Lost Sheep", "description": "Find the sheep.", "objectives": [], "twists": [], "is_main_quest": False}],
+        "consistency_approved": False,
+    }
+    world.update(overrides)
+    return WorldState(**world)
+
+def test_validation_reports_references_by_stage():
+    world = make_world()
+    issues = validate_world(world)
+    errors = {(i.stage, i.message.split("'")[1]) for i in issues if i.severity == "error"}
+    assert errors == {("world", "Shadow Woods"), ("npcs", "Old Mara")}
+    # Advisory only: a quest that names nothing in the world
+    assert [i.message for i in issues if i.severity == "warning"] == ["Quest 'Lost Sheep' mentions none of the world's locations or NPCs."]
+    
+    # Unknown and self connections are dropped rather than regenerated; the missing NPC goes back to its stage
+    assert len(repair_world(world)) == 2
+    assert [loc.connected_to for loc in world.locations] == [["Shadow Woods"], []]
+    assert list(fix_instructions(validate_world(world))) == ["npcs"]
+
+def test_validation_reports_duplicates_and_unreachable_locations():
+    world = make_world(locations=[
+        {"name": "Stormkeep", "description": "A fortress.", "connected_to": [], "npcs_present": ["Commander Vane"]},
+        {"name": "stormkeep", "description": "Again.", "connected_to": [], "npcs_present": []},
+    ])
+    issues = validate_world(world)
+    assert [i.stage for i in issues if i.severity == "error"] == ["world"]
+    assert any("can be reached" in i.message for i in issues)